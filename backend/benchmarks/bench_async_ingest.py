@@ -0,0 +1,122 @@
+"""Benchmark: /candidates latency while bulk uploads are being ingested.
+
+Runs the app in-process against a scratch database, seeds it with
+candidates, then measures GET /candidates latency on its own and while
+several clients post /bulk-upload batches at the same time. All requests
+share one event loop, as under uvicorn, so any blocking work in the
+upload path shows up directly in the list latency. Screening is disabled;
+this measures ingestion (storage, extraction, database writes) only.
+
+    python benchmarks/bench_async_ingest.py --seed 2000 --uploaders 4 --batches 5 --files 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+WORDS = ["python", "java", "sql", "docker", "react", "aws", "kubernetes", "spark", "django", "go",
+         "led", "built", "designed", "team", "platform", "data", "pipeline", "service", "api", "cloud"]
+
+
+def resume(rng: random.Random, n: int) -> bytes:
+    lines = [f"Candidate {n}", f"candidate{n}@example.com", "EXPERIENCE", "Engineer, Acme 2018 - 2023"]
+    lines += [" ".join(rng.choices(WORDS, k=12)) for _ in range(40)]
+    return "\n".join(lines).encode()
+
+
+async def run(args):
+    import httpx
+    import main
+    from database import SessionLocal
+    from migrations import init_db
+    from models import Candidate
+
+    # Ingestion only: screening would dominate and needs a model server
+    main.schedule_screening = lambda *a, **k: None
+    rng = random.Random(3)
+    transport = httpx.ASGITransport(app=main.app)
+
+    init_db(main.engine)
+    db = SessionLocal()
+    db.add_all([
+        Candidate(name=f"Seed {i}", email=f"seed{i}@example.com", skills='["python"]',
+                  overall_score=rng.uniform(0, 100), recommendation="SELECT", resume_text="")
+        for i in range(args.seed)
+    ])
+    db.commit()
+    db.close()
+
+    async with main.lifespan(main.app):
+        while not main.warmup.status()["ready"]:
+            await asyncio.sleep(0.1)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            await client.post("/register", data={"username": "bench", "email": "b@x", "password": "p"})
+            token = (await client.post("/login", data={"username": "bench", "password": "p"})).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+
+            async def poll(samples, stop):
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    await client.get("/candidates", headers=headers)
+                    samples.append(time.perf_counter() - started)
+                    await asyncio.sleep(args.interval_ms / 1000)
+
+            # Idle baseline
+            idle, stop = [], asyncio.Event()
+            poller = asyncio.create_task(poll(idle, stop))
+            await asyncio.sleep(args.idle_seconds)
+            stop.set()
+            await poller
+
+            counter = iter(range(10 ** 9))
+
+            async def upload():
+                for _ in range(args.batches):
+                    files = [("files", (f"r{n}.txt", resume(rng, n))) for n in
+                             (next(counter) for _ in range(args.files))]
+                    await client.post("/bulk-upload", files=files, headers=headers)
+
+            busy, stop = [], asyncio.Event()
+            poller = asyncio.create_task(poll(busy, stop))
+            started = time.perf_counter()
+            await asyncio.gather(*(upload() for _ in range(args.uploaders)))
+            ingest_seconds = time.perf_counter() - started
+            stop.set()
+            await poller
+
+    total = args.uploaders * args.batches * args.files
+    print(f"{args.seed} seeded candidates, {total} files ingested in {ingest_seconds:.1f} s "
+          f"({total / ingest_seconds:.0f} files/s)")
+    print(f"{'/candidates ms':>16} {'n':>5} {'p50':>8} {'p99':>8} {'max':>8}")
+    for label, samples in (("idle", idle), ("during ingest", busy)):
+        ms = np.asarray(samples) * 1000
+        print(f"{label:>16} {ms.size:5d} {np.percentile(ms, 50):8.1f} {np.percentile(ms, 99):8.1f} {ms.max():8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=2000)
+    parser.add_argument("--uploaders", type=int, default=4)
+    parser.add_argument("--batches", type=int, default=5)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--interval-ms", type=float, default=20)
+    parser.add_argument("--idle-seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    # main uses relative paths for the database and upload store
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
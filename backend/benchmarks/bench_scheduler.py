@@ -0,0 +1,70 @@
+"""Benchmark: interactive queue wait under a bulk upload, FIFO vs fair-share scheduling.
+
+One user queues a large bulk upload; meanwhile other users send single
+interactive uploads at a steady rate. Screening is simulated with a fixed
+sleep. Reports the queue wait of the interactive uploads with a plain FIFO
+thread pool (the old behaviour: every job in arrival order) and with
+services.screening_scheduler.FairScheduler.
+
+    python benchmarks/bench_scheduler.py --bulk 300 --interactive 20 --service-ms 20
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.screening_scheduler import FairScheduler  # noqa: E402
+
+
+def run(submit, args):
+    service = args.service_ms / 1000
+    interactive_waits = []
+    lock = threading.Lock()
+
+    def screen(enqueued, interactive):
+        started = time.perf_counter()
+        if interactive:
+            with lock:
+                interactive_waits.append(started - enqueued)
+        time.sleep(service)
+
+    futures = [submit(screen, "bulk-user", "bulk", time.perf_counter(), False) for _ in range(args.bulk)]
+    for i in range(args.interactive):
+        time.sleep(args.interval_ms / 1000)
+        futures.append(submit(screen, f"user-{i % 3}", "interactive", time.perf_counter(), True))
+    wait(futures)
+    return np.asarray(interactive_waits) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bulk", type=int, default=300)
+    parser.add_argument("--interactive", type=int, default=20)
+    parser.add_argument("--interval-ms", type=float, default=50)
+    parser.add_argument("--service-ms", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    fifo = ThreadPoolExecutor(max_workers=args.workers)
+    fifo_waits = run(lambda fn, user, priority, *a: fifo.submit(fn, *a), args)
+    fifo.shutdown()
+
+    scheduler = FairScheduler(workers=args.workers, per_user_limit=max(1, args.workers - 1))
+    fair_waits = run(lambda fn, user, priority, *a: scheduler.submit(fn, *a, user=user, priority=priority), args)
+
+    print(f"{args.bulk} bulk jobs, {args.interactive} interactive, {args.workers} workers, "
+          f"{args.service_ms:.0f} ms per screening")
+    print(f"{'interactive wait':>18} {'p50':>9} {'p99':>9} {'max':>9}")
+    for label, waits in (("fifo", fifo_waits), ("fair-share", fair_waits)):
+        print(f"{label:>18} {np.percentile(waits, 50):9.1f} {np.percentile(waits, 99):9.1f} {waits.max():9.1f}")
+    print(scheduler.stats()["queue_wait_ms"])
+
+
+if __name__ == "__main__":
+    main()
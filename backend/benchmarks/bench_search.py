@@ -0,0 +1,85 @@
+"""Latency benchmark for keyword and hybrid candidate search.
+
+Builds a synthetic corpus in a temporary index and reports p50/p95/p99
+query latency. Vector retrieval is stubbed with a fixed-cost ranking so the
+numbers isolate the BM25 index, the concurrent fan-out and the fusion step.
+
+    python benchmarks/bench_search.py --sizes 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.semantic_search import SemanticSearch  # noqa: E402
+
+SKILLS = ["python", "fastapi", "django", "react", "typescript", "sql", "postgres", "aws",
+          "docker", "kubernetes", "java", "spring", "go", "rust", "pytorch", "tensorflow",
+          "scikit-learn", "pandas", "spark", "kafka", "terraform", "graphql", "redis", "c++"]
+WORDS = ("led built designed migrated scaled team service platform pipeline api data "
+         "customer latency reliability product startup senior engineer developer analyst "
+         "university degree bachelor master computer science mathematics").split()
+QUERIES = ["senior python", "react developer", "kubernetes aws terraform", "machine learning pytorch",
+           "java spring backend", "data engineer spark kafka", "golang", "postgres performance"]
+
+
+def make_candidates(n, rng):
+    candidates, texts = [], {}
+    for i in range(1, n + 1):
+        skills = rng.sample(SKILLS, rng.randint(3, 8))
+        candidates.append({
+            "id": i,
+            "name": f"Candidate {i}",
+            "skills": skills,
+            "tags": ["shortlist"] if i % 50 == 0 else [],
+            "reason": " ".join(rng.choices(WORDS, k=20)),
+        })
+        texts[i] = " ".join(rng.choices(WORDS + skills, k=400))
+    return candidates, texts
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def run(size, repeats, rng):
+    with tempfile.TemporaryDirectory() as tmp:
+        search = SemanticSearch(index_dir=tmp)
+        candidates, texts = make_candidates(size, rng)
+
+        start = time.perf_counter()
+        search.prepare_candidates(candidates, lambda ids: {i: texts[i] for i in ids})
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        search.prepare_candidates(candidates, lambda ids: {i: texts[i] for i in ids})
+        resync = time.perf_counter() - start
+
+        # Fixed-cost stand-in for embedding retrieval
+        search._vector_search = lambda q, k: [{"candidate": c, "score": 0.0} for c in candidates[:k]]
+
+        for name, fn in [("keyword", search.keyword_search), ("hybrid", search.hybrid_search)]:
+            samples = []
+            for _ in range(repeats):
+                for query in QUERIES:
+                    t = time.perf_counter()
+                    fn(query, 10)
+                    samples.append((time.perf_counter() - t) * 1000)
+            print(f"{size:>7} {name:<8} p50={percentile(samples, 50):7.2f}ms "
+                  f"p95={percentile(samples, 95):7.2f}ms p99={percentile(samples, 99):7.2f}ms")
+        print(f"{size:>7} index build={build:.2f}s unchanged resync={resync:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+    rng = random.Random(42)
+    for size in args.sizes:
+        run(size, args.repeats, rng)
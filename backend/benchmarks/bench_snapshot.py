@@ -0,0 +1,107 @@
+"""Benchmark: candidate list queries from SQL vs the columnar snapshot.
+
+Fills a scratch SQLite database with synthetic candidates, then times
+building the full list the way /candidates did before the snapshot (one
+SELECT of the list columns, JSON-decoding skills, loading tags), and the
+snapshot's full load, no-op refresh, incremental refresh after a few
+updates, and filtered / top-N queries over all rows.
+
+    python benchmarks/bench_snapshot.py --size 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from database import Base  # noqa: E402
+from models import Candidate  # noqa: E402
+from schemas import decode_json_lists  # noqa: E402
+from services.candidate_snapshot import SNAPSHOT_COLUMNS, CandidateSnapshot  # noqa: E402
+from services.tag_service import bulk_tag, load_tags  # noqa: E402
+
+SKILLS = ["Python", "Java", "SQL", "Docker", "React", "AWS", "Kubernetes", "Spark", "Django", "Go",
+          "TypeScript", "Rust", "Terraform", "Kafka", "Airflow", "FastAPI", "Pandas", "PyTorch"]
+
+
+def timed(label, fn, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:>44} {best * 1000:10.1f} ms")
+    return result
+
+
+def sql_list(db):
+    """The list view as built before the snapshot"""
+    rows = db.execute(select(*SNAPSHOT_COLUMNS).order_by(Candidate.overall_score.desc(), Candidate.id)).all()
+    tags = load_tags(db)
+    skills = decode_json_lists([r.skills for r in rows])
+    return [{**row._asdict(), "skills": s, "tags": tags.get(row.id, [])} for row, s in zip(rows, skills)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--updates", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+
+        rng = random.Random(11)
+        db.execute(insert(Candidate), [
+            {"name": f"Candidate {i}", "email": f"c{i}@example.com", "filename": f"c{i}.pdf",
+             "skills": json.dumps(rng.sample(SKILLS, rng.randint(2, 6))),
+             "skills_score": rng.uniform(0, 100), "experience_score": rng.uniform(0, 100),
+             "education_score": rng.uniform(0, 100), "overall_score": round(rng.uniform(0, 100), 1),
+             "experience_years": rng.uniform(0, 20), "recommendation": rng.choice(["SELECT", "REJECT"]),
+             "reason": "Synthetic candidate", "change_seq": 0}
+            for i in range(args.size)
+        ])
+        db.commit()
+        bulk_tag(db, rng.sample(range(1, args.size + 1), args.size // 10), "shortlist")
+
+        print(f"{args.size} candidates")
+        timed("SQL: full list", lambda: sql_list(db))
+
+        snapshot = CandidateSnapshot()
+        started = time.perf_counter()
+        snapshot.refresh(db)
+        print(f"{'snapshot: initial load':>44} {(time.perf_counter() - started) * 1000:10.1f} ms")
+        timed("snapshot: refresh, nothing changed", lambda: snapshot.refresh(db))
+
+        def update_some():
+            for candidate_id in rng.sample(range(1, args.size + 1), args.updates):
+                db.get(Candidate, candidate_id).overall_score = rng.uniform(0, 100)
+            db.commit()
+            started = time.perf_counter()
+            snapshot.refresh(db)
+            return time.perf_counter() - started
+
+        elapsed = min(update_some() for _ in range(3))
+        print(f"{f'snapshot: refresh after {args.updates} updates':>44} {elapsed * 1000:10.1f} ms")
+
+        timed("snapshot: full list", lambda: snapshot.query())
+        timed("snapshot: SELECT + 2 skills + score >= 70", lambda: snapshot.query(
+            recommendation="SELECT", skills=["python", "sql"], min_score=70))
+        timed("snapshot: same filter, top 50", lambda: snapshot.query(
+            recommendation="SELECT", skills=["python", "sql"], min_score=70, limit=50))
+        timed("snapshot: tag filter, top 50 by experience", lambda: snapshot.query(
+            tag="shortlist", sort="experience_years", limit=50))
+        timed("snapshot: stats", snapshot.stats)
+
+
+if __name__ == "__main__":
+    main()
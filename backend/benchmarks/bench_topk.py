@@ -0,0 +1,73 @@
+"""Microbenchmark: vectorised top-k over the embedding matrix vs the old per-candidate loop.
+
+The old path computed one cosine similarity per candidate in Python, built a
+dict per candidate and sorted the full list. The new path scores every
+candidate with one matrix-vector product and selects the top k with
+np.argpartition (services.semantic_search.top_k_indices).
+
+    python benchmarks/bench_topk.py --size 100000 --dim 1024
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.semantic_search import top_k_indices  # noqa: E402
+
+
+def old_path(query, vectors, candidates, k):
+    results = []
+    for candidate, vector in zip(candidates, vectors):
+        similarity = np.dot(query, vector) / (np.linalg.norm(query) * np.linalg.norm(vector))
+        results.append({'candidate': candidate, 'score': float(similarity * 100)})
+    results.sort(key=lambda x: x['score'], reverse=True)
+    return results[:k]
+
+
+def new_path(query, matrix, candidates, k):
+    scores = matrix @ (query / np.linalg.norm(query)) * 100
+    return [{'candidate': candidates[i], 'score': float(scores[i])} for i in top_k_indices(scores, k)]
+
+
+def timed(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((args.size, args.dim), dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    vectors = list(matrix)
+    candidates = [{"id": i} for i in range(args.size)]
+    query = rng.standard_normal(args.dim, dtype=np.float32)
+
+    old_ids = [r['candidate']['id'] for r in old_path(query, vectors, candidates, args.k)]
+    new_ids = [r['candidate']['id'] for r in new_path(query, matrix, candidates, args.k)]
+    assert old_ids == new_ids, "top-k mismatch"
+
+    old_ms = timed(lambda: old_path(query, vectors, candidates, args.k), args.repeats)
+    new_ms = timed(lambda: new_path(query, matrix, candidates, args.k), args.repeats)
+    scores = matrix @ query
+    full_sort_ms = timed(lambda: np.argsort(scores)[-args.k:][::-1], args.repeats)
+    part_ms = timed(lambda: top_k_indices(scores, args.k), args.repeats)
+    print(f"N={args.size} dim={args.dim} k={args.k}")
+    print(f"per-candidate loop + full sort: {old_ms:9.2f} ms")
+    print(f"matrix product + argpartition:  {new_ms:9.2f} ms  ({old_ms / new_ms:.0f}x)")
+    print(f"selection only, full argsort:   {full_sort_ms:9.2f} ms")
+    print(f"selection only, argpartition:   {part_ms:9.2f} ms")
@@ -0,0 +1,93 @@
+"""Measure screening-prompt size before and after section-aware truncation.
+
+Runs every resume in a corpus directory (.pdf, .docx, .txt) through text
+extraction and compares the resume tokens the old prompt sent (the whole
+extracted text) with what build_resume_excerpt keeps under the budget.
+Token counts use the same ~4 characters/token estimate as the budgeter.
+Without --corpus a synthetic corpus of long CVs is generated.
+
+    python benchmarks/measure_prompt_tokens.py --corpus resumes/ --budget 1500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.resume_preprocess import build_resume_excerpt, estimate_tokens  # noqa: E402
+
+WORDS = ("python fastapi react docker kubernetes sql machine learning pipeline data "
+         "team delivered platform service latency customers migration design").split()
+
+
+def synthetic_resume(rng: random.Random, pages: int) -> str:
+    def sentence(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+    lines = ["Curriculum Vitae", "Jane Doe", "jane.doe@example.com | +1 555 0100", "", "Skills"]
+    lines += [", ".join(rng.sample(WORDS, 6)) for _ in range(3)]
+    lines += ["", "Professional Experience"]
+    for page in range(pages):
+        lines += [f"Senior Engineer, Company {page}  2015 - 2020"]
+        lines += [f"-   {sentence(14)}" for _ in range(12)]
+        lines += ["", f"Page {page + 1} of {pages}", "Jane Doe - Resume", ""]
+    lines += ["Education", "MSc Computer Science, Example University, 2014", "", "Publications"]
+    lines += [sentence(20) for _ in range(pages * 15)]
+    return "\n".join(lines)
+
+
+def load_corpus(directory: str):
+    from extract import SUPPORTED_EXTENSIONS, extract_text
+
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        ext = os.path.splitext(name)[1].lower()
+        if ext == ".txt":
+            with open(path, encoding="utf-8", errors="ignore") as f:
+                yield name, f.read()
+        elif ext in SUPPORTED_EXTENSIONS:
+            yield name, extract_text(path)
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", help="directory of .pdf/.docx/.txt resumes")
+    parser.add_argument("--budget", type=int, default=1500, help="resume token budget")
+    parser.add_argument("--synthetic", type=int, default=200, help="synthetic resumes when no corpus is given")
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = list(load_corpus(args.corpus))
+    else:
+        rng = random.Random(42)
+        corpus = [(f"synthetic-{i}", synthetic_resume(rng, rng.randint(1, 15))) for i in range(args.synthetic)]
+    if not corpus:
+        print("No resumes found")
+        return
+
+    raw, trimmed = [], []
+    start = time.perf_counter()
+    for _, text in corpus:
+        raw.append(estimate_tokens(text))
+        trimmed.append(estimate_tokens(build_resume_excerpt(text, args.budget)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(corpus)} resumes, budget {args.budget} tokens")
+    print(f"{'':>8} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8}")
+    for label, values in (("before", raw), ("after", trimmed)):
+        print(f"{label:>8} {sum(values) / len(values):8.0f} {percentile(values, 0.5):8d} "
+              f"{percentile(values, 0.95):8d} {max(values):8d}")
+    print(f"prompt-token reduction: {1 - sum(trimmed) / sum(raw):.1%}")
+    print(f"over budget before: {sum(r > args.budget for r in raw)}, after: {sum(t > args.budget for t in trimmed)}")
+    print(f"preprocessing: {elapsed / len(corpus) * 1000:.2f} ms/resume")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -10,4 +11,14 @@ engine = create_engine(
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+# Async driver for the same database, used by async endpoints so queries
+# don't block the event loop (aiosqlite here, asyncpg once on PostgreSQL)
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+ASYNC_DATABASE_URL = engine.url.set(drivername=ASYNC_DRIVERS[engine.url.get_backend_name()])
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+# expire_on_commit=False: async code can't lazily reload attributes after a commit
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+Base = declarative_base()
+
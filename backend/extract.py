@@ -1,26 +1,58 @@
-import pdfplumber
-import docx
+import io
 import os
-from typing import Optional
+from typing import Optional, Union, BinaryIO
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file"""
-    text = ""
+# pdfplumber and python-docx are imported on first use; most requests never
+# extract anything, and workers start faster without them.
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+Source = Union[str, BinaryIO]
+
+def extract_text_from_pdf(source: Source, ocr: bool = True, report=None) -> str:
+    """Extract text from a PDF file path or binary stream.
+    
+    Pages without a text layer (scans) are OCR'd when `ocr` is set and
+    tesseract is installed; pass an OcrReport as `report` to collect the
+    OCR cost (and, with `ocr` off, to learn whether OCR is needed).
+    """
+    import pdfplumber
+    from services.ocr import OcrReport, ocr_pages, page_image_hash
+    
+    report = report if report is not None else OcrReport()
+    page_texts = []
+    image_pages = []  # (index, page hash) of pages with no text layer
     try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
+        with pdfplumber.open(source) as pdf:
+            for index, page in enumerate(pdf.pages):
                 page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+                page_texts.append(page_text or "")
+                if not (page_text or "").strip():
+                    key = page_image_hash(page)
+                    if key:
+                        image_pages.append((index, key))
+        
+        report.page_count += len(page_texts)
+        report.image_pages += len(image_pages)
+        if ocr and image_pages:
+            if isinstance(source, str):
+                pdf_source = source
+            else:
+                source.seek(0)
+                pdf_source = source.read()
+            for index, page_text in ocr_pages(pdf_source, image_pages, report).items():
+                page_texts[index] = page_text
     except Exception as e:
         print(f"Error extracting PDF: {e}")
-    return text
+    # Form feeds mark page breaks, for telling running headers and footers from content
+    return "\f".join(page_text + "\n" for page_text in page_texts if page_text)
 
-def extract_text_from_docx(file_path: str) -> str:
-    """Extract text from DOCX file"""
+def extract_text_from_docx(source: Source) -> str:
+    """Extract text from a DOCX file path or binary stream"""
+    import docx
+    
     text = ""
     try:
-        doc = docx.Document(file_path)
+        doc = docx.Document(source)
         for paragraph in doc.paragraphs:
             if paragraph.text:
                 text += paragraph.text + "\n"
@@ -28,7 +60,7 @@ def extract_text_from_docx(file_path: str) -> str:
         print(f"Error extracting DOCX: {e}")
     return text
 
-def extract_text(file_path: str) -> Optional[str]:
+def extract_text(file_path: str, ocr_report=None) -> Optional[str]:
     """Extract text based on file extension"""
     if not os.path.exists(file_path):
         return None
@@ -36,11 +68,24 @@ def extract_text(file_path: str) -> Optional[str]:
     ext = os.path.splitext(file_path)[1].lower()
     
     if ext == '.pdf':
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path, report=ocr_report)
     elif ext == '.docx':
         return extract_text_from_docx(file_path)
     elif ext == '.txt':
         with open(file_path, 'r', encoding='utf-8') as f:
             return f.read()
     else:
-        return None
\ No newline at end of file
+        return None
+
+def extract_text_from_bytes(data: bytes, filename: str, ocr: bool = True, ocr_report=None) -> Optional[str]:
+    """Extract text from an in-memory file, using its name for the format"""
+    ext = os.path.splitext(filename)[1].lower()
+    
+    if ext == '.pdf':
+        return extract_text_from_pdf(io.BytesIO(data), ocr, ocr_report)
+    elif ext == '.docx':
+        return extract_text_from_docx(io.BytesIO(data))
+    elif ext == '.txt':
+        return data.decode('utf-8', errors='replace')
+    else:
+        return None
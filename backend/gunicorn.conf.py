@@ -0,0 +1,14 @@
+# Production launcher: gunicorn -c gunicorn.conf.py main:app
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = 120
+graceful_timeout = 30
+
+
+def on_starting(server):
+    """Create and upgrade the schema once in the master before workers fork"""
+    from run import prepare_database
+    prepare_database()
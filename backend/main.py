@@ -1,26 +1,140 @@
-from fastapi import FastAPI, UploadFile, File, Form, Depends, HTTPException, BackgroundTasks
+from fastapi import (
+    FastAPI, UploadFile, File, Form, Body, Query, Header, Depends, HTTPException, BackgroundTasks, Request, Response
+)
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-import shutil
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 import os
+import io
 import json
+import hashlib
+import tarfile
+import zipfile
 from typing import List, Optional
 from datetime import datetime, timedelta
 import asyncio
+import threading
+import time
 
-from database import SessionLocal, engine
-from models import Base, User, Candidate
+from database import SessionLocal, AsyncSessionLocal, engine, async_engine
+from models import (
+    User, Candidate, CandidateNeighbor, ResumeDocument, JobProfile, UploadSession, Person,
+    IngestionRun, IngestionFileRecord, current_change_seq
+)
+from migrations import init_db
+from schemas import (
+    CandidateSummary, CandidateDetail, SimilarCandidate, JobProfileIn, JobProfileOut,
+    PersonOut, ResumeVersion, decode_json_lists
+)
 from auth import verify_password, get_password_hash, create_access_token, verify_token
 from extract import extract_text
-from screener import screen_resume
-from services.semantic_search import SemanticSearch
+from services.content_store import text_hash
+from services.storage import create_storage, apply_retention
+from services.ocr import OcrReport
+from services.resume_preprocess import build_resume_excerpt
+from services.field_extractor import extract_fields
+from services.ingestion_report import (
+    new_file_record, describe_text, settle, start_screening, finish_screening, iter_report_csv, summarize_run
+)
+from services.identity import SCREENING_FIELDS, resolve_candidate, previous_screening, backfill_persons
+from services.scoring import ScoringPolicy, validate_policy, policy_for_job, overall_score, recommendation, rescore
+from services.warmup import Warmup, one_process_at_a_time
+from services.http_cache import make_etag, not_modified, set_etag
+from services.archive_ingest import extract_archive, is_archive
+from services.chunked_upload import (
+    OffsetMismatch, new_upload_id, partial_path, received_bytes, check_limits, append_chunk, discard, expire_sessions
+)
+from services.tag_service import (
+    normalize_tag, bulk_tag, bulk_untag, list_tags
+)
 from utils.email_service import send_email
 from utils.calendar_service import schedule_calendar_event
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Upload directory
+UPLOAD_DIR = "resumes"
+storage = create_storage(UPLOAD_DIR)
+# Size of the resume excerpt stored on each candidate row (~1000 characters)
+RESUME_EXCERPT_TOKENS = 250
+
+# Neighbours kept per candidate in the similarity graph
+SIMILARITY_K = int(os.getenv("SIMILARITY_K", "20"))
+
+# Heavy subsystems (numpy, scikit-learn, pdfplumber, python-docx, ollama) are
+# imported on first use and preloaded here after the server starts accepting
+# requests.
+warmup = Warmup()
+
+def _preload_modules():
+    import numpy  # noqa: F401
+    import pdfplumber  # noqa: F401
+    import docx  # noqa: F401
+    import ollama  # noqa: F401
+    import services.dedup  # noqa: F401
+    import services.scoring_backends  # noqa: F401
+    import services.similarity_graph  # noqa: F401
+    import services.candidate_snapshot  # noqa: F401
+    import sklearn.linear_model  # noqa: F401
+    import sklearn.feature_extraction.text  # noqa: F401
+
+def _preload_search_index():
+    db = SessionLocal()
+    try:
+        refresh_search_index(db)
+    finally:
+        db.close()
+
+def _warmup_lock(name: str) -> str:
+    """Lock file serialising a one-off warm-up task across worker processes"""
+    return os.path.join(UPLOAD_DIR, f".{name}.lock")
 
-app = FastAPI(title="AI Resume Screener API")
+def _backfill_persons():
+    db = SessionLocal()
+    try:
+        backfill_persons(db)
+    finally:
+        db.close()
+
+def _backfill_similarity_graph():
+    db = SessionLocal()
+    try:
+        get_similarity_graph().backfill(db)
+    finally:
+        db.close()
+
+def _apply_storage_retention():
+    db = SessionLocal()
+    try:
+        apply_retention(db, storage)
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create tables. Multi-worker launchers do this once in the parent
+    # process and set SKIP_SCHEMA_SETUP so workers don't race on DDL.
+    if os.getenv("SKIP_SCHEMA_SETUP") != "1":
+        init_db(engine)
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    
+    # Every worker warms its own caches; one-off backfills run in whichever
+    # worker gets to them first
+    warmup.start([
+        ("modules", _preload_modules),
+        ("search_index", _preload_search_index),
+        ("similarity_graph", one_process_at_a_time(_warmup_lock("similarity_graph"), _backfill_similarity_graph)),
+        ("persons", one_process_at_a_time(_warmup_lock("persons"), _backfill_persons)),
+        ("storage_retention", one_process_at_a_time(_warmup_lock("storage_retention"), _apply_storage_retention)),
+    ])
+    yield
+    await async_engine.dispose()
+
+app = FastAPI(title="AI Resume Screener API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -32,12 +146,86 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
-# Create upload directory
-UPLOAD_DIR = "resumes"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Compress JSON responses; brotli when the optional brotli-asgi package is
+# installed (it falls back to gzip for clients that don't accept br)
+try:
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=1000)
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Semantic search, created on first use
+_semantic_search = None
+_semantic_search_lock = threading.Lock()
+
+def get_semantic_search():
+    global _semantic_search
+    if _semantic_search is None:
+        with _semantic_search_lock:
+            if _semantic_search is None:
+                from services.semantic_search import SemanticSearch
+                _semantic_search = SemanticSearch()
+    return _semantic_search
+
+# Screening backends (local model, then Ollama models), created on first use
+_screening_router = None
+_screening_router_lock = threading.Lock()
+
+def get_screening_router():
+    global _screening_router
+    if _screening_router is None:
+        with _screening_router_lock:
+            if _screening_router is None:
+                from services.scoring_backends import build_router
+                _screening_router = build_router(SessionLocal)
+    return _screening_router
+
+# Screening queue, created on first use
+_screening_scheduler = None
+_screening_scheduler_lock = threading.Lock()
+
+def get_screening_scheduler():
+    global _screening_scheduler
+    if _screening_scheduler is None:
+        with _screening_scheduler_lock:
+            if _screening_scheduler is None:
+                from services.screening_scheduler import FairScheduler
+                _screening_scheduler = FairScheduler()
+    return _screening_scheduler
+
+# Candidate nearest-neighbour graph, created on first use
+_similarity_graph = None
+_similarity_graph_lock = threading.Lock()
+
+def get_similarity_graph():
+    global _similarity_graph
+    if _similarity_graph is None:
+        with _similarity_graph_lock:
+            if _similarity_graph is None:
+                from services.similarity_graph import SimilarityGraph
+                _similarity_graph = SimilarityGraph(SIMILARITY_K)
+    return _similarity_graph
+
+def add_to_similarity_graph(candidate_id: int, skills: List[str], text: str):
+    """Store a screened candidate's vector and neighbours (own session; commits)"""
+    db = SessionLocal()
+    try:
+        get_similarity_graph().add(db, candidate_id, skills, text)
+    finally:
+        db.close()
+
+# Columnar copy of the candidates table for list views, created on first use
+_candidate_snapshot = None
+_candidate_snapshot_lock = threading.Lock()
 
-# Initialize semantic search
-semantic_search = SemanticSearch()
+def get_candidate_snapshot():
+    global _candidate_snapshot
+    if _candidate_snapshot is None:
+        with _candidate_snapshot_lock:
+            if _candidate_snapshot is None:
+                from services.candidate_snapshot import CandidateSnapshot
+                _candidate_snapshot = CandidateSnapshot()
+    return _candidate_snapshot
 
 # Dependency
 def get_db():
@@ -47,6 +235,12 @@ def get_db():
     finally:
         db.close()
 
+# Async endpoints use this one; sync (def) endpoints keep get_db and run on
+# the thread pool
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Default job description
 DEFAULT_JOB_DESCRIPTION = """
 We are looking for a Python Developer with:
@@ -63,6 +257,12 @@ We are looking for a Python Developer with:
 def root():
     return {"message": "AI Resume Screener API", "status": "running"}
 
+@app.get("/ready")
+def ready():
+    """Readiness probe: 200 once background warm-up has finished, 503 before"""
+    status = warmup.status()
+    return ORJSONResponse(status, status_code=200 if status["ready"] else 503)
+
 @app.post("/register")
 def register_form(
     username: str = Form(...),
@@ -115,61 +315,203 @@ def test_token(token_data: dict = Depends(verify_token)):
         "user_data": token_data
     }
     
-@app.post("/upload")
-async def upload_resume(
-    file: UploadFile = File(...),
-    job_description: str = Form(DEFAULT_JOB_DESCRIPTION),
-    token_data: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
-):
-    # Save file
-    file_path = os.path.join(UPLOAD_DIR, file.filename)
+def extract_stored(key: str, ocr_report: Optional[OcrReport] = None) -> str:
+    """Extract text from a stored original"""
+    with storage.local_path(key) as path:
+        return extract_text(path, ocr_report)
+
+async def start_ingestion_run(db: AsyncSession, source: str, user_id: Optional[int],
+                              run_id: Optional[str] = None) -> IngestionRun:
+    """Record a new batch; files are added to it with save_file_record"""
+    run = IngestionRun(id=run_id or new_upload_id(), source=source, user_id=user_id)
+    db.add(run)
+    await db.commit()
+    return run
+
+async def save_file_record(db: AsyncSession, record: IngestionFileRecord, candidate: Optional[Candidate],
+                           is_duplicate: bool, error: Optional[str] = None):
+    """Store a file's ingestion record; commit before queueing its screening"""
+    settle(record, candidate, is_duplicate, error)
+    db.add(record)
+    await db.commit()
+
+async def ingest_resume(db: AsyncSession, stream, filename: str, job_description: str, user_id: Optional[int],
+                        resume_text: Optional[str] = None, ocr_report: Optional[OcrReport] = None,
+                        record: Optional[IngestionFileRecord] = None):
+    """Store an uploaded file and create (or find) its candidate.
     
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    Returns (candidate, resume_text, is_duplicate). Files are stored once per
+    content hash; known content reuses the stored extraction, and an upload
+    already screened against the same job description returns that candidate
+    instead of screening it again, as does a new upload by the same person
+    (see services.identity) whose text is unchanged. Pass `resume_text` (and
+    the OCR report, if any) when the caller has already extracted it, and an
+    ingestion file record to have its size, language and extraction cost
+    filled in. File I/O and text
+    processing run on the thread pool and queries on the async session, so
+    the event loop stays free for other requests.
+    """
+    from services.dedup import minhash_signature, find_near_duplicate, index_document
     
-    # Extract text
-    resume_text = extract_text(file_path)
+    stored = await run_in_threadpool(storage.save_stream, stream, filename)
+    job_hash = text_hash(job_description)
+    if record is not None:
+        record.size_bytes = stored.size
     
-    if not resume_text:
-        raise HTTPException(status_code=400, detail="Could not extract text from file")
+    existing = await db.scalar(
+        select(Candidate).options(selectinload(Candidate.tags)).where(
+            Candidate.content_hash == stored.sha256,
+            Candidate.job_hash == job_hash,
+            Candidate.recommendation != "ERROR"
+        ).order_by(Candidate.id.desc()).limit(1)
+    )
+    if existing:
+        return existing, None, True
+    
+    document = await db.scalar(select(ResumeDocument).where(ResumeDocument.sha256 == stored.sha256))
+    near_duplicate = None
+    if document:
+        resume_text = document.text
+        if record is not None:
+            describe_text(record, resume_text)
+        if document.storage_path is None:
+            # Original dropped by retention and now uploaded again
+            document.storage_path = stored.key
+        if document.text_sha256 is None:
+            document.text_sha256 = text_hash(resume_text or "")
+    else:
+        extraction_seconds = 0.0
+        if resume_text is None:
+            ocr_report = OcrReport()
+            started = time.perf_counter()
+            resume_text = await run_in_threadpool(extract_stored, stored.key, ocr_report)
+            extraction_seconds = time.perf_counter() - started
+        if record is not None:
+            describe_text(record, resume_text, ocr_report, extraction_seconds)
+        if not resume_text:
+            return None, None, False
+        
+        signature = await run_in_threadpool(minhash_signature, resume_text)
+        near_duplicate = await db.run_sync(find_near_duplicate, signature, exclude_sha256=stored.sha256)
+        document = ResumeDocument(
+            sha256=stored.sha256,
+            size_bytes=stored.size,
+            extension=stored.extension,
+            storage_path=stored.key,
+            text=resume_text,
+            text_sha256=text_hash(resume_text),
+            ocr_pages=ocr_report.pages if ocr_report else 0,
+            ocr_seconds=ocr_report.seconds if ocr_report else 0
+        )
+        try:
+            # A savepoint, so losing the race below leaves the caller's
+            # transaction usable
+            async with db.begin_nested():
+                db.add(document)
+                await db.flush()
+        except IntegrityError:
+            # An overlapping upload of the same new file stored it first;
+            # carry on as for known content
+            document = await db.scalar(select(ResumeDocument).where(ResumeDocument.sha256 == stored.sha256))
+            resume_text, near_duplicate = document.text, None
+        else:
+            await db.run_sync(index_document, document, signature)
+    
+    near_duplicate_of, near_duplicate_score = None, None
+    if near_duplicate:
+        near_doc, near_duplicate_score = near_duplicate
+        near_duplicate_of = await db.scalar(
+            select(Candidate.id).where(Candidate.content_hash == near_doc.sha256)
+            .order_by(Candidate.id.desc()).limit(1)
+        )
+    
+    # Contact details and experience come from the text right away; the
+    # model only scores the fit
+    fields = await run_in_threadpool(extract_fields, resume_text)
+    excerpt = await run_in_threadpool(build_resume_excerpt, resume_text, RESUME_EXCERPT_TOKENS)
     
     # Create candidate entry
     candidate = Candidate(
-        name="Processing...",
-        email="Processing...",
-        resume_text=resume_text[:1000],
-        filename=file.filename,
+        name=fields.name or os.path.splitext(os.path.basename(filename or ""))[0] or "Unknown",
+        email=fields.email or "",
+        phone=fields.phone,
+        linkedin_url=fields.linkedin_url,
+        github_url=fields.github_url,
+        resume_text=excerpt,
+        filename=filename,
+        content_hash=stored.sha256,
+        job_hash=job_hash,
+        near_duplicate_of=near_duplicate_of,
+        near_duplicate_score=near_duplicate_score if near_duplicate_of else None,
         skills_score=0,
         experience_score=0,
         education_score=0,
         overall_score=0,
         skills="[]",
-        experience_years=0,
+        experience_years=fields.experience_years,
         recommendation="PROCESSING",
         reason="Analysis in progress...",
-        uploaded_by=token_data.get("id")
+        uploaded_by=user_id
     )
     
     db.add(candidate)
-    db.commit()
-    db.refresh(candidate)
+    await db.flush()
+    
+    # Link the upload to the applicant's earlier ones. A new version whose
+    # text was already screened for this job reuses that screening.
+    await db.run_sync(resolve_candidate, candidate)
+    previous = await db.run_sync(previous_screening, candidate, document.text_sha256)
+    if previous:
+        for field in SCREENING_FIELDS:
+            setattr(candidate, field, getattr(previous, field))
+    await db.commit()
+    if previous:
+        await db.refresh(candidate, ["tags"])
+        await run_in_threadpool(add_to_similarity_graph, candidate.id, decode_json_lists([candidate.skills])[0],
+                                document.text)
+        return candidate, None, True
+    await db.refresh(candidate)
+    return candidate, resume_text, False
+
+@app.post("/upload")
+async def upload_resume(
+    file: UploadFile = File(...),
+    job_description: str = Form(DEFAULT_JOB_DESCRIPTION),
+    token_data: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    candidate, resume_text, is_duplicate = await ingest_resume(
+        db, file.file, file.filename, job_description, token_data.get("id")
+    )
+    
+    if candidate is None:
+        raise HTTPException(status_code=400, detail="Could not extract text from file")
+    
+    if is_duplicate:
+        # Same file already screened against this job description
+        result = CandidateSummary.model_validate(candidate).model_dump()
+        result["duplicate"] = True
+        return result
     
     # Process in background
-    asyncio.create_task(process_resume_background(candidate.id, resume_text, job_description, db))
+    schedule_screening(candidate.id, resume_text, job_description, token_data.get("id"), "interactive")
     
     return {
         "id": candidate.id,
-        "name": "Processing...",
-        "email": "Processing...",
+        "name": candidate.name,
+        "email": candidate.email,
+        "phone": candidate.phone,
         "skills": [],
-        "experience_years": 0,
+        "experience_years": candidate.experience_years,
         "skills_score": 0,
         "experience_score": 0,
         "education_score": 0,
         "overall_score": 0,
         "recommendation": "PROCESSING",
-        "reason": "Your resume is being analyzed. Please check back in a minute."
+        "reason": "Your resume is being analyzed. Please check back in a minute.",
+        "duplicate": False,
+        "near_duplicate_of": candidate.near_duplicate_of,
+        "near_duplicate_score": candidate.near_duplicate_score
     }
 
 @app.post("/bulk-upload")
@@ -177,58 +519,45 @@ async def bulk_upload(
     files: List[UploadFile] = File(...),
     job_description: str = Form(DEFAULT_JOB_DESCRIPTION),
     token_data: dict = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     results = []
+    run = await start_ingestion_run(db, "bulk", token_data.get("id"))
     
     for file in files:
+        record = new_file_record(run.id, file.filename)
         try:
-            # Save file
-            file_path = os.path.join(UPLOAD_DIR, file.filename)
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            
-            # Extract text
-            resume_text = extract_text(file_path)
+            candidate, resume_text, is_duplicate = await ingest_resume(
+                db, file.file, file.filename, job_description, token_data.get("id"), record=record
+            )
+            await save_file_record(db, record, candidate, is_duplicate)
             
-            if resume_text:
-                # Create candidate entry
-                candidate = Candidate(
-                    name="Processing...",
-                    email="Processing...",
-                    resume_text=resume_text[:1000],
-                    filename=file.filename,
-                    skills_score=0,
-                    experience_score=0,
-                    education_score=0,
-                    overall_score=0,
-                    skills="[]",
-                    experience_years=0,
-                    recommendation="PROCESSING",
-                    reason="Analysis in progress...",
-                    uploaded_by=token_data.get("id")
-                )
-                
-                db.add(candidate)
-                db.commit()
-                db.refresh(candidate)
-                
-                # Process in background
-                asyncio.create_task(process_resume_background(candidate.id, resume_text, job_description, db))
-                
+            if candidate is None:
                 results.append({
                     "filename": file.filename,
-                    "status": "queued",
+                    "status": "failed",
+                    "error": "Could not extract text"
+                })
+            elif is_duplicate:
+                results.append({
+                    "filename": file.filename,
+                    "status": "duplicate",
                     "candidate_id": candidate.id
                 })
             else:
+                # Process in background
+                schedule_screening(candidate.id, resume_text, job_description, token_data.get("id"), "bulk")
+                
                 results.append({
                     "filename": file.filename,
-                    "status": "failed",
-                    "error": "Could not extract text"
+                    "status": "queued",
+                    "candidate_id": candidate.id,
+                    "near_duplicate_of": candidate.near_duplicate_of
                 })
                 
         except Exception as e:
+            await db.rollback()
+            await save_file_record(db, record, None, False, str(e))
             results.append({
                 "filename": file.filename,
                 "status": "failed",
@@ -236,130 +565,659 @@ async def bulk_upload(
             })
     
     return {
+        "run_id": run.id,
         "total": len(files),
         "queued": len([r for r in results if r["status"] == "queued"]),
+        "duplicates": len([r for r in results if r["status"] == "duplicate"]),
+        "failed": len([r for r in results if r["status"] == "failed"]),
+        "results": results
+    }
+
+@app.post("/bulk-upload-archive")
+async def bulk_upload_archive(
+    file: UploadFile = File(...),
+    job_description: str = Form(DEFAULT_JOB_DESCRIPTION),
+    token_data: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Ingest every PDF/DOCX/TXT inside a ZIP or TAR export"""
+    if not is_archive(file.filename):
+        raise HTTPException(status_code=400, detail="Expected a .zip or .tar(.gz/.bz2/.xz) archive")
+    
+    async def needs_extraction(member):
+        # Content we already have is linked to its stored extraction instead
+        digest = await run_in_threadpool(lambda: hashlib.sha256(member.data).hexdigest())
+        return await db.scalar(select(ResumeDocument.id).where(ResumeDocument.sha256 == digest)) is None
+    
+    results = []
+    run = await start_ingestion_run(db, "archive", token_data.get("id"))
+    try:
+        async for member in extract_archive(file.file, file.filename, needs_extraction):
+            record = new_file_record(run.id, member.name)
+            record.size_bytes = len(member.data) if member.data else None
+            record.extraction_ms = round(member.extraction_seconds * 1000, 1)
+            if member.error:
+                await save_file_record(db, record, None, False, member.error)
+                results.append({"filename": member.name, "status": "failed", "error": member.error})
+                continue
+            try:
+                candidate, resume_text, is_duplicate = await ingest_resume(
+                    db, io.BytesIO(member.data), os.path.basename(member.name), job_description,
+                    token_data.get("id"), resume_text=member.text, ocr_report=member.ocr, record=record
+                )
+                await save_file_record(db, record, candidate, is_duplicate)
+            except Exception as e:
+                await db.rollback()
+                await save_file_record(db, record, None, False, str(e))
+                results.append({"filename": member.name, "status": "failed", "error": str(e)})
+                continue
+            finally:
+                member.data = None
+            
+            if candidate is None:
+                results.append({"filename": member.name, "status": "failed", "error": "Could not extract text"})
+            elif is_duplicate:
+                results.append({"filename": member.name, "status": "duplicate", "candidate_id": candidate.id})
+            else:
+                schedule_screening(candidate.id, resume_text, job_description, token_data.get("id"), "bulk")
+                results.append({
+                    "filename": member.name,
+                    "status": "queued",
+                    "candidate_id": candidate.id,
+                    "near_duplicate_of": candidate.near_duplicate_of
+                })
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        if not results:
+            raise HTTPException(status_code=400, detail=f"Could not read archive: {e}")
+        # Files before the damage are already ingested; report them too
+        results.append({"filename": file.filename, "status": "failed", "error": f"Could not read archive: {e}"})
+    
+    return {
+        "run_id": run.id,
+        "total": len(results),
+        "queued": len([r for r in results if r["status"] == "queued"]),
+        "duplicates": len([r for r in results if r["status"] == "duplicate"]),
         "failed": len([r for r in results if r["status"] == "failed"]),
         "results": results
     }
 
-async def process_resume_background(candidate_id: int, resume_text: str, job_description: str, db: Session):
-    """Process resume in background"""
+# Resumable uploads: POST /uploads declares a file, PATCH /uploads/{id}
+# appends chunks at Upload-Offset (HEAD tells a reconnecting client where to
+# resume), and the file is screened as soon as its last chunk arrives.
+def get_upload_session(db: Session, upload_id: str, token_data: dict) -> UploadSession:
+    session = db.query(UploadSession).filter(UploadSession.id == upload_id).first()
+    if not session or session.user_id != token_data.get("id"):
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return session
+
+def upload_session_status(session: UploadSession) -> dict:
+    offset = session.length if session.status != "uploading" else received_bytes(UPLOAD_DIR, session.id)
+    return {
+        "upload_id": session.id,
+        "batch_id": session.batch_id,
+        "filename": session.filename,
+        "offset": offset,
+        "length": session.length,
+        "status": session.status,
+        "candidate_id": session.candidate_id,
+        "error": session.error
+    }
+
+async def finalize_upload(db: AsyncSession, session: UploadSession):
+    """Ingest a fully received upload and queue it for screening"""
+    path = partial_path(UPLOAD_DIR, session.id)
+    record = new_file_record(session.batch_id, session.filename)
+    to_screen = None
+    try:
+        with open(path, "rb") as f:
+            candidate, resume_text, is_duplicate = await ingest_resume(
+                db, f, session.filename, session.job_description, session.user_id, record=record
+            )
+        if candidate is None:
+            session.status, session.error = "failed", "Could not extract text"
+        elif is_duplicate:
+            session.status, session.candidate_id = "duplicate", candidate.id
+        else:
+            to_screen = (candidate.id, resume_text)
+            session.status, session.candidate_id = "queued", candidate.id
+    except Exception as e:
+        await db.rollback()
+        await db.refresh(session)
+        session.status, session.error = "failed", str(e)
+        candidate, is_duplicate = None, False
+    discard(UPLOAD_DIR, session.id)
+    session.completed_at = datetime.utcnow()
+    await save_file_record(db, record, candidate, is_duplicate, session.error)
+    if to_screen:
+        schedule_screening(*to_screen, session.job_description, session.user_id, "bulk")
+
+@app.post("/uploads", status_code=201)
+def create_upload(
+    filename: str = Form(...),
+    length: int = Form(...),
+    job_description: str = Form(DEFAULT_JOB_DESCRIPTION),
+    batch_id: Optional[str] = Form(None),
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
+):
+    """Start a resumable upload of `length` bytes, optionally in an existing batch"""
+    expire_sessions(db, UPLOAD_DIR)
+    run = None
+    if batch_id:
+        # The batch may also be a bulk upload's ingestion run with no sessions
+        run = db.get(IngestionRun, batch_id)
+        owner = db.query(UploadSession.user_id).filter(UploadSession.batch_id == batch_id).first()
+        if (run and run.user_id != token_data.get("id")) or (owner and owner[0] != token_data.get("id")):
+            raise HTTPException(status_code=404, detail="Batch not found")
+    else:
+        batch_id = new_upload_id()
+    
+    error = check_limits(db, batch_id, length)
+    if error:
+        raise HTTPException(status_code=413, detail=error)
+    
+    session = UploadSession(
+        id=new_upload_id(),
+        batch_id=batch_id,
+        user_id=token_data.get("id"),
+        filename=os.path.basename(filename),
+        length=length,
+        job_description=job_description
+    )
+    db.add(session)
+    # The batch's ingestion report shares its id
+    if run is None:
+        db.add(IngestionRun(id=batch_id, source="chunked", user_id=token_data.get("id")))
+    db.commit()
+    return upload_session_status(session)
+
+@app.head("/uploads/{upload_id}")
+def upload_offset(upload_id: str, token_data: dict = Depends(verify_token), db: Session = Depends(get_db)):
+    """Where to resume: Upload-Offset and Upload-Length headers"""
+    status = upload_session_status(get_upload_session(db, upload_id, token_data))
+    return Response(headers={
+        "Upload-Offset": str(status["offset"]),
+        "Upload-Length": str(status["length"]),
+        "Cache-Control": "no-store"
+    })
+
+@app.patch("/uploads/{upload_id}")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(...),
+    token_data: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Append the request body at Upload-Offset; the last chunk finalizes the upload"""
+    session = await db.get(UploadSession, upload_id)
+    if not session or session.user_id != token_data.get("id"):
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if session.status != "uploading":
+        raise HTTPException(status_code=409, detail=f"Upload is already {session.status}")
+    
     try:
-        # Screen resume
-        result = screen_resume(resume_text, job_description)
+        offset = await append_chunk(UPLOAD_DIR, session, upload_offset, request.stream())
+    except OffsetMismatch as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(e.offset)})
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    if offset == session.length:
+        # Claim the upload before extracting, so a repeated last PATCH (a
+        # client retry, or one reaching another worker) can't finalize it twice
+        claimed = await db.execute(
+            update(UploadSession)
+            .where(UploadSession.id == session.id, UploadSession.status == "uploading")
+            .values(status="finalizing")
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if claimed.rowcount:
+            session.status = "finalizing"
+            await finalize_upload(db, session)
+        else:
+            await db.refresh(session)
+    return upload_session_status(session)
+
+@app.get("/uploads/{upload_id}")
+def get_upload(upload_id: str, token_data: dict = Depends(verify_token), db: Session = Depends(get_db)):
+    return upload_session_status(get_upload_session(db, upload_id, token_data))
+
+@app.get("/upload-batches/{batch_id}")
+def get_upload_batch(batch_id: str, token_data: dict = Depends(verify_token), db: Session = Depends(get_db)):
+    """Every file of a resumable upload batch with its status"""
+    sessions = db.query(UploadSession).filter(
+        UploadSession.batch_id == batch_id, UploadSession.user_id == token_data.get("id")
+    ).order_by(UploadSession.created_at).all()
+    if not sessions:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    files = [upload_session_status(session) for session in sessions]
+    counts = {}
+    for f in files:
+        counts[f["status"]] = counts.get(f["status"], 0) + 1
+    return {
+        "batch_id": batch_id,
+        "total": len(files),
+        "bytes": sum(f["length"] for f in files),
+        "received_bytes": sum(f["offset"] for f in files),
+        "counts": counts,
+        "files": files
+    }
+
+def schedule_screening(candidate_id: int, resume_text: str, job_description: str,
+                       user_id: Optional[int], priority: str):
+    """Queue a candidate for screening (interactive, bulk or rescreen priority)"""
+    get_screening_scheduler().submit(
+        process_resume_background, candidate_id, resume_text, job_description,
+        user=user_id, priority=priority
+    )
+
+def process_resume_background(candidate_id: int, resume_text: str, job_description: str):
+    """Process resume in background (runs on a screening scheduler worker)"""
+    db = SessionLocal()
+    try:
+        candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+        if not candidate:
+            return
+        
+        record, last_run_id = start_screening(db, candidate_id)
+        started = time.perf_counter()
+        
+        # Screen resume on the cheapest tier that is confident, failing over
+        # between backends
+        policy = policy_for_job(db, candidate.job_hash)
+        result = get_screening_router().screen(
+            resume_text, job_description, candidate.job_hash, policy, candidate.experience_years or 0,
+            candidate_id=candidate.id
+        )
         
         # Update database
-        candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
-        if candidate:
-            candidate.name = result.get("name", "Unknown")
-            candidate.email = result.get("email", "")
-            candidate.phone = result.get("phone", "")
-            candidate.skills_score = result.get("skills_score", 0)
-            candidate.experience_score = result.get("experience_score", 0)
-            candidate.education_score = result.get("education_score", 0)
-            candidate.overall_score = result.get("overall_score", 0)
-            candidate.skills = json.dumps(result.get("skills", []))
-            candidate.experience_years = result.get("experience_years", 0)
-            candidate.recommendation = result.get("recommendation", "REJECT")
-            candidate.reason = result.get("reason", "")
+        candidate.skills_score = result.get("skills_score", 0)
+        candidate.experience_score = result.get("experience_score", 0)
+        candidate.education_score = result.get("education_score", 0)
+        candidate.skills = json.dumps(result.get("skills", []))
+        candidate.reason = result.get("reason") or result.get("error", "")
+        candidate.scored_by = result.get("scored_by")
+        
+        # Overall score and recommendation follow the job's scoring profile
+        if result.get("error"):
+            candidate.overall_score = 0
+            candidate.recommendation = "ERROR"
+        else:
+            candidate.overall_score = overall_score(
+                candidate.skills_score, candidate.experience_score, candidate.education_score, policy
+            )
+            candidate.recommendation = recommendation(candidate.overall_score, policy)
+        if record is not None:
+            finish_screening(db, record, last_run_id, time.perf_counter() - started, bool(result.get("error")))
+        db.commit()
+        
+        # Skills complete the name + skills identity key
+        if not result.get("error"):
+            resolve_candidate(db, candidate, result.get("skills", []))
             db.commit()
+        
+        # Precompute similar candidates now that skills are known
+        if not result.get("error"):
+            get_similarity_graph().add(db, candidate_id, result.get("skills", []), resume_text)
     except Exception as e:
         print(f"Error processing candidate {candidate_id}: {e}")
+    finally:
+        db.close()
+
+# Columns needed by list views; full rows and relationships stay unloaded
+CANDIDATE_LIST_COLUMNS = (
+    Candidate.id, Candidate.name, Candidate.email, Candidate.phone,
+    Candidate.skills, Candidate.experience_years, Candidate.skills_score,
+    Candidate.experience_score, Candidate.education_score, Candidate.overall_score,
+    Candidate.recommendation, Candidate.reason, Candidate.filename,
+    Candidate.near_duplicate_of, Candidate.near_duplicate_score,
+    Candidate.created_at.label("uploaded_at")
+)
 
-@app.get("/candidates")
+def load_resume_texts(db: Session, candidate_ids: List[int]) -> dict:
+    """Full resume text per candidate, falling back to the stored excerpt"""
+    texts = {}
+    for start in range(0, len(candidate_ids), 500):
+        chunk = candidate_ids[start:start + 500]
+        rows = db.execute(
+            select(Candidate.id, ResumeDocument.text, Candidate.resume_text)
+            .outerjoin(ResumeDocument, ResumeDocument.sha256 == Candidate.content_hash)
+            .where(Candidate.id.in_(chunk))
+        )
+        for candidate_id, full_text, excerpt in rows:
+            texts[candidate_id] = full_text or excerpt or ""
+    return texts
+
+def list_candidates(db: Session, tag: Optional[str] = None, **filters) -> List[dict]:
+    """Candidates for list views, best overall score first (see CandidateSnapshot.query)"""
+    snapshot = get_candidate_snapshot()
+    snapshot.refresh(db)
+    return snapshot.query(tag=tag, **filters)
+
+def refresh_search_index(db: Session, candidates: Optional[List[dict]] = None):
+    """Re-index from the database (or a fresh unfiltered list) and publish the new version"""
+    if candidates is None:
+        candidates = list_candidates(db)
+    get_semantic_search().prepare_candidates(candidates, lambda ids: load_resume_texts(db, ids))
+
+@app.get("/candidates", response_model=List[CandidateSummary])
 def get_candidates(
+    request: Request,
+    response: Response,
+    tag: Optional[str] = None,
+    recommendation: Optional[str] = None,
+    min_score: Optional[float] = None,
+    skill: Optional[List[str]] = Query(None),
+    sort: str = "overall_score",
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
     token_data: dict = Depends(verify_token),
     db: Session = Depends(get_db)
 ):
-    candidates = db.query(Candidate).order_by(Candidate.overall_score.desc()).all()
-    
-    result = []
-    for c in candidates:
-        result.append({
-            "id": c.id,
-            "name": c.name,
-            "email": c.email,
-            "phone": c.phone,
-            "skills": json.loads(c.skills) if c.skills else [],
-            "experience_years": c.experience_years,
-            "skills_score": c.skills_score,
-            "experience_score": c.experience_score,
-            "education_score": c.education_score,
-            "overall_score": c.overall_score,
-            "recommendation": c.recommendation,
-            "reason": c.reason,
-            "filename": c.filename,
-            "uploaded_at": c.created_at.isoformat() if c.created_at else None,
-            "tags": []  # Add tags from database
-        })
-    
-    # Update semantic search index
-    semantic_search.prepare_candidates(result)
+    """Candidates, optionally filtered (all skills must match), sorted and paged.
+    
+    The ETag follows the candidates change sequence, so an unchanged list
+    is answered with 304 before any candidate is read.
+    """
+    etag = make_etag("candidates", app.version, current_change_seq(db.connection()),
+                     sorted(request.query_params.multi_items()))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_etag(response, etag)
+    
+    try:
+        result = list_candidates(
+            db, tag, recommendation=recommendation, min_score=min_score, skills=skill,
+            sort=sort, descending=order == "desc", limit=limit, offset=offset
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Update semantic search index (only from the full, unfiltered list)
+    if not (tag or recommendation or min_score is not None or skill or limit or offset):
+        refresh_search_index(db, result)
     
     return result
 
-@app.get("/candidates/{candidate_id}")
+@app.get("/candidate-stats")
+def candidate_stats(token_data: dict = Depends(verify_token), db: Session = Depends(get_db)):
+    """Recommendation counts, score histogram and top skills over all candidates"""
+    snapshot = get_candidate_snapshot()
+    snapshot.refresh(db)
+    return snapshot.stats()
+
+@app.get("/candidates/{candidate_id}", response_model=CandidateDetail)
 def get_candidate(
     candidate_id: int,
+    request: Request,
+    response: Response,
     token_data: dict = Depends(verify_token),
     db: Session = Depends(get_db)
 ):
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    # Versioned by the row's change sequence (the table's for rows written
+    # before change tracking)
+    version = db.query(Candidate.change_seq).filter(Candidate.id == candidate_id).first()
+    if version:
+        etag = make_etag("candidate", app.version, candidate_id,
+                         version[0] if version[0] is not None else f"t{current_change_seq(db.connection())}")
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        set_etag(response, etag)
+    
+    candidate = (
+        db.query(Candidate)
+        .options(selectinload(Candidate.tags), selectinload(Candidate.interviews))
+        .filter(Candidate.id == candidate_id)
+        .first()
+    )
     
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    # Get full resume text
-    file_path = os.path.join(UPLOAD_DIR, candidate.filename)
+    # Get full resume text, stored once per distinct file
     full_resume = ""
-    if os.path.exists(file_path):
-        full_resume = extract_text(file_path)
+    if candidate.content_hash:
+        document = db.query(ResumeDocument.text).filter(
+            ResumeDocument.sha256 == candidate.content_hash
+        ).first()
+        full_resume = document[0] if document else ""
+    else:
+        # Uploads from before content-addressed storage
+        file_path = os.path.join(UPLOAD_DIR, candidate.filename or "")
+        if os.path.isfile(file_path):
+            full_resume = extract_text(file_path)
     
-    return {
-        "id": candidate.id,
-        "name": candidate.name,
-        "email": candidate.email,
-        "phone": candidate.phone,
-        "skills": json.loads(candidate.skills) if candidate.skills else [],
-        "experience_years": candidate.experience_years,
-        "skills_score": candidate.skills_score,
-        "experience_score": candidate.experience_score,
-        "education_score": candidate.education_score,
-        "overall_score": candidate.overall_score,
-        "recommendation": candidate.recommendation,
-        "reason": candidate.reason,
-        "filename": candidate.filename,
-        "resume_text": full_resume,
-        "uploaded_at": candidate.created_at.isoformat() if candidate.created_at else None,
-        "tags": []  # Add tags from database
-    }
+    detail = CandidateDetail.model_validate(candidate)
+    detail.resume_text = full_resume or ""
+    return detail
+
+@app.get("/candidates/{candidate_id}/similar", response_model=List[SimilarCandidate])
+def get_similar_candidates(
+    candidate_id: int,
+    limit: int = Query(10, ge=1, le=SIMILARITY_K),
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
+):
+    """Most similar candidates by skills and resume text, from the precomputed graph"""
+    if not db.query(Candidate.id).filter(Candidate.id == candidate_id).first():
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    rows = db.execute(
+        select(*CANDIDATE_LIST_COLUMNS, CandidateNeighbor.score.label("similarity"))
+        .join(CandidateNeighbor, CandidateNeighbor.neighbor_id == Candidate.id)
+        .where(CandidateNeighbor.candidate_id == candidate_id)
+        .order_by(CandidateNeighbor.score.desc()).limit(limit)
+    ).mappings().all()
+    skills = decode_json_lists([r["skills"] for r in rows])
+    return [{**row, "skills": row_skills, "similarity": round(row["similarity"], 4)}
+            for row, row_skills in zip(rows, skills)]
+
+@app.get("/persons/{person_id}", response_model=PersonOut)
+def get_person(
+    person_id: int,
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
+):
+    """An applicant and all their uploaded resume versions"""
+    person = db.get(Person, person_id)
+    if not person:
+        raise HTTPException(status_code=404, detail="Person not found")
+    
+    versions = db.query(Candidate).filter(Candidate.person_id == person_id) \
+        .order_by(Candidate.created_at, Candidate.id).all()
+    return PersonOut(id=person.id, name=person.name, email=person.email, phone=person.phone,
+                     versions=[ResumeVersion.model_validate(v) for v in versions])
 
 @app.post("/semantic-search")
 def semantic_search_endpoint(
     query: str,
     search_type: str = "hybrid",
-    token_data: dict = Depends(verify_token)
+    top_k: int = Query(10, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    min_score: Optional[float] = None,
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
 ):
     """Search candidates using semantic search"""
-    if search_type == "keyword":
-        results = semantic_search.keyword_search(query)
-    elif search_type == "semantic":
-        results = semantic_search.semantic_search(query)
-    else:
-        results = semantic_search.hybrid_search(query)
+    # Another worker may have published a newer candidate set
+    semantic_search = get_semantic_search()
+    if semantic_search.is_stale():
+        refresh_search_index(db)
+    return semantic_search.search(query, search_type, top_k, offset, min_score)
+
+@app.get("/search-stats")
+def search_stats(token_data: dict = Depends(verify_token)):
+    """Index version and hit rates of the query-embedding and result caches"""
+    return get_semantic_search().cache_stats()
+
+@app.get("/screening-stats")
+def screening_stats(token_data: dict = Depends(verify_token)):
+    """Routing counts, per-backend latency and local/LLM agreement for this worker"""
+    return get_screening_router().stats()
+
+@app.post("/candidates/{candidate_id}/rescreen")
+def rescreen_candidate(
+    candidate_id: int,
+    job_description: str = Form(DEFAULT_JOB_DESCRIPTION),
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
+):
+    """Screen a candidate again, behind interactive and bulk uploads"""
+    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    resume_text = load_resume_texts(db, [candidate_id]).get(candidate_id)
+    if not resume_text:
+        raise HTTPException(status_code=400, detail="No resume text on file for this candidate")
     
-    return results
+    candidate.job_hash = text_hash(job_description)
+    candidate.recommendation = "PROCESSING"
+    candidate.reason = "Analysis in progress..."
+    db.commit()
+    
+    schedule_screening(candidate_id, resume_text, job_description, token_data.get("id"), "rescreen")
+    return {"id": candidate_id, "recommendation": "PROCESSING"}
+
+@app.get("/queue-stats")
+def queue_stats(token_data: dict = Depends(verify_token)):
+    """Screening queue depth, running jobs per user and queue-wait percentiles per priority"""
+    return get_screening_scheduler().stats()
+
+@app.get("/tags")
+def get_tags(
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
+):
+    """List all tags with the number of candidates carrying each"""
+    return list_tags(db)
 
 @app.post("/add-tags")
 def add_tags(
-    candidate_ids: List[int],
-    tag: str,
+    candidate_ids: List[int] = Body(...),
+    tag: str = Body(...),
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
+):
+    """Add a tag to many candidates"""
+    tag = normalize_tag(tag)
+    if not tag:
+        raise HTTPException(status_code=400, detail="Tag name is required")
+    
+    added = bulk_tag(db, candidate_ids, tag, token_data.get("id"))
+    return {"message": f"Added tag '{tag}' to {added} candidates", "added": added}
+
+@app.post("/remove-tags")
+def remove_tags(
+    candidate_ids: List[int] = Body(...),
+    tag: str = Body(...),
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
+):
+    """Remove a tag from many candidates"""
+    tag = normalize_tag(tag)
+    removed = bulk_untag(db, candidate_ids, tag)
+    return {"message": f"Removed tag '{tag}' from {removed} candidates", "removed": removed}
+
+@app.get("/job-profiles", response_model=List[JobProfileOut])
+def get_job_profiles(token_data: dict = Depends(verify_token), db: Session = Depends(get_db)):
+    """Scoring profiles (weights and SELECT threshold) per job"""
+    return db.query(JobProfile).order_by(JobProfile.name).all()
+
+@app.post("/job-profiles", response_model=JobProfileOut)
+def save_job_profile(
+    profile_in: JobProfileIn,
     token_data: dict = Depends(verify_token),
     db: Session = Depends(get_db)
 ):
-    """Add tags to candidates"""
-    # Implement tag storage in database
-    return {"message": f"Added tag '{tag}' to {len(candidate_ids)} candidates"}
+    """Create or update a scoring profile; call /rescore to apply it to existing candidates"""
+    error = validate_policy(ScoringPolicy(
+        profile_in.skills_weight, profile_in.experience_weight,
+        profile_in.education_weight, profile_in.select_threshold
+    ))
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    
+    job_hash = text_hash(profile_in.job_description) if profile_in.job_description else None
+    # One profile per job description (and one default); names are labels
+    if job_hash:
+        profile = db.query(JobProfile).filter(JobProfile.job_hash == job_hash).first()
+    else:
+        profile = db.query(JobProfile).filter(JobProfile.job_hash.is_(None)).first()
+    name_taken = db.query(JobProfile.id).filter(
+        JobProfile.name == profile_in.name, JobProfile.id != (profile.id if profile else None)
+    ).first()
+    if name_taken:
+        raise HTTPException(status_code=409, detail="Another job profile has this name")
+    if profile is None:
+        profile = JobProfile(created_by=token_data.get("id"))
+        db.add(profile)
+    
+    profile.name = profile_in.name
+    profile.job_hash = job_hash
+    profile.skills_weight = profile_in.skills_weight
+    profile.experience_weight = profile_in.experience_weight
+    profile.education_weight = profile_in.education_weight
+    profile.select_threshold = profile_in.select_threshold
+    try:
+        db.commit()
+    except IntegrityError:
+        # Same name or job saved concurrently
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Another job profile has this name or job description")
+    db.refresh(profile)
+    return profile
+
+@app.post("/rescore")
+def rescore_candidates(
+    profile_id: Optional[int] = None,
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db)
+):
+    """Recompute overall scores and recommendations from stored sub-scores (no LLM calls)"""
+    profile = None
+    if profile_id is not None:
+        profile = db.query(JobProfile).filter(JobProfile.id == profile_id).first()
+        if not profile:
+            raise HTTPException(status_code=404, detail="Job profile not found")
+    
+    started = time.perf_counter()
+    result = rescore(db, profile)
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+@app.get("/ingestion-runs/{run_id}")
+def get_ingestion_run(run_id: str, token_data: dict = Depends(verify_token), db: Session = Depends(get_db)):
+    """Counts and timing percentiles of an upload batch"""
+    run = db.get(IngestionRun, run_id)
+    if not run or run.user_id != token_data.get("id"):
+        raise HTTPException(status_code=404, detail="Ingestion run not found")
+    return {"run_id": run.id, "source": run.source, "created_at": run.created_at, **summarize_run(db, run_id)}
+
+@app.get("/ingestion-runs/{run_id}/report.csv")
+def download_ingestion_report(run_id: str, token_data: dict = Depends(verify_token), db: Session = Depends(get_db)):
+    """Per-file ingestion report: format, language, size, pages, extraction,
+    queue wait, screening and LLM cost, and final status"""
+    run = db.get(IngestionRun, run_id)
+    if not run or run.user_id != token_data.get("id"):
+        raise HTTPException(status_code=404, detail="Ingestion run not found")
+    
+    # The request's session may be closed before the body is streamed
+    def rows():
+        report_db = SessionLocal()
+        try:
+            yield from iter_report_csv(report_db, run_id)
+        finally:
+            report_db.close()
+    
+    return StreamingResponse(rows(), media_type="text/csv", headers={
+        "Content-Disposition": f'attachment; filename="ingestion-{run_id}.csv"'
+    })
 
 @app.post("/schedule-interview")
 def schedule_interview(
@@ -0,0 +1,87 @@
+from sqlalchemy import inspect, text
+import logging
+
+from database import Base
+from models import CandidateVector, candidate_tags
+
+logger = logging.getLogger(__name__)
+
+
+def init_db(engine):
+    """Create missing tables and upgrade existing ones"""
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+
+
+def upgrade_schema(engine):
+    """Bring databases created by older versions up to the current models.
+
+    `Base.metadata.create_all` only creates missing tables, so changes to
+    existing tables are applied here. Every step is idempotent.
+    """
+    _upgrade_candidate_tags(engine)
+    _upgrade_candidate_vectors(engine)
+    _add_missing_columns(engine)
+
+
+def _upgrade_candidate_tags(engine):
+    """Rebuild candidate_tags with its composite primary key and indexes"""
+    inspector = inspect(engine)
+    if 'candidate_tags' not in inspector.get_table_names():
+        return
+    if inspector.get_pk_constraint('candidate_tags').get('constrained_columns'):
+        return
+
+    logger.info("Upgrading candidate_tags to a composite primary key")
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE candidate_tags RENAME TO candidate_tags_old"))
+        candidate_tags.create(conn)
+        conn.execute(text(
+            "INSERT INTO candidate_tags (candidate_id, tag_id) "
+            "SELECT DISTINCT candidate_id, tag_id FROM candidate_tags_old "
+            "WHERE candidate_id IS NOT NULL AND tag_id IS NOT NULL"
+        ))
+        conn.execute(text("DROP TABLE candidate_tags_old"))
+
+
+def _upgrade_candidate_vectors(engine):
+    """Rebuild candidate_vectors with AUTOINCREMENT ids (SQLite only)"""
+    if engine.dialect.name != 'sqlite':
+        return
+    with engine.connect() as conn:
+        sql = conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'candidate_vectors'"
+        )).scalar()
+    if sql is None or 'AUTOINCREMENT' in sql.upper():
+        return
+
+    logger.info("Upgrading candidate_vectors to AUTOINCREMENT ids")
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE candidate_vectors RENAME TO candidate_vectors_old"))
+        CandidateVector.__table__.create(conn)
+        conn.execute(text(
+            "INSERT INTO candidate_vectors (id, candidate_id, vector) "
+            "SELECT id, candidate_id, vector FROM candidate_vectors_old"
+        ))
+        conn.execute(text("DROP TABLE candidate_vectors_old"))
+
+
+def _add_missing_columns(engine):
+    """Add nullable columns (and their indexes) that newer models declare"""
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {col['name'] for col in inspector.get_columns(table.name)}
+        missing = [col for col in table.columns if col.name not in present]
+        if not missing:
+            continue
+        with engine.begin() as conn:
+            for column in missing:
+                logger.info(f"Adding column {table.name}.{column.name}")
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}'))
+            for index in table.indexes:
+                if any(col.name in {c.name for c in missing} for col in index.columns):
+                    index.create(conn, checkfirst=True)
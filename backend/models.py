@@ -1,14 +1,19 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Table, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    event, insert, update, Column, Integer, BigInteger, String, Float, DateTime, Text, LargeBinary, Table, ForeignKey, Index
+)
+from sqlalchemy.orm import relationship, Session
 from sqlalchemy.sql import func
 from database import Base
 
-# Association table for candidate-tag many-to-many relationship
+# Association table for candidate-tag many-to-many relationship.
+# The composite primary key covers lookups by candidate; the reverse index
+# serves tag filters and bulk untagging.
 candidate_tags = Table(
     'candidate_tags',
     Base.metadata,
-    Column('candidate_id', Integer, ForeignKey('candidates.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('candidate_id', Integer, ForeignKey('candidates.id', ondelete='CASCADE'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_candidate_tags_tag_id_candidate_id', 'tag_id', 'candidate_id')
 )
 
 class User(Base):
@@ -42,8 +47,14 @@ class Candidate(Base):
     name = Column(String)
     email = Column(String)
     phone = Column(String, nullable=True)
+    linkedin_url = Column(String, nullable=True)
+    github_url = Column(String, nullable=True)
     resume_text = Column(Text)
     filename = Column(String)
+    content_hash = Column(String(64), index=True, nullable=True)  # sha256 of the uploaded file
+    job_hash = Column(String(64), nullable=True)  # sha256 of the job description it was screened against
+    near_duplicate_of = Column(Integer, ForeignKey('candidates.id'), nullable=True)
+    near_duplicate_score = Column(Float, nullable=True)
     
     # Scores
     skills_score = Column(Float)
@@ -56,17 +67,84 @@ class Candidate(Base):
     experience_years = Column(Float)
     recommendation = Column(String)
     reason = Column(Text)
+    scored_by = Column(String, nullable=True)  # scoring backend, e.g. "ollama:mistral:latest" or "local"
+    change_seq = Column(BigInteger, index=True, nullable=True)  # change_counters value of the last write
+    person_id = Column(Integer, ForeignKey('persons.id'), index=True, nullable=True)  # same applicant across uploads
     
     # Metadata
     uploaded_by = Column(Integer, ForeignKey('users.id'))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
-    # Relationships
+    # Relationships. Collections must be loaded explicitly (selectinload or a
+    # batched query) so list views can't silently fall into N+1 lazy loads.
     uploader = relationship("User", back_populates="candidates")
-    tags = relationship("Tag", secondary=candidate_tags, back_populates="candidates")
-    interviews = relationship("Interview", back_populates="candidate")
-    emails = relationship("Email", back_populates="candidate")
+    tags = relationship("Tag", secondary=candidate_tags, back_populates="candidates", lazy="raise_on_sql")
+    interviews = relationship("Interview", back_populates="candidate", lazy="raise_on_sql")
+    emails = relationship("Email", back_populates="candidate", lazy="raise_on_sql")
+
+class Person(Base):
+    """One applicant; each of their uploads is a Candidate row (a version)"""
+    __tablename__ = "persons"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String)
+    email = Column(String)
+    phone = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class IdentityKey(Base):
+    """Blocking key (normalized email, phone, name + skills) pointing at a person"""
+    __tablename__ = "identity_keys"
+    
+    key = Column(String, primary_key=True)  # e.g. "email:jane@example.com"
+    person_id = Column(Integer, ForeignKey('persons.id', ondelete='CASCADE'), index=True, nullable=False)
+
+class ChangeCounter(Base):
+    """Monotonic change sequence per table, for caches and incremental reads.
+
+    It is bumped inside the writing transaction, which locks the row until
+    commit, so readers see sequence numbers become visible in order.
+    """
+    __tablename__ = "change_counters"
+    
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+def next_change_seq(connection, name: str = "candidates") -> int:
+    """Bump and return a change sequence within the caller's transaction"""
+    table = ChangeCounter.__table__
+    value = connection.execute(
+        update(table).where(table.c.name == name).values(value=table.c.value + 1).returning(table.c.value)
+    ).scalar()
+    if value is None:
+        connection.execute(insert(table).values(name=name, value=1))
+        value = 1
+    return value
+
+def current_change_seq(connection, name: str = "candidates") -> int:
+    table = ChangeCounter.__table__
+    return connection.execute(table.select().with_only_columns(table.c.value).where(table.c.name == name)).scalar() or 0
+
+@event.listens_for(Session, "before_flush")
+def _stamp_candidate_changes(session, flush_context, instances):
+    # Statement-level writes (bulk UPDATE / INSERT ... SELECT) bypass this
+    # hook and stamp change_seq themselves
+    changed = [obj for obj in session.new if isinstance(obj, Candidate)]
+    changed += [obj for obj in session.dirty if isinstance(obj, Candidate) and session.is_modified(obj)]
+    deleted = any(isinstance(obj, Candidate) for obj in session.deleted)
+    # Interviews are part of the candidate detail, so they version it too
+    interviewed = {obj.candidate_id for obj in (*session.new, *session.dirty, *session.deleted)
+                   if isinstance(obj, Interview) and obj.candidate_id}
+    if changed or deleted or interviewed:
+        seq = next_change_seq(session.connection())
+        for candidate in changed:
+            candidate.change_seq = seq
+        if interviewed:
+            session.connection().execute(
+                update(Candidate.__table__).where(Candidate.__table__.c.id.in_(interviewed)).values(change_seq=seq)
+            )
 
 class Interview(Base):
     __tablename__ = "interviews"
@@ -98,4 +176,154 @@ class Email(Base):
     sent_by = Column(Integer, ForeignKey('users.id'))
     
     # Relationships
-    candidate = relationship("Candidate", back_populates="emails")
\ No newline at end of file
+    candidate = relationship("Candidate", back_populates="emails")
+
+class ResumeDocument(Base):
+    """One stored file per distinct content, shared by every upload of it"""
+    __tablename__ = "resume_documents"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), unique=True, index=True, nullable=False)
+    size_bytes = Column(Integer)
+    extension = Column(String)
+    storage_path = Column(String)
+    text = Column(Text)  # full extracted text
+    text_sha256 = Column(String(64), index=True, nullable=True)  # same text from a differently encoded file
+    ocr_pages = Column(Integer, default=0)  # pages that needed OCR
+    ocr_seconds = Column(Float, default=0)  # OCR worker time for those pages
+    minhash = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class DocumentBand(Base):
+    """MinHash LSH band keys for near-duplicate lookups"""
+    __tablename__ = "resume_document_bands"
+    
+    band_key = Column(BigInteger, primary_key=True)
+    document_id = Column(Integer, ForeignKey('resume_documents.id', ondelete='CASCADE'), primary_key=True)
+
+class JobProfile(Base):
+    """Scoring policy for one job: sub-score weights and the SELECT threshold.
+
+    Applies to candidates screened against the job description with the
+    same hash; the profile without a job_hash is the default for the rest.
+    """
+    __tablename__ = "job_profiles"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True)
+    job_hash = Column(String(64), unique=True, nullable=True)
+    skills_weight = Column(Float, default=0.4)
+    experience_weight = Column(Float, default=0.3)
+    education_weight = Column(Float, default=0.3)
+    select_threshold = Column(Float, default=70)
+    created_by = Column(Integer, ForeignKey('users.id'))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class UploadSession(Base):
+    """Resumable upload of one file, optionally part of a batch.
+
+    The bytes received so far live in a partial file under the upload
+    directory; its size is the session's offset.
+    """
+    __tablename__ = "upload_sessions"
+    
+    id = Column(String(32), primary_key=True)  # random hex token
+    batch_id = Column(String(32), index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
+    filename = Column(String)
+    length = Column(BigInteger, nullable=False)  # declared size in bytes
+    job_description = Column(Text)
+    status = Column(String(20), default="uploading")  # uploading, finalizing, queued, duplicate, failed
+    candidate_id = Column(Integer, ForeignKey('candidates.id', ondelete='SET NULL'), nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+class IngestionRun(Base):
+    """One batch of uploaded files (bulk upload, archive or resumable batch)"""
+    __tablename__ = "ingestion_runs"
+
+    id = Column(String(32), primary_key=True)  # random hex token; the batch_id of resumable batches
+    source = Column(String(20))  # bulk, archive, chunked
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class IngestionFileRecord(Base):
+    """What ingesting and screening one file of a run took"""
+    __tablename__ = "ingestion_file_records"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(String(32), ForeignKey('ingestion_runs.id', ondelete='CASCADE'), index=True, nullable=False)
+    candidate_id = Column(Integer, ForeignKey('candidates.id', ondelete='SET NULL'), index=True, nullable=True)
+    filename = Column(String)
+    format = Column(String(10))  # file extension without the dot
+    language = Column(String(8), nullable=True)  # guessed from stopwords
+    size_bytes = Column(BigInteger)
+    pages = Column(Integer, nullable=True)  # PDFs only
+    ocr_pages = Column(Integer, default=0)
+    extraction_ms = Column(Float, default=0)  # 0 when the content was already on file
+    # queued -> screened / error; or duplicate / failed straight away
+    status = Column(String(20))
+    error = Column(Text, nullable=True)
+    queued_at = Column(DateTime, nullable=True)
+    queue_wait_ms = Column(Float, nullable=True)
+    screening_ms = Column(Float, nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)  # summed over the LLM calls of the screening
+    llm_ms = Column(Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class CandidateVector(Base):
+    """Hashed skills-and-text vector per candidate for the similarity graph.
+
+    A changed vector is written as a new row (the old one is deleted), so
+    workers pick up changes by loading rows with a larger id. AUTOINCREMENT
+    keeps SQLite from handing a deleted largest id straight back.
+    """
+    __tablename__ = "candidate_vectors"
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True)
+    candidate_id = Column(Integer, ForeignKey('candidates.id', ondelete='CASCADE'), unique=True, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32, L2-normalised
+
+class CandidateNeighbor(Base):
+    """Edge of the k-nearest-neighbour graph between candidates"""
+    __tablename__ = "candidate_neighbors"
+    
+    candidate_id = Column(Integer, ForeignKey('candidates.id', ondelete='CASCADE'), primary_key=True)
+    neighbor_id = Column(Integer, ForeignKey('candidates.id', ondelete='CASCADE'), primary_key=True)
+    score = Column(Float, nullable=False)  # cosine similarity
+
+class ScreeningRun(Base):
+    """One LLM screening call: what was asked, what came back and what it cost.
+
+    Append-only; prompt and raw output are stored zlib-compressed so runs
+    can be re-parsed or re-scored later without calling the model again.
+    """
+    __tablename__ = "screening_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    candidate_id = Column(Integer, ForeignKey('candidates.id'), index=True, nullable=True)
+    model = Column(String)
+    prompt_version = Column(String(16))  # hash of the prompt template
+    prompt_hash = Column(String(64), index=True)  # sha256 of the full prompt
+    options = Column(Text)  # JSON
+    prompt = Column(LargeBinary)  # zlib
+    raw_output = Column(LargeBinary, nullable=True)  # zlib
+    error = Column(Text, nullable=True)  # transport or parse error
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    
+    # Timings in milliseconds: as reported by Ollama, plus wall clock
+    total_ms = Column(Float, nullable=True)
+    load_ms = Column(Float, nullable=True)
+    prompt_eval_ms = Column(Float, nullable=True)
+    eval_ms = Column(Float, nullable=True)
+    wall_ms = Column(Float)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+@event.listens_for(ScreeningRun, "before_update")
+@event.listens_for(ScreeningRun, "before_delete")
+def _screening_runs_are_append_only(mapper, connection, target):
+    raise ValueError("screening_runs is append-only")
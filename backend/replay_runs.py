@@ -0,0 +1,86 @@
+"""Re-parse and re-score logged screening runs without calling the model.
+
+Streams the screening_runs log, decompresses each raw output, runs it
+through the current parser and scores it with the current job profile of
+the candidate's job. Writes one JSON line per run and a summary of what
+would change:
+
+    python replay_runs.py --since-id 1000 --output replay.jsonl
+    python replay_runs.py --candidate 42 --show-prompt
+"""
+import argparse
+import sys
+import time
+
+import orjson
+
+from database import SessionLocal
+from models import Candidate
+from screener import parse_response
+from services.run_log import decompress, iter_runs
+from services.scoring import overall_score, policy_for_job, recommendation
+
+
+def replay(args):
+    db = SessionLocal()
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    policies, jobs = {}, {}
+    summary = {"runs": 0, "parsed": 0, "parse_failures": 0, "transport_errors": 0,
+               "recommendation_changed": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    started = time.perf_counter()
+    try:
+        for run in iter_runs(db, args.since_id, args.model, args.candidate):
+            summary["runs"] += 1
+            summary["prompt_tokens"] += run.prompt_tokens or 0
+            summary["completion_tokens"] += run.completion_tokens or 0
+            raw = decompress(run.raw_output)
+            record = {"run_id": run.id, "candidate_id": run.candidate_id, "model": run.model,
+                      "prompt_version": run.prompt_version, "logged_error": run.error}
+            if args.show_prompt:
+                record["prompt"] = decompress(run.prompt)
+
+            if raw is None:
+                summary["transport_errors"] += 1
+                record["status"] = "no_output"
+            else:
+                result = parse_response(raw)
+                if result.get("error"):
+                    summary["parse_failures"] += 1
+                    record.update(status="parse_failed", raw_output=raw)
+                else:
+                    summary["parsed"] += 1
+                    if run.candidate_id not in jobs:
+                        row = db.query(Candidate.job_hash, Candidate.recommendation).filter(
+                            Candidate.id == run.candidate_id).first()
+                        jobs[run.candidate_id] = tuple(row) if row else (None, None)
+                    job_hash, stored = jobs[run.candidate_id]
+                    if job_hash not in policies:
+                        policies[job_hash] = policy_for_job(db, job_hash)
+                    policy = policies[job_hash]
+                    score = overall_score(result.get("skills_score", 0), result.get("experience_score", 0),
+                                          result.get("education_score", 0), policy)
+                    verdict = recommendation(score, policy)
+                    if stored and verdict != stored:
+                        summary["recommendation_changed"] += 1
+                    record.update(status="parsed", result=result, overall_score=score,
+                                  recommendation=verdict, stored_recommendation=stored)
+            out.write(orjson.dumps(record) + b"\n")
+    finally:
+        if args.output:
+            out.close()
+        db.close()
+
+    elapsed = time.perf_counter() - started
+    summary["seconds"] = round(elapsed, 3)
+    summary["runs_per_second"] = round(summary["runs"] / elapsed) if elapsed else None
+    print(orjson.dumps(summary).decode(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay logged screening runs offline")
+    parser.add_argument("--since-id", type=int, default=0, help="only runs with a larger id")
+    parser.add_argument("--model", help="only runs of this model")
+    parser.add_argument("--candidate", type=int, help="only runs for this candidate")
+    parser.add_argument("--show-prompt", action="store_true", help="include the decompressed prompt")
+    parser.add_argument("--output", help="JSON lines file (default: stdout)")
+    replay(parser.parse_args())
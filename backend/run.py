@@ -1,4 +1,32 @@
+import argparse
+import os
 import uvicorn
 
+
+def default_workers() -> int:
+    """WEB_CONCURRENCY if set, otherwise one worker per CPU core"""
+    return int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+
+def prepare_database():
+    """Create and upgrade the schema once, before any worker starts"""
+    from database import engine
+    from migrations import init_db
+    init_db(engine)
+    os.environ["SKIP_SCHEMA_SETUP"] = "1"
+
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the AI Resume Screener API")
+    parser.add_argument("--prod", action="store_true", help="multi-worker mode without auto-reload")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes in --prod mode")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    if args.prod:
+        prepare_database()
+        uvicorn.run("main:app", host=args.host, port=args.port,
+                    workers=args.workers or default_workers(), proxy_headers=True)
+    else:
+        uvicorn.run("main:app", host=args.host, port=args.port, reload=True)
@@ -0,0 +1,144 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, AliasChoices, field_validator
+import orjson
+
+
+class CandidateSummary(BaseModel):
+    """Candidate as shown in list views"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    skills: List[str] = []
+    experience_years: Optional[float] = None
+    skills_score: Optional[float] = None
+    experience_score: Optional[float] = None
+    education_score: Optional[float] = None
+    overall_score: Optional[float] = None
+    recommendation: Optional[str] = None
+    reason: Optional[str] = None
+    filename: Optional[str] = None
+    near_duplicate_of: Optional[int] = None
+    near_duplicate_score: Optional[float] = None
+    uploaded_at: Optional[datetime] = Field(
+        None, validation_alias=AliasChoices("uploaded_at", "created_at")
+    )
+    tags: List[str] = []
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def tag_names(cls, value):
+        # Accept Tag rows from a selectinload as well as plain names
+        return [getattr(tag, "name", tag) for tag in value or []]
+
+    @field_validator("skills", mode="before")
+    @classmethod
+    def decode_skills(cls, value):
+        # Candidate.skills is stored as a JSON string
+        if value is None or value == "":
+            return []
+        if isinstance(value, (str, bytes)):
+            return orjson.loads(value)
+        return value
+
+
+class SimilarCandidate(CandidateSummary):
+    """Candidate in a "similar candidates" list"""
+    similarity: float
+
+
+def decode_json_lists(values: List[Optional[str]]) -> List[list]:
+    """Decode a column of JSON list strings with a single parser call"""
+    chunks = [value if value else "[]" for value in values]
+    try:
+        decoded = orjson.loads("[" + ",".join(chunks) + "]")
+        if len(decoded) == len(chunks):
+            return decoded
+    except orjson.JSONDecodeError:
+        pass
+
+    # Fall back to row by row so one bad value doesn't sink the list
+    decoded = []
+    for chunk in chunks:
+        try:
+            decoded.append(orjson.loads(chunk))
+        except orjson.JSONDecodeError:
+            decoded.append([])
+    return decoded
+
+
+class InterviewOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    scheduled_date: Optional[datetime] = None
+    duration: Optional[int] = None
+    type: Optional[str] = None
+    status: Optional[str] = None
+    meeting_link: Optional[str] = None
+
+
+class CandidateDetail(CandidateSummary):
+    """Candidate as shown on the detail page"""
+    linkedin_url: Optional[str] = None
+    github_url: Optional[str] = None
+    scored_by: Optional[str] = None
+    person_id: Optional[int] = None
+    resume_text: str = ""
+    interviews: List[InterviewOut] = []
+
+    @field_validator("resume_text", mode="before")
+    @classmethod
+    def empty_text(cls, value):
+        return value or ""
+
+
+class ResumeVersion(BaseModel):
+    """One upload of a person's resume"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    filename: Optional[str] = None
+    content_hash: Optional[str] = None
+    job_hash: Optional[str] = None
+    uploaded_at: Optional[datetime] = Field(
+        None, validation_alias=AliasChoices("uploaded_at", "created_at")
+    )
+    overall_score: Optional[float] = None
+    recommendation: Optional[str] = None
+
+
+class PersonOut(BaseModel):
+    """An applicant with every version of their resume, oldest first"""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    versions: List[ResumeVersion] = []
+
+
+class JobProfileIn(BaseModel):
+    """Scoring profile; without a job description it is the default profile"""
+    name: str
+    job_description: Optional[str] = None
+    skills_weight: float = 0.4
+    experience_weight: float = 0.3
+    education_weight: float = 0.3
+    select_threshold: float = 70
+
+
+class JobProfileOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    job_hash: Optional[str] = None
+    skills_weight: float
+    experience_weight: float
+    education_weight: float
+    select_threshold: float
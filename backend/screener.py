@@ -1,7 +1,16 @@
-import ollama
+import hashlib
 import json
+import math
+import os
 import re
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
+
+from services.resume_preprocess import DEFAULT_TOKEN_BUDGET, build_resume_excerpt
+from services.run_log import record_run
+
+# Ollama model used for screening unless a backend asks for another
+SCREENING_MODEL = os.getenv("SCREENING_MODEL", "mistral:latest")
 
 def clean_json_response(response: str) -> str:
     """Extract JSON from model response"""
@@ -11,8 +20,10 @@ def clean_json_response(response: str) -> str:
         return json_match.group()
     return response
 
-def build_prompt(resume_text: str, job_description: str) -> str:
+def build_prompt(resume_text: str, job_description: str, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
     """Build prompt for Mistral model"""
+    # Cleaned resume, highest-value sections first, within the token budget
+    resume_text = build_resume_excerpt(resume_text, token_budget)
     
     prompt = f"""You are an expert AI HR recruiter. Analyze this candidate resume against the job description.
 
@@ -22,41 +33,94 @@ JOB DESCRIPTION:
 RESUME:
 {resume_text}
 
+Contact details and years of experience are extracted separately; only judge the fit.
 Analyze and return ONLY a valid JSON object with this exact structure:
 {{
-    "name": "Full name of candidate",
-    "email": "Email address",
-    "phone": "Phone number if found",
     "skills": ["skill1", "skill2", "skill3"],
-    "experience_years": 0.0,
     "skills_score": 0,
     "experience_score": 0,
     "education_score": 0,
-    "overall_score": 0,
-    "recommendation": "SELECT or REJECT",
-    "reason": "Brief explanation for recommendation"
+    "reason": "Brief explanation of the scores"
 }}
 
 Scoring guidelines:
 - Skills score (0-100): Match between resume skills and job requirements
 - Experience score (0-100): Relevance and years of experience
 - Education score (0-100): Education level and relevance
-- Overall score (0-100): Weighted average (skills 40%, experience 30%, education 30%)
-- Recommend SELECT if overall score >= 70
 
 Return ONLY the JSON object, no other text."""
     
     return prompt
 
-def screen_resume(resume_text: str, job_description: str) -> Dict[str, Any]:
+# Sampling options sent with every screening call
+SCREENING_OPTIONS = {
+    "temperature": 0.1,  # Lower temperature for consistent output
+    "top_p": 0.9
+}
+
+# Identifies the prompt template in the screening-run log
+PROMPT_VERSION = hashlib.sha256(build_prompt("", "").encode("utf-8")).hexdigest()[:12]
+
+SCORE_FIELDS = ("skills_score", "experience_score", "education_score")
+
+def parse_response(result_text: str) -> Dict[str, Any]:
+    """Parse the model's reply into a screening result"""
+    cleaned_text = clean_json_response(result_text)
+    
+    try:
+        result = json.loads(cleaned_text)
+    except json.JSONDecodeError:
+        result = None
+    if not isinstance(result, dict):
+        # If JSON parsing fails, return error with raw response (the full
+        # text is kept in the screening-run log)
+        return {
+            "error": "Failed to parse model response",
+            "raw_response": result_text[:500]
+        }
+    
+    # Ensure all required fields exist
+    # The overall score and recommendation are computed server-side from
+    # these with the job's scoring profile
+    required_fields = ["skills", "skills_score", "experience_score", "education_score", "reason"]
+    
+    for field in required_fields:
+        if field not in result:
+            if field in ["skills"]:
+                result[field] = []
+            elif field in SCORE_FIELDS:
+                result[field] = 0
+            else:
+                result[field] = ""
+    
+    # Models sometimes quote numbers ("85"); anything that is not a number
+    # is a parse error, and scores are kept within 0-100
+    for field in SCORE_FIELDS:
+        try:
+            score = float(result[field])
+        except (TypeError, ValueError):
+            score = math.nan
+        if not math.isfinite(score):
+            return {
+                "error": f"Invalid {field} in model response",
+                "raw_response": result_text[:500]
+            }
+        result[field] = min(max(score, 0.0), 100.0)
+    
+    return result
+
+def screen_resume(resume_text: str, job_description: str, model: str = SCREENING_MODEL,
+                  candidate_id: Optional[int] = None) -> Dict[str, Any]:
     """Screen resume using Mistral model"""
+    import ollama  # imported on first use to keep startup fast
     
+    prompt = build_prompt(resume_text, job_description)
+    response, result_text = None, None
+    started = time.perf_counter()
     try:
-        prompt = build_prompt(resume_text, job_description)
-        
         # Call Ollama
         response = ollama.chat(
-            model="mistral:latest",
+            model=model,
             messages=[
                 {
                     "role": "system", 
@@ -67,54 +131,26 @@ def screen_resume(resume_text: str, job_description: str) -> Dict[str, Any]:
                     "content": prompt
                 }
             ],
-            options={
-                "temperature": 0.1,  # Lower temperature for consistent output
-                "top_p": 0.9
-            }
+            options=SCREENING_OPTIONS
         )
         
         # Extract and parse JSON
         result_text = response['message']['content']
-        cleaned_text = clean_json_response(result_text)
-        
-        try:
-            result = json.loads(cleaned_text)
-        except json.JSONDecodeError:
-            # If JSON parsing fails, return error with raw response
-            return {
-                "error": "Failed to parse model response",
-                "raw_response": result_text[:500]
-            }
-        
-        # Ensure all required fields exist
-        required_fields = ["name", "email", "skills", "experience_years", 
-                          "skills_score", "experience_score", "education_score", 
-                          "overall_score", "recommendation", "reason"]
-        
-        for field in required_fields:
-            if field not in result:
-                if field in ["skills"]:
-                    result[field] = []
-                elif field in ["experience_years"]:
-                    result[field] = 0.0
-                elif field in ["skills_score", "experience_score", "education_score", "overall_score"]:
-                    result[field] = 0
-                else:
-                    result[field] = ""
-        
-        return result
+        result = parse_response(result_text)
         
     except Exception as e:
-        return {
+        result = {
             "error": str(e),
-            "name": "",
-            "email": "",
             "skills": [],
-            "experience_years": 0,
             "skills_score": 0,
             "experience_score": 0,
             "education_score": 0,
             "overall_score": 0,
             "recommendation": "ERROR",
             "reason": f"Processing error: {str(e)}"
-        }
\ No newline at end of file
+        }
+    
+    # Keep provenance and the full raw output for replay
+    record_run(model, PROMPT_VERSION, prompt, SCREENING_OPTIONS, response, result_text,
+               result.get("error"), (time.perf_counter() - started) * 1000, candidate_id)
+    return result
@@ -1,4 +1,11 @@
+# SemanticSearch pulls in numpy and ollama, so it is only imported when
+# first accessed; importing a light submodule (e.g. services.tag_service)
+# stays cheap.
+__all__ = ['SemanticSearch']
 
-from .semantic_search import SemanticSearch
 
-__all__ = ['SemanticSearch']
\ No newline at end of file
+def __getattr__(name):
+    if name == 'SemanticSearch':
+        from .semantic_search import SemanticSearch
+        return SemanticSearch
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,181 @@
+import asyncio
+import os
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, BinaryIO, Callable, Iterator, Optional, Tuple
+
+from extract import extract_text_from_bytes, SUPPORTED_EXTENSIONS
+from .ocr import OcrReport
+
+MAX_MEMBER_BYTES = int(os.getenv("ARCHIVE_MAX_MEMBER_BYTES", str(10 * 1024 * 1024)))
+MAX_MEMBERS = int(os.getenv("ARCHIVE_MAX_MEMBERS", "20000"))
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 2)))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+@dataclass
+class ArchiveMember:
+    name: str
+    data: Optional[bytes] = None
+    text: Optional[str] = None
+    error: Optional[str] = None
+    ocr: Optional[OcrReport] = None
+    extraction_seconds: float = 0.0  # text layer plus OCR
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all archive ingests, created on first use"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=EXTRACTION_WORKERS)
+    return _pool
+
+
+def _extract_member(data: bytes, name: str) -> Tuple[Optional[str], OcrReport, float]:
+    """Text layer only (runs on the extraction pool); the report's image_pages
+    flags members that need OCR"""
+    started = time.perf_counter()
+    report = OcrReport()
+    text = extract_text_from_bytes(data, name, ocr=False, ocr_report=report)
+    return text, report, time.perf_counter() - started
+
+
+def _ocr_member(member: ArchiveMember) -> Optional[str]:
+    started = time.perf_counter()
+    member.ocr = OcrReport()
+    text = extract_text_from_bytes(member.data, member.name, ocr_report=member.ocr)
+    member.extraction_seconds += time.perf_counter() - started
+    return text
+
+
+def is_archive(filename: str) -> bool:
+    name = (filename or "").lower()
+    return name.endswith((".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz"))
+
+
+def _wanted(name: str) -> bool:
+    base = os.path.basename(name)
+    if not base or base.startswith(".") or "__MACOSX" in name:
+        return False
+    return os.path.splitext(base)[1].lower() in SUPPORTED_EXTENSIONS
+
+
+def _read_capped(stream: BinaryIO) -> Optional[bytes]:
+    """Read a member, giving up past MAX_MEMBER_BYTES (zip bombs, huge scans)"""
+    data = stream.read(MAX_MEMBER_BYTES + 1)
+    return None if len(data) > MAX_MEMBER_BYTES else data
+
+
+def iter_archive_members(fileobj: BinaryIO, filename: str) -> Iterator[ArchiveMember]:
+    """Yield supported resume files from a ZIP or TAR archive one at a time.
+
+    Members are decompressed straight from the archive stream into memory;
+    nothing is written to disk and only one member is read at a time. TAR
+    archives are read in streaming mode, so they need not be seekable.
+    A ZIP member that fails to decompress is yielded with an error; an
+    archive that cannot be read any further raises.
+    """
+    count = 0
+    if filename.lower().endswith(".zip"):
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not _wanted(info.filename):
+                    continue
+                count += 1
+                if count > MAX_MEMBERS:
+                    yield ArchiveMember(info.filename, error=f"Archive exceeds {MAX_MEMBERS} files")
+                    return
+                if info.file_size > MAX_MEMBER_BYTES:
+                    yield ArchiveMember(info.filename, error="File too large")
+                    continue
+                try:
+                    with archive.open(info) as stream:
+                        data = _read_capped(stream)
+                except Exception as e:  # bad CRC, corrupt deflate data, encrypted member...
+                    error = f"Could not read file: {e}"
+                else:
+                    error = None if data is not None else "File too large"
+                yield ArchiveMember(info.filename, data=data if error is None else None, error=error)
+    else:
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for info in archive:
+                if not info.isfile() or not _wanted(info.name):
+                    continue
+                count += 1
+                if count > MAX_MEMBERS:
+                    yield ArchiveMember(info.name, error=f"Archive exceeds {MAX_MEMBERS} files")
+                    return
+                if info.size > MAX_MEMBER_BYTES:
+                    yield ArchiveMember(info.name, error="File too large")
+                    continue
+                stream = archive.extractfile(info)
+                data = _read_capped(stream) if stream else None
+                yield ArchiveMember(info.name, data=data, error=None if data is not None else "Could not read file")
+
+
+async def _always(member: ArchiveMember) -> bool:
+    return True
+
+
+async def extract_archive(fileobj: BinaryIO, filename: str,
+                          needs_extraction: Callable[[ArchiveMember], Awaitable[bool]] = _always,
+                          max_in_flight: Optional[int] = None) -> AsyncIterator[ArchiveMember]:
+    """Extract text from every resume in an archive on the process pool.
+
+    At most `max_in_flight` members (default: twice the worker count) are
+    held in memory at once, so memory stays bounded however many files the
+    archive contains. Members are yielded as soon as their extraction
+    finishes, not in archive order. Members for which the coroutine
+    `needs_extraction` returns False (e.g. content already on file) skip the pool. Scanned
+    PDFs then go through the separate OCR pool, so they never occupy
+    extraction workers. Members are decompressed on a worker thread, never
+    on the event loop. If the archive turns out to be unreadable, members
+    already in flight are still yielded before the error is raised.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_extraction_pool()
+    limit = max_in_flight or EXTRACTION_WORKERS * 2
+    pending = {}
+
+    async def wait_for_some():
+        done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+        for future in done:
+            member = pending.pop(future)
+            try:
+                member.text, member.ocr, member.extraction_seconds = future.result()
+                if member.ocr.image_pages:
+                    member.text = await loop.run_in_executor(None, _ocr_member, member)
+                if not member.text:
+                    member.error = "Could not extract text"
+            except Exception as e:
+                member.error = str(e)
+            yield member
+
+    members = iter_archive_members(fileobj, filename)
+    archive_error = None
+    try:
+        while True:
+            member = await loop.run_in_executor(None, next, members, None)
+            if member is None:
+                break
+            if member.error or not await needs_extraction(member):
+                yield member
+                continue
+
+            future = loop.run_in_executor(pool, _extract_member, member.data, member.name)
+            pending[future] = member
+            if len(pending) >= limit:
+                async for finished in wait_for_some():
+                    yield finished
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        archive_error = e
+
+    while pending:
+        async for finished in wait_for_some():
+            yield finished
+    if archive_error is not None:
+        raise archive_error
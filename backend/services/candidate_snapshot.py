@@ -0,0 +1,275 @@
+import threading
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import Candidate, current_change_seq
+from schemas import decode_json_lists
+from .tag_service import load_tags, normalize_tag
+
+NUMERIC_COLUMNS = ("skills_score", "experience_score", "education_score", "overall_score",
+                   "experience_years", "near_duplicate_score")
+SORTABLE = NUMERIC_COLUMNS + ("id",)
+
+# Columns read from the database; numeric ones go to arrays, the rest to records
+SNAPSHOT_COLUMNS = (
+    Candidate.id, Candidate.name, Candidate.email, Candidate.phone, Candidate.skills,
+    Candidate.reason, Candidate.filename, Candidate.near_duplicate_of, Candidate.recommendation,
+    Candidate.created_at, Candidate.skills_score, Candidate.experience_score,
+    Candidate.education_score, Candidate.overall_score, Candidate.experience_years,
+    Candidate.near_duplicate_score,
+)
+
+
+class CandidateRecord:
+    """Text fields of one candidate; numbers live in the snapshot's arrays"""
+    __slots__ = ("id", "name", "email", "phone", "skills", "tags", "reason", "filename",
+                 "near_duplicate_of", "uploaded_at")
+
+    def __init__(self, id: int, name: Optional[str], email: Optional[str], phone: Optional[str],
+                 skills: List[str], tags: List[str], reason: Optional[str], filename: Optional[str],
+                 near_duplicate_of: Optional[int], uploaded_at: Optional[datetime]):
+        self.id = id
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.skills = skills
+        self.tags = tags
+        self.reason = reason
+        self.filename = filename
+        self.near_duplicate_of = near_duplicate_of
+        self.uploaded_at = uploaded_at
+
+
+@lru_cache(maxsize=4096)
+def _skill_key(value: str) -> str:
+    return value.strip().lower()
+
+
+class CandidateSnapshot:
+    """Read-optimised, in-process copy of the candidates table.
+
+    Scores and experience are float64 arrays (NaN for missing), the
+    recommendation is a small integer code, text fields sit in slotted
+    records, and every skill and tag has a boolean bitmap over the rows.
+    Filters, sorts and top-N are then NumPy operations over all candidates.
+
+    `refresh` reads the candidates change counter and loads only rows
+    stamped with a newer change_seq, so keeping it current costs one small
+    query when nothing changed. A row count that stops matching (a deleted
+    candidate) triggers a full reload.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._lock = threading.RLock()
+        self._reset(capacity)
+
+    def _reset(self, capacity: int):
+        self.seq = -1
+        self.size = 0
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.columns = {name: np.full(capacity, np.nan) for name in NUMERIC_COLUMNS}
+        self.recommendation_codes = np.zeros(capacity, dtype=np.uint8)
+        self.recommendations: List[Optional[str]] = [None]  # code -> value; 0 is "none"
+        self.records: List[CandidateRecord] = []
+        self.skill_bits: Dict[str, np.ndarray] = {}
+        self.tag_bits: Dict[str, np.ndarray] = {}
+        self._row_of: Dict[int, int] = {}
+
+    def _grow(self, needed: int):
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+
+        def grown(array, fill):
+            result = np.full(capacity, fill, dtype=array.dtype)
+            result[:len(array)] = array
+            return result
+
+        self.ids = grown(self.ids, 0)
+        self.columns = {name: grown(values, np.nan) for name, values in self.columns.items()}
+        self.recommendation_codes = grown(self.recommendation_codes, 0)
+        for bitmaps in (self.skill_bits, self.tag_bits):
+            for key, bits in bitmaps.items():
+                bitmaps[key] = grown(bits, False)
+
+    def _code(self, recommendation: Optional[str]) -> int:
+        if recommendation not in self.recommendations:
+            self.recommendations.append(recommendation)
+        return self.recommendations.index(recommendation)
+
+    def _bitmap(self, bitmaps: Dict[str, np.ndarray], key: str) -> np.ndarray:
+        bits = bitmaps.get(key)
+        if bits is None:
+            bits = bitmaps[key] = np.zeros(len(self.ids), dtype=bool)
+        return bits
+
+    def _apply(self, rows, tags_by_candidate: Dict[int, List[str]]):
+        self._grow(self.size + len(rows))
+        columns = dict(zip([column.key for column in SNAPSHOT_COLUMNS], zip(*rows)))
+        skills = decode_json_lists(columns["skills"])
+        indices = []
+        # (bitmaps, key) -> rows to clear / set, applied in bulk below
+        cleared, added = defaultdict(list), defaultdict(list)
+        for position, candidate_id in enumerate(columns["id"]):
+            index = self._row_of.get(candidate_id)
+            if index is None:
+                index = self._row_of[candidate_id] = self.size
+                self.size += 1
+                self.records.append(None)
+            else:
+                old = self.records[index]
+                for skill in old.skills:
+                    cleared[("skill", _skill_key(skill))].append(index)
+                for tag in old.tags:
+                    cleared[("tag", normalize_tag(tag))].append(index)
+            indices.append(index)
+
+            row_skills = skills[position]
+            tags = tags_by_candidate.get(candidate_id, [])
+            self.records[index] = CandidateRecord(
+                candidate_id, columns["name"][position], columns["email"][position], columns["phone"][position],
+                row_skills, tags, columns["reason"][position], columns["filename"][position],
+                columns["near_duplicate_of"][position], columns["created_at"][position]
+            )
+            for skill in row_skills:
+                added[("skill", _skill_key(skill))].append(index)
+            for tag in tags:
+                added[("tag", normalize_tag(tag))].append(index)
+
+        indices = np.asarray(indices, dtype=np.int64)
+        self.ids[indices] = columns["id"]
+        for name in NUMERIC_COLUMNS:
+            # None becomes NaN
+            self.columns[name][indices] = np.array(columns[name], dtype=np.float64)
+        self.recommendation_codes[indices] = [self._code(value) for value in columns["recommendation"]]
+        bitmaps = {"skill": self.skill_bits, "tag": self.tag_bits}
+        for changes, value in ((cleared, False), (added, True)):
+            for (kind, key), rows_to_change in changes.items():
+                self._bitmap(bitmaps[kind], key)[rows_to_change] = value
+
+    def _load(self, db: Session, since_seq: Optional[int], batch_size: int = 5000):
+        query = select(*SNAPSHOT_COLUMNS).order_by(Candidate.id)
+        if since_seq is not None:
+            query = query.where(Candidate.change_seq > since_seq)
+        last_id = 0
+        while True:
+            rows = db.execute(query.where(Candidate.id > last_id).limit(batch_size)).all()
+            if not rows:
+                return
+            self._apply(rows, load_tags(db, [row.id for row in rows]))
+            last_id = rows[-1].id
+
+    def refresh(self, db: Session) -> bool:
+        """Bring the snapshot up to date; returns True if anything was loaded"""
+        with self._lock:
+            seq = current_change_seq(db.connection())
+            count = db.scalar(select(func.count(Candidate.id)))
+            if seq == self.seq and count == self.size:
+                return False
+            if self.seq >= 0:
+                self._load(db, since_seq=self.seq)
+            if self.seq < 0 or count != self.size:
+                self._reset(max(1024, count))
+                self._load(db, since_seq=None)
+            self.seq = seq
+            return True
+
+    def query(self, recommendation: Optional[str] = None, min_score: Optional[float] = None,
+              max_score: Optional[float] = None, skills: Optional[List[str]] = None,
+              tag: Optional[str] = None, sort: str = "overall_score", descending: bool = True,
+              limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Matching candidates as CandidateSummary-shaped dicts.
+
+        Every filter is ANDed; skills must all be present. Missing values
+        sort last, ties by id.
+        """
+        if sort not in SORTABLE:
+            raise ValueError(f"Cannot sort by {sort}")
+        with self._lock:
+            n = self.size
+            mask = np.ones(n, dtype=bool)
+            if recommendation is not None:
+                if recommendation not in self.recommendations:
+                    return []
+                mask &= self.recommendation_codes[:n] == self.recommendations.index(recommendation)
+            overall = self.columns["overall_score"][:n]
+            if min_score is not None:
+                mask &= overall >= min_score
+            if max_score is not None:
+                mask &= overall <= max_score
+            wanted = [(self.skill_bits, _skill_key(skill)) for skill in skills or []]
+            if tag:
+                wanted.append((self.tag_bits, normalize_tag(tag)))
+            for bitmaps, key in wanted:
+                bits = bitmaps.get(key)
+                if bits is None:
+                    return []
+                mask &= bits[:n]
+
+            rows = np.flatnonzero(mask)
+            values = (self.ids if sort == "id" else self.columns[sort])[rows].astype(np.float64)
+            keys = np.where(np.isnan(values), np.inf, -values if descending else values)
+            end = None if limit is None else offset + limit
+            if end is not None and end < len(rows):
+                # Top-N: partition before sorting the survivors
+                cut = np.argpartition(keys, end - 1)[:end]
+                cutoff = keys[cut].max()
+                rows, keys = rows[keys <= cutoff], keys[keys <= cutoff]
+            order = np.lexsort((self.ids[rows], keys))
+            return self._as_dicts(rows[order][offset:end])
+
+    def _as_dicts(self, rows: np.ndarray) -> List[Dict[str, Any]]:
+        columns = {name: self.columns[name][rows].tolist() for name in NUMERIC_COLUMNS}
+        recommendations = [self.recommendations[code] for code in self.recommendation_codes[rows].tolist()]
+        result = []
+        for position, row in enumerate(rows.tolist()):
+            record = self.records[row]
+            item = {
+                "id": record.id,
+                "name": record.name,
+                "email": record.email,
+                "phone": record.phone,
+                "skills": record.skills,
+                "recommendation": recommendations[position],
+                "reason": record.reason,
+                "filename": record.filename,
+                "near_duplicate_of": record.near_duplicate_of,
+                "uploaded_at": record.uploaded_at,
+                "tags": record.tags,
+            }
+            for name, values in columns.items():
+                value = values[position]
+                item[name] = None if value != value else value  # NaN is missing
+            result.append(item)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts, score distribution and most common skills over all candidates"""
+        with self._lock:
+            n = self.size
+            overall = self.columns["overall_score"][:n]
+            counts = np.bincount(self.recommendation_codes[:n], minlength=len(self.recommendations))
+            scored = overall[~np.isnan(overall)]
+            histogram, edges = np.histogram(scored, bins=10, range=(0, 100))
+            skill_counts = sorted(((int(bits[:n].sum()), skill) for skill, bits in self.skill_bits.items()),
+                                  reverse=True)[:20]
+            return {
+                "total": n,
+                "change_seq": self.seq,
+                "recommendations": {str(value): int(count) for value, count in zip(self.recommendations, counts)
+                                    if count},
+                "average_overall_score": round(float(scored.mean()), 1) if scored.size else None,
+                "average_experience_years": round(float(np.nanmean(self.columns["experience_years"][:n])), 1)
+                if n and not np.isnan(self.columns["experience_years"][:n]).all() else None,
+                "score_histogram": [{"from": int(lo), "to": int(hi), "count": int(count)}
+                                    for lo, hi, count in zip(edges[:-1], edges[1:], histogram)],
+                "top_skills": [{"skill": skill, "count": count} for count, skill in skill_counts if count],
+            }
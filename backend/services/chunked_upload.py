@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import os
+import secrets
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import UploadSession
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_MAX_FILE_BYTES = int(os.getenv("UPLOAD_MAX_FILE_BYTES", str(20 * 1024 * 1024)))
+UPLOAD_MAX_BATCH_BYTES = int(os.getenv("UPLOAD_MAX_BATCH_BYTES", str(1024 * 1024 * 1024)))
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+PARTIAL_DIR = "partial"
+
+# Serialises PATCHes to the same upload within this process; clients send
+# one chunk at a time per file anyway
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+class OffsetMismatch(Exception):
+    """The client's Upload-Offset is not where the partial file ends"""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+def new_upload_id() -> str:
+    return secrets.token_hex(16)
+
+
+def partial_path(root: str, upload_id: str) -> str:
+    return os.path.join(root, PARTIAL_DIR, f"{upload_id}.part")
+
+
+def received_bytes(root: str, upload_id: str) -> int:
+    """Bytes received so far, i.e. the offset the next chunk must start at"""
+    try:
+        return os.path.getsize(partial_path(root, upload_id))
+    except FileNotFoundError:
+        return 0
+
+
+def check_limits(db: Session, batch_id: str, length: int) -> Optional[str]:
+    """Error message if a new file of `length` bytes would break a size cap"""
+    if length <= 0:
+        return "Upload-Length must be positive"
+    if length > UPLOAD_MAX_FILE_BYTES:
+        return f"File exceeds the {UPLOAD_MAX_FILE_BYTES} byte limit per file"
+    batch_bytes = db.query(func.coalesce(func.sum(UploadSession.length), 0)).filter(
+        UploadSession.batch_id == batch_id
+    ).scalar()
+    if batch_bytes + length > UPLOAD_MAX_BATCH_BYTES:
+        return f"Batch exceeds the {UPLOAD_MAX_BATCH_BYTES} byte limit per batch"
+    return None
+
+
+async def append_chunk(root: str, session: UploadSession, offset: int, chunks: AsyncIterator[bytes]) -> int:
+    """Append a request body to the partial file at `offset`; returns the new offset.
+
+    Chunks are written as they arrive, so memory stays at one network read
+    whatever the chunk size; file I/O runs on the thread pool. Raises
+    OffsetMismatch if the client is out of step and ValueError if the body
+    would run past the declared length (the partial file is then cut back
+    to `offset`).
+    """
+    path = partial_path(root, session.id)
+    lock = _locks.setdefault(session.id, asyncio.Lock())
+    async with lock:
+        out = await run_in_threadpool(_open_for_append, path)
+        try:
+            position = out.tell()
+            if position != offset:
+                raise OffsetMismatch(position)
+            async for chunk in chunks:
+                if position + len(chunk) > session.length:
+                    await run_in_threadpool(out.truncate, offset)
+                    raise ValueError("Chunk runs past Upload-Length")
+                await run_in_threadpool(out.write, chunk)
+                position += len(chunk)
+            return position
+        finally:
+            await run_in_threadpool(out.close)
+
+
+def _open_for_append(path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return open(path, "ab")
+
+
+def discard(root: str, upload_id: str):
+    """Remove a session's partial file and its lock"""
+    _locks.pop(upload_id, None)
+    try:
+        os.remove(partial_path(root, upload_id))
+    except FileNotFoundError:
+        pass
+
+
+def expire_sessions(db: Session, root: str) -> int:
+    """Drop unfinished uploads older than UPLOAD_SESSION_TTL_HOURS"""
+    cutoff = datetime.utcnow() - timedelta(hours=UPLOAD_SESSION_TTL_HOURS)
+    stale = db.query(UploadSession).filter(
+        UploadSession.status.in_(("uploading", "finalizing")), UploadSession.created_at < cutoff
+    ).all()
+    for session in stale:
+        discard(root, session.id)
+        session.status = "failed"
+        session.error = "Upload expired"
+    if stale:
+        db.commit()
+        logger.info(f"Expired {len(stale)} unfinished uploads")
+    return len(stale)
@@ -0,0 +1,55 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Tuple
+
+CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+@dataclass
+class StoredFile:
+    sha256: str
+    key: str  # storage key, see content_key
+    size: int
+    extension: str
+    already_stored: bool
+
+
+def content_key(sha256: str, extension: str) -> str:
+    """Sharded content-addressed key: ab/cd/abcd....pdf"""
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def content_path(root: str, sha256: str, extension: str) -> str:
+    """Sharded content-addressed path: <root>/ab/cd/abcd....pdf"""
+    return os.path.join(root, *content_key(sha256, extension).split("/"))
+
+
+def spool(stream: BinaryIO, tmp_dir: str) -> Tuple[str, int, str]:
+    """Copy a stream to a temporary file, hashing while streaming.
+
+    Returns (sha256, size, temporary path); the caller moves or removes the file.
+    """
+    os.makedirs(tmp_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return digest.hexdigest(), size, tmp_path
+
+
+def text_hash(text: str) -> str:
+    """Stable hash of a string, e.g. to key screening results by job description"""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
@@ -0,0 +1,91 @@
+import hashlib
+import re
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from models import ResumeDocument, DocumentBand
+
+# 128 permutations split into 16 bands of 8 rows: pairs above roughly 0.7
+# Jaccard similarity share at least one band with high probability.
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, 2 ** 31, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 2 ** 31, size=NUM_PERM).astype(np.uint64)
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text: str) -> set:
+    """Overlapping word 5-grams of the lower-cased text"""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """MinHash signature (uint32[NUM_PERM]) of the text's shingles"""
+    items = shingles(text)
+    if not items:
+        return np.zeros(NUM_PERM, dtype=np.uint32)
+    hashed = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in items),
+        dtype=np.uint64, count=len(items)
+    )
+    # (a * x + b) mod p for every permutation at once, then the column minimum
+    permuted = (_A[:, None] * hashed[None, :] + _B[:, None]) % _PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray) -> List[int]:
+    """One signed 64-bit LSH key per band"""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + rows, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(a == b))
+
+
+def find_near_duplicate(db: Session, signature: np.ndarray,
+                        exclude_sha256: Optional[str] = None) -> Optional[Tuple[ResumeDocument, float]]:
+    """Best stored document sharing an LSH band and above the threshold"""
+    if not signature.any():
+        return None
+    candidate_ids = [
+        row[0] for row in
+        db.query(DocumentBand.document_id)
+        .filter(DocumentBand.band_key.in_(band_keys(signature)))
+        .distinct()
+    ]
+    if not candidate_ids:
+        return None
+
+    best = None
+    for doc in db.query(ResumeDocument).filter(ResumeDocument.id.in_(candidate_ids)):
+        if doc.sha256 == exclude_sha256 or not doc.minhash:
+            continue
+        score = similarity(signature, np.frombuffer(doc.minhash, dtype=np.uint32))
+        if score >= NEAR_DUPLICATE_THRESHOLD and (best is None or score > best[1]):
+            best = (doc, score)
+    return best
+
+
+def index_document(db: Session, document: ResumeDocument, signature: np.ndarray):
+    """Store a document's signature and LSH bands (caller commits)"""
+    document.minhash = signature.tobytes()
+    if signature.any():
+        db.add_all([DocumentBand(band_key=key, document_id=document.id) for key in set(band_keys(signature))])
@@ -0,0 +1,166 @@
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional, Tuple
+
+from .resume_preprocess import SECTION_HEADINGS, _heading
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+_YEAR = r"(?:19|20)\d{2}"
+_ONGOING = r"present|current(?:ly)?|now|today|date"
+
+
+def _date(prefix: str) -> str:
+    # "Mar 2019", "March, 2019", "03/2019", "3.2019" or just "2019"
+    return (rf"(?:(?P<{prefix}_mname>{_MONTH}),?\s+|(?P<{prefix}_mnum>0?[1-9]|1[0-2])[/.-])?"
+            rf"(?P<{prefix}_year>{_YEAR})")
+
+
+# Everything is found in one finditer pass over the text. Alternatives are
+# tried in order at each position, so a date range like "2015 - 2019" is
+# never mistaken for a phone number.
+_FIELDS_RE = re.compile(
+    r"(?P<linkedin>(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[\w%-]+)"
+    r"|(?P<github>(?:https?://)?(?:www\.)?github\.com/[\w-]+)"
+    r"|(?P<email>[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,})"
+    rf"|(?P<range>{_date('start')}\s*(?:-|–|—|to|until|till)\s*(?:(?P<ongoing>{_ONGOING})|{_date('end')}))"
+    r"|(?P<phone>(?<![\w+])(?:\+|00)?(?:\(\d{1,4}\)[ .-]?)?\d[\d .-]{0,4}(?:\(\d{1,4}\)[ .-]?)?\d[\d .-]{4,16}\d(?!\w))"
+    + "".join(rf"|(?P<heading_{name}>^[ \t]*(?:{pattern})[ \t]*:?[ \t]*$)" for name, pattern in SECTION_HEADINGS),
+    re.IGNORECASE | re.MULTILINE
+)
+
+_NAME_RE = re.compile(r"^[A-Z][A-Za-z'.-]+(?: [A-Z][A-Za-z'.-]+){1,3}$")
+# Words of section headings, which look like names in title or upper case
+# ("Work Experience", "SKILLS SUMMARY")
+_HEADING_WORDS = {
+    "about", "academic", "additional", "and", "award", "awards", "career", "certification",
+    "certifications", "competencies", "contact", "core", "curriculum", "degree", "degrees", "details",
+    "education", "employment", "experience", "highlights", "history", "hobbies", "honors", "honours",
+    "information", "interests", "key", "languages", "me", "objective", "personal", "professional",
+    "profile", "project", "projects", "publications", "qualifications", "references", "relevant",
+    "resume", "skills", "stack", "summary", "tech", "technical", "technologies", "tools", "vitae",
+    "volunteer", "work",
+}
+# Words of resume file names ("Jane Doe CV Final"), never part of a name
+_FILE_NAME_WORDS = {"resume", "cv", "curriculum", "vitae", "final", "updated", "draft", "copy"}
+
+# Ranges longer than this are parse noise, not a job
+_MAX_RANGE_MONTHS = 50 * 12
+# A range that starts and ends in the same year, with no end month ("2019 - 2019")
+_SAME_YEAR_MONTHS = 6
+
+
+@dataclass
+class ExtractedFields:
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    github_url: Optional[str] = None
+    experience_years: float = 0.0
+    # (start, end) month indexes, end exclusive, from the experience section
+    employment_ranges: List[Tuple[int, int]] = field(default_factory=list)
+
+
+def _month_index(match, prefix: str, is_end: bool) -> int:
+    year = int(match.group(f"{prefix}_year"))
+    month_name, month_num = match.group(f"{prefix}_mname"), match.group(f"{prefix}_mnum")
+    if month_name:
+        month = _MONTHS[month_name[:3].lower()]
+    elif month_num:
+        month = int(month_num)
+    else:
+        # Year only: "2016 - 2019" counts as three years
+        return year * 12
+    # An end month is worked in full
+    return year * 12 + month - 1 + (1 if is_end else 0)
+
+
+def _parse_range(match, today: date) -> Optional[Tuple[int, int]]:
+    start = _month_index(match, "start", False)
+    if match.group("ongoing"):
+        end = today.year * 12 + today.month
+    else:
+        end = _month_index(match, "end", True)
+        end_year = int(match.group("end_year"))
+        if end <= start and end == end_year * 12 and start < end + 12:
+            # Year-only end in the start's year ("2019 - 2019", "Mar 2019 - 2019"):
+            # some part of that year
+            end = min(start + _SAME_YEAR_MONTHS, end + 12)
+    if end <= start or end - start > _MAX_RANGE_MONTHS:
+        return None
+    return start, end
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Union of overlapping or touching month ranges"""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def looks_like_name(text: Optional[str]) -> bool:
+    """Two to four capitalised words that are not a section heading or file name"""
+    text = (text or "").strip()
+    if not _NAME_RE.match(text) or _heading(text):
+        return False
+    words = set(re.findall(r"[a-z]+", text.lower()))
+    return not words <= _HEADING_WORDS and not words & _FILE_NAME_WORDS
+
+
+def _guess_name(text: str) -> Optional[str]:
+    """First line near the top that looks like a person's name"""
+    for line in text.strip().splitlines()[:8]:
+        line = line.strip()
+        if looks_like_name(line):
+            return line.title() if line.isupper() else line
+    return None
+
+
+def extract_fields(text: str, today: Optional[date] = None) -> ExtractedFields:
+    """Contact details and experience years from resume text, no LLM involved.
+
+    Employment date ranges are taken from the experience section (or from
+    everywhere but education when there is no such heading) and merged
+    before summing, so overlapping jobs are not counted twice.
+    """
+    today = today or date.today()
+    fields = ExtractedFields(name=_guess_name(text))
+    section = "contact"
+    ranges = {}
+
+    for match in _FIELDS_RE.finditer(text):
+        kind = match.lastgroup
+        if kind.startswith("heading_"):
+            section = kind[len("heading_"):]
+        elif kind == "range":
+            parsed = _parse_range(match, today)
+            if parsed:
+                ranges.setdefault(section, []).append(parsed)
+        elif kind == "phone":
+            digits = re.sub(r"\D", "", match.group())
+            if fields.phone is None and 7 <= len(digits) <= 15:
+                fields.phone = match.group().strip(" .-")
+        elif kind in ("email", "linkedin", "github"):
+            attr = kind if kind == "email" else f"{kind}_url"
+            if getattr(fields, attr) is None:
+                value = match.group()
+                if kind != "email" and not value.lower().startswith("http"):
+                    value = "https://" + value
+                setattr(fields, attr, value)
+
+    if "experience" in ranges:
+        employment = ranges["experience"]
+    else:
+        employment = [r for name, found in ranges.items() if name != "education" for r in found]
+    fields.employment_ranges = merge_ranges(employment)
+    fields.experience_years = round(sum(end - start for start, end in fields.employment_ranges) / 12, 1)
+    return fields
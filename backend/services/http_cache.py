@@ -0,0 +1,35 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Clients may reuse a cached body but must revalidate it first
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from the version parts that determine a response body.
+
+    Weak because the compression middleware serves the same representation
+    as identity, gzip or Brotli bytes, and a strong tag must differ per
+    encoding.
+    """
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response if the request's If-None-Match already names `etag`
+    (weak comparison, as If-None-Match requires)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if etag.removeprefix("W/") in tags or "*" in tags:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import re
+from typing import List, Optional, Set
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from models import Candidate, IdentityKey, Person, ResumeDocument, next_change_seq
+from .field_extractor import looks_like_name
+from .scoring import UNSCORED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_SKILLS = 3  # skills in the name + skills key
+PHONE_KEY_DIGITS = 10
+_NAME_TOKEN_RE = re.compile(r"[a-z]+")
+# Providers that ignore dots in the local part
+_DOTLESS_DOMAINS = {"gmail.com", "googlemail.com"}
+
+# Fields copied from an earlier screening of the same text
+SCREENING_FIELDS = ("skills_score", "experience_score", "education_score", "overall_score",
+                    "skills", "reason", "scored_by", "recommendation")
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """jane.doe+jobs@GMail.com -> janedoe@gmail.com"""
+    if not email or "@" not in email:
+        return None
+    local, domain = email.strip().lower().rsplit("@", 1)
+    local = local.split("+", 1)[0]
+    if domain in _DOTLESS_DOMAINS:
+        local = local.replace(".", "")
+    return f"{local}@{domain}" if local else None
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Last ten digits, so +1 (555) 010-2000 and 555.010.2000 agree; shorter
+    numbers (local or partial) are too likely to be shared to identify anyone"""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-PHONE_KEY_DIGITS:] if len(digits) >= PHONE_KEY_DIGITS else None
+
+
+def normalize_name(name: Optional[str]) -> Optional[str]:
+    """Lower-cased name tokens in sorted order; None for one-word names"""
+    tokens = sorted(_NAME_TOKEN_RE.findall((name or "").lower()))
+    return " ".join(tokens) if len(tokens) >= 2 else None
+
+
+def skills_signature(skills: List[str]) -> Optional[str]:
+    """Bottom-k hash sketch of the skill set: small edits to a long list
+    usually leave it unchanged, different people's lists rarely share it"""
+    hashed = sorted({hashlib.blake2b(s.strip().lower().encode("utf-8"), digest_size=6).hexdigest()
+                     for s in skills or [] if s.strip()})
+    return ",".join(hashed[:SIGNATURE_SKILLS]) if len(hashed) >= SIGNATURE_SKILLS else None
+
+
+def identity_keys(email: Optional[str], phone: Optional[str], name: Optional[str],
+                  skills: Optional[List[str]] = None) -> Set[str]:
+    """Blocking keys of an applicant; two candidates sharing any key are the same person"""
+    keys = set()
+    if normalize_email(email):
+        keys.add(f"email:{normalize_email(email)}")
+    if normalize_phone(phone):
+        keys.add(f"phone:{normalize_phone(phone)}")
+    # Names come from text extraction or the file name; only trust real-looking ones
+    name_key = normalize_name(name) if looks_like_name(name) else None
+    signature = skills_signature(skills)
+    if name_key and signature:
+        keys.add(f"name_skills:{name_key}|{signature}")
+    return keys
+
+
+def merge_persons(db: Session, keep_id: int, other_ids: Set[int]):
+    """Move every candidate and key of `other_ids` to `keep_id` and drop them"""
+    if not other_ids:
+        return
+    logger.info(f"Merging persons {sorted(other_ids)} into {keep_id}")
+    db.execute(
+        update(Candidate).where(Candidate.person_id.in_(other_ids))
+        .values(person_id=keep_id, change_seq=next_change_seq(db.connection()))
+    )
+    db.execute(update(IdentityKey).where(IdentityKey.person_id.in_(other_ids)).values(person_id=keep_id))
+    db.execute(delete(Person).where(Person.id.in_(other_ids)))
+
+
+def resolve_candidate(db: Session, candidate: Candidate, skills: Optional[List[str]] = None) -> Person:
+    """Attach a candidate to its person, creating or merging persons as needed.
+
+    Looks up the candidate's blocking keys (one indexed query), so the cost
+    per upload doesn't grow with the number of applicants. Persons linked
+    through any shared key are merged into the oldest, including persons
+    created concurrently for the same keys. Caller commits.
+    """
+    keys = identity_keys(candidate.email, candidate.phone, candidate.name, skills)
+    known = db.execute(select(IdentityKey.key, IdentityKey.person_id).where(IdentityKey.key.in_(keys))).all() \
+        if keys else []
+    person_ids = {person_id for _, person_id in known}
+    if candidate.person_id:
+        person_ids.add(candidate.person_id)
+    if not person_ids:
+        person = Person()
+        db.add(person)
+        db.flush()
+        person_ids.add(person.id)
+
+    new_keys = keys - {key for key, _ in known}
+    if new_keys:
+        # An upload of the same person finishing alongside may have claimed
+        # some keys since the lookup; theirs stay and the persons are merged
+        db.execute(_insert_ignoring_conflicts(db, IdentityKey),
+                   [{"key": key, "person_id": min(person_ids)} for key in new_keys])
+        person_ids.update(db.scalars(select(IdentityKey.person_id).where(IdentityKey.key.in_(new_keys))))
+
+    keep_id = min(person_ids)
+    merge_persons(db, keep_id, person_ids - {keep_id})
+    person = db.get(Person, keep_id)
+
+    # The latest upload's contact details win
+    person.name = candidate.name or person.name
+    person.email = candidate.email or person.email
+    person.phone = candidate.phone or person.phone
+    candidate.person_id = person.id
+    db.flush()
+    return person
+
+
+def _insert_ignoring_conflicts(db: Session, model):
+    """INSERT ... ON CONFLICT DO NOTHING for the session's database"""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model).on_conflict_do_nothing()
+
+
+def previous_screening(db: Session, candidate: Candidate, text_sha256: str) -> Optional[Candidate]:
+    """The person's latest finished screening of the same text for the same job"""
+    if not candidate.person_id or not text_sha256:
+        return None
+    return db.scalar(
+        select(Candidate)
+        .join(ResumeDocument, ResumeDocument.sha256 == Candidate.content_hash)
+        .where(
+            Candidate.person_id == candidate.person_id,
+            Candidate.id != candidate.id,
+            Candidate.job_hash == candidate.job_hash,
+            Candidate.recommendation.notin_(UNSCORED_STATUSES),
+            ResumeDocument.text_sha256 == text_sha256,
+        )
+        .order_by(Candidate.id.desc()).limit(1)
+    )
+
+
+def backfill_persons(db: Session, batch_size: int = 500) -> int:
+    """Resolve every candidate that has no person yet; returns how many"""
+    from schemas import decode_json_lists
+
+    resolved = 0
+    while True:
+        candidates = db.query(Candidate).filter(Candidate.person_id.is_(None)).order_by(Candidate.id) \
+            .limit(batch_size).all()
+        if not candidates:
+            return resolved
+        skills = decode_json_lists([c.skills for c in candidates])
+        for candidate, candidate_skills in zip(candidates, skills):
+            resolve_candidate(db, candidate, candidate_skills)
+        db.commit()
+        resolved += len(candidates)
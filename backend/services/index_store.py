@@ -0,0 +1,137 @@
+import glob
+import os
+import re
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev server only
+    fcntl = None
+
+_MATRIX_RE = re.compile(r"embeddings-(\d+)\.npy$")
+
+
+class SharedIndexStore:
+    """Search index state shared by every worker process on the host.
+
+    Holds a monotonic version counter (bumped when the indexed candidate
+    set changes) and, per version, the candidate embedding matrix as a
+    .npy file that workers memory-map read-only instead of each building
+    its own copy. Version bumps and matrix builds serialise on separate
+    exclusive file locks: whichever worker gets there first builds and
+    publishes a matrix while the others wait and map the result, and a
+    slow build never holds up bumping the version.
+    """
+
+    KEEP_VERSIONS = 2
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._version_path = os.path.join(directory, "VERSION")
+        self._lock_path = os.path.join(directory, ".lock")
+        self._matrix_lock_path = os.path.join(directory, ".matrix.lock")
+        self._cached = (None, (0, ""))
+
+    @contextmanager
+    def _locked(self, path: str):
+        with open(path, "a+") as handle:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def lock(self):
+        """Exclusive cross-process lock for the version counter"""
+        return self._locked(self._lock_path)
+
+    def matrix_lock(self):
+        """Exclusive cross-process lock for building and publishing matrices"""
+        return self._locked(self._matrix_lock_path)
+
+    def _read_state(self) -> Tuple[int, str]:
+        try:
+            stat = os.stat(self._version_path)
+        except FileNotFoundError:
+            return 0, ""
+        key = (stat.st_mtime_ns, stat.st_size)
+        if self._cached[0] == key:
+            return self._cached[1]
+        with open(self._version_path) as f:
+            parts = f.read().split()
+        state = (int(parts[0]), parts[1] if len(parts) > 1 else "") if parts else (0, "")
+        self._cached = (key, state)
+        return state
+
+    def _write_atomic(self, path: str, write):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def version(self) -> int:
+        """Current shared index version (cheap: a stat, plus a read when it changed)"""
+        return self._read_state()[0]
+
+    def bump_if_changed(self, fingerprint: str) -> int:
+        """Advance the version if the candidate set's fingerprint differs.
+
+        Every worker reports what it sees; the version only moves when the
+        content really changed, so workers never invalidate each other in
+        a loop.
+        """
+        with self.lock():
+            version, current = self._read_state()
+            if current == fingerprint:
+                return version
+            version += 1
+            self._write_atomic(self._version_path, lambda f: f.write(f"{version} {fingerprint}".encode()))
+            return version
+
+    def _paths(self, version: int) -> Tuple[str, str]:
+        return (os.path.join(self.directory, f"embeddings-{version}.npy"),
+                os.path.join(self.directory, f"keys-{version}.npy"))
+
+    def load_matrix(self, version: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(keys, matrix) published for a version, memory-mapped read-only"""
+        matrix_path, keys_path = self._paths(version)
+        if not (os.path.exists(matrix_path) and os.path.exists(keys_path)):
+            return None
+        return np.load(keys_path), np.load(matrix_path, mmap_mode="r")
+
+    def latest_matrix(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Most recent published matrix, used to reuse embeddings across versions"""
+        versions = sorted(
+            (int(m.group(1)) for m in (_MATRIX_RE.search(p) for p in
+             glob.glob(os.path.join(self.directory, "embeddings-*.npy"))) if m),
+            reverse=True
+        )
+        for version in versions:
+            loaded = self.load_matrix(version)
+            if loaded is not None:
+                return loaded
+        return None
+
+    def publish_matrix(self, version: int, keys: np.ndarray, matrix: np.ndarray):
+        """Write a version's matrix (caller holds matrix_lock()) and prune old versions"""
+        matrix_path, keys_path = self._paths(version)
+        self._write_atomic(keys_path, lambda f: np.save(f, keys))
+        self._write_atomic(matrix_path, lambda f: np.save(f, np.ascontiguousarray(matrix, dtype=np.float32)))
+
+        for path in glob.glob(os.path.join(self.directory, "embeddings-*.npy")):
+            match = _MATRIX_RE.search(path)
+            if match and int(match.group(1)) <= version - self.KEEP_VERSIONS:
+                old_matrix, old_keys = self._paths(int(match.group(1)))
+                for stale in (old_matrix, old_keys):
+                    try:
+                        os.remove(stale)
+                    except FileNotFoundError:
+                        pass
@@ -0,0 +1,145 @@
+import csv
+import io
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import IngestionFileRecord, ScreeningRun
+from .ocr import OcrReport
+
+# A few very common words per language; resumes are short on prose, so
+# the language with the most hits among the first few thousand words wins
+_STOPWORDS = {
+    "en": {"the", "and", "of", "to", "in", "for", "with", "on", "at", "as", "is", "by", "from", "an"},
+    "es": {"el", "la", "de", "que", "y", "en", "los", "del", "las", "por", "con", "para", "una", "como"},
+    "fr": {"le", "la", "les", "de", "des", "et", "en", "du", "un", "une", "pour", "dans", "avec", "sur"},
+    "de": {"der", "die", "und", "in", "den", "von", "zu", "das", "mit", "im", "für", "auf", "bei", "als"},
+    "pt": {"de", "e", "do", "da", "em", "para", "com", "os", "as", "na", "no", "uma", "dos", "das"},
+    "it": {"il", "di", "e", "la", "che", "per", "in", "con", "del", "della", "le", "una", "nel", "dei"},
+    "nl": {"de", "en", "van", "het", "een", "in", "op", "met", "voor", "te", "bij", "als", "aan", "zijn"},
+}
+_WORD_RE = re.compile(r"[^\W\d_]+")
+_LANGUAGE_SAMPLE_WORDS = 3000
+_MIN_STOPWORD_HITS = 5
+
+REPORT_COLUMNS = ("filename", "format", "language", "size_bytes", "pages", "ocr_pages", "extraction_ms",
+                  "status", "error", "candidate_id", "queue_wait_ms", "screening_ms", "prompt_tokens", "llm_ms")
+
+
+def guess_language(text: Optional[str]) -> Optional[str]:
+    """ISO 639-1 code of the most likely language, or None if unsure"""
+    words = _WORD_RE.findall((text or "").lower())[:_LANGUAGE_SAMPLE_WORDS]
+    hits = Counter()
+    for word in words:
+        for language, stopwords in _STOPWORDS.items():
+            if word in stopwords:
+                hits[language] += 1
+    if not hits:
+        return None
+    language, count = hits.most_common(1)[0]
+    return language if count >= _MIN_STOPWORD_HITS else None
+
+
+def new_file_record(run_id: str, filename: str) -> IngestionFileRecord:
+    extension = os.path.splitext(filename or "")[1].lower()
+    return IngestionFileRecord(run_id=run_id, filename=filename, format=extension.lstrip(".") or None,
+                               ocr_pages=0, extraction_ms=0)
+
+
+def describe_text(record: IngestionFileRecord, text: Optional[str], ocr_report: Optional[OcrReport] = None,
+                  extraction_seconds: float = 0.0):
+    """Fill the record's language, page and extraction fields"""
+    record.language = guess_language(text)
+    if ocr_report is not None:
+        record.pages = ocr_report.page_count or record.pages
+        record.ocr_pages = ocr_report.pages
+    if extraction_seconds:
+        record.extraction_ms = round(extraction_seconds * 1000, 1)
+
+
+def settle(record: IngestionFileRecord, candidate, is_duplicate: bool, error: Optional[str] = None):
+    """Record the outcome of ingesting the file; caller adds and commits"""
+    if error or candidate is None:
+        record.status, record.error = "failed", error or "Could not extract text"
+    elif is_duplicate:
+        record.status, record.candidate_id = "duplicate", candidate.id
+    else:
+        record.status, record.candidate_id = "queued", candidate.id
+        record.queued_at = datetime.utcnow()
+
+
+def start_screening(db: Session, candidate_id: int) -> Tuple[Optional[IngestionFileRecord], int]:
+    """The candidate's queued file record, with its queue wait filled in,
+    and the id of the candidate's latest logged LLM call so far"""
+    record = db.query(IngestionFileRecord).filter(
+        IngestionFileRecord.candidate_id == candidate_id, IngestionFileRecord.status == "queued"
+    ).order_by(IngestionFileRecord.id.desc()).first()
+    if record is None:
+        return None, 0
+    if record.queued_at:
+        record.queue_wait_ms = round((datetime.utcnow() - record.queued_at).total_seconds() * 1000, 1)
+    last_run_id = db.scalar(select(func.max(ScreeningRun.id)).where(ScreeningRun.candidate_id == candidate_id))
+    return record, last_run_id or 0
+
+
+def finish_screening(db: Session, record: IngestionFileRecord, last_run_id: int, seconds: float, failed: bool):
+    """Screening time, and prompt tokens and LLM time from the run log; caller commits"""
+    tokens, llm_ms = db.execute(
+        select(func.sum(ScreeningRun.prompt_tokens), func.sum(ScreeningRun.wall_ms))
+        .where(ScreeningRun.candidate_id == record.candidate_id, ScreeningRun.id > last_run_id)
+    ).one()
+    record.status = "error" if failed else "screened"
+    record.screening_ms = round(seconds * 1000, 1)
+    record.prompt_tokens = tokens
+    record.llm_ms = round(llm_ms, 1) if llm_ms is not None else None
+
+
+def _records(db: Session, run_id: str) -> Iterator[IngestionFileRecord]:
+    return db.query(IngestionFileRecord).filter(IngestionFileRecord.run_id == run_id) \
+        .order_by(IngestionFileRecord.id).yield_per(1000)
+
+
+def iter_report_csv(db: Session, run_id: str) -> Iterator[str]:
+    """The run's file records as CSV, a chunk of rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(REPORT_COLUMNS)
+    for count, record in enumerate(_records(db, run_id), 1):
+        writer.writerow(["" if value is None else value
+                         for value in (getattr(record, column) for column in REPORT_COLUMNS)])
+        if count % 500 == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def summarize_run(db: Session, run_id: str) -> Dict[str, Any]:
+    """Counts per status, format and language, and timing percentiles"""
+    import numpy as np
+
+    records = list(_records(db, run_id))
+    timings = {}  # per field: count, total and percentiles over files that have it
+    for field in ("extraction_ms", "queue_wait_ms", "screening_ms", "llm_ms", "prompt_tokens"):
+        values = np.asarray([getattr(r, field) for r in records if getattr(r, field)], dtype=np.float64)
+        timings[field] = {
+            "count": int(values.size),
+            "total": round(float(values.sum()), 1),
+            "p50": round(float(np.percentile(values, 50)), 1),
+            "p95": round(float(np.percentile(values, 95)), 1),
+            "max": round(float(values.max()), 1),
+        } if values.size else {"count": 0}
+    return {
+        "files": len(records),
+        "bytes": sum(r.size_bytes or 0 for r in records),
+        "pages": sum(r.pages or 0 for r in records),
+        "statuses": dict(Counter(r.status for r in records)),
+        "formats": dict(Counter(r.format for r in records)),
+        "languages": dict(Counter(r.language or "unknown" for r in records)),
+        "distributions": timings,
+    }
@@ -0,0 +1,134 @@
+import hashlib
+import re
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class KeywordIndex:
+    """BM25 keyword search over an SQLite FTS5 table.
+
+    The index lives in its own SQLite file so it works whatever database
+    backs the app, and so index writes never take the main database's lock.
+    Each candidate is one FTS row (rowid = candidate id) with separate
+    columns, which lets bm25() weight a hit in skills above one in the
+    resume body.
+    """
+
+    # Column order matters: bm25() takes the weights positionally
+    FIELD_WEIGHTS = {
+        "name": 2.0,
+        "skills": 4.0,
+        "tags": 3.0,
+        "reason": 1.0,
+        "resume_text": 1.0,
+    }
+
+    def __init__(self, path: str = "search_index.db"):
+        self.path = path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        columns = ", ".join(self.FIELD_WEIGHTS)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS candidate_fts "
+            f"USING fts5({columns}, tokenize='porter unicode61')"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS candidate_fts_state ("
+            "candidate_id INTEGER PRIMARY KEY, fingerprint TEXT NOT NULL)"
+        )
+        conn.commit()
+        weights = ", ".join(str(w) for w in self.FIELD_WEIGHTS.values())
+        self._search_sql = (
+            f"SELECT rowid, score FROM ("
+            f"SELECT rowid, -bm25(candidate_fts, {weights}) AS score FROM candidate_fts "
+            f"WHERE candidate_fts MATCH ?) "
+            f"WHERE score >= ? ORDER BY score DESC LIMIT ? OFFSET ?"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; searches run on worker threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def fingerprint(candidate: Dict[str, Any]) -> str:
+        """Hash of the indexed metadata; resume text never changes for a candidate"""
+        parts = [
+            candidate.get("name") or "",
+            "\x1f".join(candidate.get("skills") or []),
+            "\x1f".join(candidate.get("tags") or []),
+            candidate.get("reason") or "",
+        ]
+        return hashlib.blake2b("\x1e".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+    def sync(self, candidates: List[Dict[str, Any]],
+             text_loader: Optional[Callable[[List[int]], Dict[int, str]]] = None) -> int:
+        """Bring the index in line with `candidates`, touching only changed rows.
+
+        `text_loader` maps candidate ids to full resume text and is only
+        called for new or changed candidates. Returns the number of rows
+        written.
+        """
+        conn = self._conn()
+        state = dict(conn.execute("SELECT candidate_id, fingerprint FROM candidate_fts_state"))
+        current = {c["id"]: self.fingerprint(c) for c in candidates}
+
+        changed = [c for c in candidates if state.get(c["id"]) != current[c["id"]]]
+        removed = [(cid,) for cid in state.keys() - current.keys()]
+        if not changed and not removed:
+            return 0
+
+        texts = text_loader([c["id"] for c in changed]) if (text_loader and changed) else {}
+        rows = [
+            (
+                c["id"],
+                c.get("name") or "",
+                " ".join(c.get("skills") or []),
+                " ".join(c.get("tags") or []),
+                c.get("reason") or "",
+                texts.get(c["id"]) or "",
+            )
+            for c in changed
+        ]
+
+        with self._write_lock, conn:
+            conn.executemany("DELETE FROM candidate_fts WHERE rowid = ?", [(r[0],) for r in rows] + removed)
+            conn.executemany(
+                "INSERT INTO candidate_fts (rowid, name, skills, tags, reason, resume_text) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO candidate_fts_state (candidate_id, fingerprint) VALUES (?, ?)",
+                [(c["id"], current[c["id"]]) for c in changed]
+            )
+            conn.executemany("DELETE FROM candidate_fts_state WHERE candidate_id = ?", removed)
+        return len(rows) + len(removed)
+
+    @staticmethod
+    def match_expression(query: str) -> Optional[str]:
+        """Turn free text into an FTS5 OR-query of quoted terms.
+
+        Quoting every token keeps user input from being parsed as FTS5
+        syntax (column filters, NEAR, unbalanced quotes).
+        """
+        tokens = _TOKEN_RE.findall(query.lower())
+        if not tokens:
+            return None
+        return " OR ".join(f'"{token}"' for token in dict.fromkeys(tokens))
+
+    def search(self, query: str, limit: int = 10, offset: int = 0,
+               min_score: Optional[float] = None) -> List[Tuple[int, float]]:
+        """(candidate_id, bm25 score) pairs, best first, one page at a time"""
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+        floor = min_score if min_score is not None else float("-inf")
+        return self._conn().execute(self._search_sql, (expression, floor, limit, offset)).fetchall()
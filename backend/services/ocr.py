@@ -0,0 +1,154 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+from .content_store import content_path
+
+logger = logging.getLogger(__name__)
+
+# OCR gets its own small pool so a batch of scans can't hold up the
+# extraction of ordinary files. OCR_MAX_PENDING bounds how many pages can
+# be queued on it at once across all requests.
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+OCR_MAX_PENDING = int(os.getenv("OCR_MAX_PENDING", str(OCR_WORKERS * 4)))
+OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "20"))  # per document
+OCR_DPI = int(os.getenv("OCR_DPI", "300"))
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", "ocr_cache")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(OCR_MAX_PENDING)
+_available: Optional[bool] = None
+
+
+@dataclass
+class OcrReport:
+    """What OCR cost for one document"""
+    page_count: int = 0  # all pages of the document
+    image_pages: int = 0  # pages without a text layer
+    pages: int = 0  # pages OCR'd
+    cached_pages: int = 0  # pages answered from the page cache
+    skipped_pages: int = 0  # image-only pages beyond OCR_MAX_PAGES
+    seconds: float = 0.0  # OCR worker time, summed over pages
+
+    def as_dict(self) -> Dict:
+        return {"page_count": self.page_count, "image_pages": self.image_pages, "pages": self.pages,
+                "cached_pages": self.cached_pages, "skipped_pages": self.skipped_pages,
+                "seconds": round(self.seconds, 3)}
+
+
+def ocr_available() -> bool:
+    """True when pytesseract and the tesseract binary are installed"""
+    global _available
+    if _available is None:
+        try:
+            import pytesseract
+            pytesseract.get_tesseract_version()
+            _available = True
+        except Exception as e:
+            logger.warning(f"OCR disabled, tesseract not available: {e}")
+            _available = False
+    return _available
+
+
+def get_ocr_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=OCR_WORKERS)
+    return _pool
+
+
+def page_image_hash(page) -> Optional[str]:
+    """Content hash of a pdfplumber page's embedded images, None if it has none.
+
+    Scanned pages are one image each, so this identifies the page however
+    many documents it turns up in, without rasterising it.
+    """
+    digest = hashlib.sha256(f"{OCR_DPI}|{OCR_LANG}".encode())
+    found = False
+    for image in page.images:
+        stream = image.get("stream")
+        if stream is None:
+            continue
+        digest.update(stream.get_rawdata() or b"")
+        found = True
+    return digest.hexdigest() if found else None
+
+
+def _cache_path(key: str) -> str:
+    return content_path(OCR_CACHE_DIR, key, ".txt")
+
+
+def _cached(key: str) -> Optional[str]:
+    try:
+        with open(_cache_path(key), encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _store(key: str, text: str):
+    path = _cache_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _ocr_page(source: Union[str, bytes], index: int, dpi: int, lang: str) -> Tuple[str, float]:
+    """Rasterise and OCR one page (runs on the OCR pool)"""
+    import pdfplumber
+    import pytesseract
+
+    started = time.perf_counter()
+    with pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source) as pdf:
+        image = pdf.pages[index].to_image(resolution=dpi).original
+    text = pytesseract.image_to_string(image, lang=lang)
+    return text, time.perf_counter() - started
+
+
+def ocr_pages(source: Union[str, bytes], pages: List[Tuple[int, str]], report: OcrReport) -> Dict[int, str]:
+    """OCR text for (page index, page hash) pairs, from the cache where possible"""
+    texts = {}
+    to_run = []
+    for index, key in pages:
+        cached = _cached(key)
+        if cached is not None:
+            texts[index] = cached
+            report.cached_pages += 1
+        elif len(to_run) < OCR_MAX_PAGES:
+            to_run.append((index, key))
+        else:
+            report.skipped_pages += 1
+    if not to_run or not ocr_available():
+        return texts
+
+    pool = get_ocr_pool()
+    futures = []
+    for index, key in to_run:
+        _pending.acquire()
+        future = pool.submit(_ocr_page, source, index, OCR_DPI, OCR_LANG)
+        future.add_done_callback(lambda _: _pending.release())
+        futures.append((index, key, future))
+
+    for index, key, future in futures:
+        try:
+            text, seconds = future.result()
+        except Exception as e:
+            logger.error(f"OCR of page {index + 1} failed: {e}")
+            continue
+        texts[index] = text
+        report.pages += 1
+        report.seconds += seconds
+        _store(key, text)
+    return texts
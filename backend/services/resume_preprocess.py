@@ -0,0 +1,149 @@
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Set
+
+# Resume tokens allowed in the screening prompt (the job description and
+# instructions come on top). Override with PROMPT_TOKEN_BUDGET.
+DEFAULT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+
+# Order in which sections are kept when the budget is tight
+SECTION_PRIORITY = ("contact", "skills", "experience", "education", "other")
+
+# Share of the budget each section is guaranteed before leftovers are handed
+# out in priority order, so a long work history can't crowd out education
+SECTION_FLOOR = {"contact": 0.05, "skills": 0.20, "experience": 0.45, "education": 0.15, "other": 0.05}
+
+SECTION_HEADINGS = [
+    ("skills", r"(technical\s+)?skills(\s+(and|&)\s+\w+)?|technologies|tech\s+stack|core\s+competencies|competencies|tools"),
+    ("experience", r"(professional\s+|work\s+|relevant\s+)?experience|employment(\s+history)?|work\s+history|career\s+history|projects?"),
+    ("education", r"education(\s+(and|&)\s+\w+)?|academic\s+\w+|qualifications|certifications?|degrees?"),
+    ("other", r"publications?|references|interests|hobbies|awards?|honou?rs|languages|volunteer(ing)?|"
+              r"activities|conferences|presentations|patents|memberships|summary|profile|objective|about\s+me"),
+]
+_HEADING_RE = [
+    (name, re.compile(rf"^\s*(?:{pattern})\s*:?\s*$", re.IGNORECASE))
+    for name, pattern in SECTION_HEADINGS
+]
+
+_BOILERPLATE_RE = re.compile(
+    r"^\s*(page\s+\d+(\s+of\s+\d+)?|\d+\s*/\s*\d+|-\s*\d+\s*-|curriculum\s+vitae|resume|r[ée]sum[ée]|"
+    r"references\s+(are\s+)?available\s+(up)?on\s+request\.?|confidential)\s*$",
+    re.IGNORECASE
+)
+_SPACES_RE = re.compile(r"[ \t ]+")
+
+# Running headers and footers: short lines among the first or last few of a page
+HEADER_FOOTER_LINES = 2
+HEADER_FOOTER_MAX_CHARS = 60
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (~4 characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+def _normalize_line(line: str) -> str:
+    return _SPACES_RE.sub(" ", line).strip()
+
+
+def _running_lines(pages: List[str]) -> Set[str]:
+    """Lower-cased short lines found at the top or bottom of more than one page"""
+    counts = Counter()
+    for page in pages:
+        lines = [line for line in map(_normalize_line, page.splitlines()) if line]
+        edges = lines[:HEADER_FOOTER_LINES] + lines[-HEADER_FOOTER_LINES:]
+        counts.update({line.lower() for line in edges if len(line) <= HEADER_FOOTER_MAX_CHARS})
+    return {line for line, pages_seen in counts.items() if pages_seen > 1}
+
+
+def clean_text(text: str) -> str:
+    """Collapse whitespace and drop boilerplate and running headers/footers.
+
+    Pages are separated by form feeds (see extract.py). A short line at the
+    top or bottom of several pages keeps only its first occurrence; other
+    repeated lines, such as the same bullet under two jobs, are content.
+    """
+    running = _running_lines(text.split("\f"))
+    kept, seen = [], set()
+    for line in text.splitlines():
+        line = _normalize_line(line)
+        key = line.lower()
+        if not line:
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        if _BOILERPLATE_RE.match(line):
+            continue
+        if key in running:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return "\n".join(kept).strip()
+
+
+def _heading(line: str):
+    if len(line) > 40:
+        return None
+    for name, pattern in _HEADING_RE:
+        if pattern.match(line):
+            return name
+    return None
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Group cleaned resume lines by section; text before the first heading is contact"""
+    sections: Dict[str, List[str]] = {name: [] for name in SECTION_PRIORITY}
+    current = "contact"
+    for line in text.splitlines():
+        heading = _heading(line)
+        if heading:
+            current = heading
+            continue
+        sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def _truncate(text: str, tokens: int) -> str:
+    """Cut at a line boundary (or word boundary for a single long line)"""
+    if estimate_tokens(text) <= tokens:
+        return text
+    limit = tokens * 4
+    cut = text[:limit]
+    boundary = cut.rfind("\n")
+    if boundary < limit // 2:
+        boundary = cut.rfind(" ")
+    return cut[:boundary if boundary > 0 else limit].rstrip()
+
+
+def build_resume_excerpt(text: str, token_budget: int = DEFAULT_TOKEN_BUDGET) -> str:
+    """Cleaned, section-labelled resume text that fits in `token_budget` tokens.
+
+    Every section first gets up to its floor share of the budget; whatever
+    is left goes to sections in SECTION_PRIORITY order.
+    """
+    cleaned = clean_text(text)
+    if estimate_tokens(cleaned) <= token_budget:
+        return cleaned
+
+    sections = split_sections(cleaned)
+    sizes = {name: estimate_tokens(body) for name, body in sections.items() if body}
+    # Allow for the section labels themselves
+    budget = max(token_budget - 4 * len(sizes), 0)
+
+    allocation = {name: min(size, int(budget * SECTION_FLOOR[name])) for name, size in sizes.items()}
+    remaining = budget - sum(allocation.values())
+    for name in SECTION_PRIORITY:
+        if name in sizes and remaining > 0:
+            extra = min(sizes[name] - allocation[name], remaining)
+            allocation[name] += extra
+            remaining -= extra
+
+    parts = []
+    for name in SECTION_PRIORITY:
+        if allocation.get(name):
+            body = _truncate(sections[name], allocation[name])
+            if body:
+                parts.append(f"{name.upper()}:\n{body}")
+    return "\n\n".join(parts)
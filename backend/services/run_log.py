@@ -0,0 +1,76 @@
+import hashlib
+import logging
+import zlib
+from typing import Any, Dict, Iterator, Optional
+
+import orjson
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import ScreeningRun
+
+logger = logging.getLogger(__name__)
+
+# Ollama reports durations in nanoseconds
+_NS_PER_MS = 1_000_000
+
+
+def compress(text: Optional[str]) -> Optional[bytes]:
+    return zlib.compress(text.encode("utf-8"), 6) if text is not None else None
+
+
+def decompress(data: Optional[bytes]) -> Optional[str]:
+    return zlib.decompress(data).decode("utf-8") if data is not None else None
+
+
+def _ms(response: Dict[str, Any], key: str) -> Optional[float]:
+    value = response.get(key)
+    return value / _NS_PER_MS if value is not None else None
+
+
+def record_run(model: str, prompt_version: str, prompt: str, options: Dict[str, Any],
+               response: Optional[Dict[str, Any]], raw_output: Optional[str], error: Optional[str],
+               wall_ms: float, candidate_id: Optional[int] = None):
+    """Append one screening call to the run log.
+
+    Uses its own short-lived session so a failing log write never affects
+    the screening itself.
+    """
+    response = response or {}
+    run = ScreeningRun(
+        candidate_id=candidate_id,
+        model=model,
+        prompt_version=prompt_version,
+        prompt_hash=hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        options=orjson.dumps(options).decode(),
+        prompt=compress(prompt),
+        raw_output=compress(raw_output),
+        error=error,
+        prompt_tokens=response.get("prompt_eval_count"),
+        completion_tokens=response.get("eval_count"),
+        total_ms=_ms(response, "total_duration"),
+        load_ms=_ms(response, "load_duration"),
+        prompt_eval_ms=_ms(response, "prompt_eval_duration"),
+        eval_ms=_ms(response, "eval_duration"),
+        wall_ms=wall_ms
+    )
+    db = SessionLocal()
+    try:
+        db.add(run)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Could not record screening run: {e}")
+    finally:
+        db.close()
+
+
+def iter_runs(db: Session, since_id: int = 0, model: Optional[str] = None,
+              candidate_id: Optional[int] = None, batch_size: int = 1000) -> Iterator[ScreeningRun]:
+    """Stream logged runs in id order without loading them all at once"""
+    query = db.query(ScreeningRun).filter(ScreeningRun.id > since_id)
+    if model:
+        query = query.filter(ScreeningRun.model == model)
+    if candidate_id is not None:
+        query = query.filter(ScreeningRun.candidate_id == candidate_id)
+    return query.order_by(ScreeningRun.id).yield_per(batch_size)
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func, or_, update
+from sqlalchemy.orm import Session
+
+from models import Candidate, JobProfile, next_change_seq
+
+# Statuses that have no sub-scores to combine yet (or won't get any)
+UNSCORED_STATUSES = ("PROCESSING", "ERROR")
+
+
+@dataclass(frozen=True)
+class ScoringPolicy:
+    skills_weight: float = 0.4
+    experience_weight: float = 0.3
+    education_weight: float = 0.3
+    select_threshold: float = 70
+
+    @classmethod
+    def from_profile(cls, profile: Optional[JobProfile]) -> "ScoringPolicy":
+        if profile is None:
+            return cls()
+        return cls(profile.skills_weight, profile.experience_weight,
+                   profile.education_weight, profile.select_threshold)
+
+    def weights(self) -> List[float]:
+        """Weights normalised to sum to 1"""
+        raw = [self.skills_weight, self.experience_weight, self.education_weight]
+        total = sum(raw)
+        return [w / total for w in raw]
+
+
+def validate_policy(policy: ScoringPolicy) -> Optional[str]:
+    """Error message for an unusable policy, None if it is fine"""
+    weights = [policy.skills_weight, policy.experience_weight, policy.education_weight]
+    if any(w < 0 for w in weights) or sum(weights) <= 0:
+        return "Weights must be non-negative and not all zero"
+    if not 0 <= policy.select_threshold <= 100:
+        return "Threshold must be between 0 and 100"
+    return None
+
+
+def policy_for_job(db: Session, job_hash: Optional[str]) -> ScoringPolicy:
+    """Profile for a job description, else the default profile, else built-in weights"""
+    profile = None
+    if job_hash:
+        profile = db.query(JobProfile).filter(JobProfile.job_hash == job_hash).first()
+    if profile is None:
+        profile = db.query(JobProfile).filter(JobProfile.job_hash.is_(None)).first()
+    return ScoringPolicy.from_profile(profile)
+
+
+def overall_score(skills: float, experience: float, education: float, policy: ScoringPolicy) -> float:
+    w_skills, w_experience, w_education = policy.weights()
+    return round((skills or 0) * w_skills + (experience or 0) * w_experience + (education or 0) * w_education, 1)
+
+
+def recommendation(score: float, policy: ScoringPolicy) -> str:
+    return "SELECT" if score >= policy.select_threshold else "REJECT"
+
+
+def _rescore_statement(policy: ScoringPolicy, change_seq: int, *criteria):
+    # Same arithmetic as overall_score(), evaluated by the database for
+    # every matching row in a single UPDATE
+    w_skills, w_experience, w_education = policy.weights()
+    score = func.round(
+        func.coalesce(Candidate.skills_score, 0) * w_skills
+        + func.coalesce(Candidate.experience_score, 0) * w_experience
+        + func.coalesce(Candidate.education_score, 0) * w_education,
+        1
+    )
+    verdict = case((score >= policy.select_threshold, "SELECT"), else_="REJECT")
+    return (
+        update(Candidate)
+        .where(
+            Candidate.recommendation.notin_(UNSCORED_STATUSES), *criteria,
+            # Only rows whose result changes are written
+            or_(Candidate.overall_score.is_(None), Candidate.overall_score != score,
+                Candidate.recommendation != verdict)
+        )
+        .values(overall_score=score, recommendation=verdict, change_seq=change_seq)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rescore(db: Session, profile: Optional[JobProfile] = None) -> Dict[str, int]:
+    """Recompute overall scores and recommendations from stored sub-scores.
+
+    With a job profile only its candidates are rescored; otherwise every
+    candidate is, each under its own job's profile. No LLM calls: one UPDATE
+    per profile. Returns how many rows changed and the new SELECT count.
+    """
+    profiles = db.query(JobProfile).all()
+    job_profiles = [p for p in profiles if p.job_hash]
+    default = next((p for p in profiles if not p.job_hash), None)
+
+    statements = []
+    change_seq = next_change_seq(db.connection())
+    if profile is None or profile.job_hash:
+        for p in job_profiles:
+            if profile is None or p.id == profile.id:
+                statements.append(_rescore_statement(ScoringPolicy.from_profile(p), change_seq, Candidate.job_hash == p.job_hash))
+    if profile is None or not profile.job_hash:
+        # Candidates without a job-specific profile fall back to the default
+        hashes = [p.job_hash for p in job_profiles]
+        criteria = [or_(Candidate.job_hash.is_(None), Candidate.job_hash.notin_(hashes))] if hashes else []
+        statements.append(_rescore_statement(ScoringPolicy.from_profile(default), change_seq, *criteria))
+
+    rescored = sum(db.execute(statement).rowcount for statement in statements)
+    if rescored:
+        db.commit()
+    else:
+        # Nothing changed: undo the counter bump so cached lists stay valid
+        db.rollback()
+
+    selected = db.query(func.count(Candidate.id)).filter(Candidate.recommendation == "SELECT").scalar()
+    return {"rescored": rescored, "selected": selected}
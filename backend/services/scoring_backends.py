@@ -0,0 +1,320 @@
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import orjson
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Candidate, ResumeDocument
+from .scoring import UNSCORED_STATUSES, ScoringPolicy, overall_score, recommendation
+
+logger = logging.getLogger(__name__)
+
+SUB_SCORES = ("skills_score", "experience_score", "education_score")
+
+# Local model: rows of LLM-scored history needed per job before it is
+# trusted, and how many new rows trigger a retrain
+LOCAL_MODEL_MIN_ROWS = int(os.getenv("LOCAL_MODEL_MIN_ROWS", "50"))
+LOCAL_MODEL_RETRAIN_EVERY = int(os.getenv("LOCAL_MODEL_RETRAIN_EVERY", "50"))
+
+# Router: the local prediction is accepted when its overall score is at
+# least this many points (or twice its cross-validated error, if larger)
+# away from the SELECT threshold. A small share of accepted cases is also
+# sent to the LLM to keep measuring agreement.
+ROUTER_MARGIN = float(os.getenv("ROUTER_MARGIN", "15"))
+ROUTER_SHADOW_RATE = float(os.getenv("ROUTER_SHADOW_RATE", "0.05"))
+
+
+class BackendError(Exception):
+    """A scoring backend could not produce a usable result"""
+
+
+class ScoringBackend:
+    """Produces sub-scores, skills and a reason for one resume"""
+    name = "backend"
+
+    def screen(self, resume_text: str, job_description: str, candidate_id: Optional[int] = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class OllamaBackend(ScoringBackend):
+    """LLM screening through an Ollama model"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.name = f"ollama:{model}"
+
+    def screen(self, resume_text: str, job_description: str, candidate_id: Optional[int] = None) -> Dict[str, Any]:
+        from screener import screen_resume
+
+        result = screen_resume(resume_text, job_description, self.model, candidate_id)
+        if result.get("error"):
+            raise BackendError(result["error"])
+        return result
+
+
+class _JobModel:
+    """Ridge regression from resume TF-IDF to the LLM's sub-scores for one job"""
+
+    def __init__(self, texts: List[str], years: List[float], targets: np.ndarray, skills: List[str]):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.linear_model import Ridge
+        from sklearn.model_selection import cross_val_predict
+
+        self.vectorizer = TfidfVectorizer(max_features=20000, sublinear_tf=True, stop_words="english")
+        features = self._features(self.vectorizer.fit_transform(texts), years)
+        folds = min(5, len(texts))
+        # Out-of-fold residuals estimate how far off a prediction can be
+        predicted = cross_val_predict(Ridge(alpha=1.0), features, targets, cv=folds)
+        self.residuals = targets - predicted
+        self.regressor = Ridge(alpha=1.0).fit(features, targets)
+        self.rows = len(texts)
+
+        vocabulary = sorted(set(skills), key=len, reverse=True)
+        self.skills_re = re.compile(
+            r"(?<!\w)(" + "|".join(re.escape(s) for s in vocabulary) + r")(?!\w)", re.IGNORECASE
+        ) if vocabulary else None
+        self.skill_names = {s.lower(): s for s in vocabulary}
+
+    @staticmethod
+    def _features(tfidf, years):
+        from scipy.sparse import csr_matrix, hstack
+
+        return hstack([tfidf, csr_matrix(np.asarray(years, dtype=np.float64).reshape(-1, 1) / 10)]).tocsr()
+
+    def error(self, policy: ScoringPolicy) -> float:
+        """Cross-validated RMSE of the overall score under a policy"""
+        return float(np.sqrt(np.mean((self.residuals @ np.asarray(policy.weights())) ** 2)))
+
+    def predict(self, resume_text: str, experience_years: float) -> Dict[str, Any]:
+        features = self._features(self.vectorizer.transform([resume_text]), [experience_years])
+        scores = np.clip(self.regressor.predict(features)[0], 0, 100)
+        skills = []
+        if self.skills_re:
+            found = dict.fromkeys(m.lower() for m in self.skills_re.findall(resume_text))
+            skills = [self.skill_names[s] for s in found]
+        result = {name: round(float(score), 1) for name, score in zip(SUB_SCORES, scores)}
+        result["skills"] = skills
+        result["reason"] = "Scored by the local model trained on previous screenings of this job"
+        return result
+
+
+class LocalModelBackend(ScoringBackend):
+    """CPU-only tier: imitates past LLM scores for the same job description.
+
+    One model per job hash, trained on that job's LLM-scored candidates and
+    retrained as more arrive. Needs no server, so it also stands in when
+    every LLM backend is down. The router predicts through model_for(),
+    since it needs the model's error to decide whether to trust it;
+    screen() serves callers of the plain backend interface.
+    """
+    name = "local"
+
+    def __init__(self, session_factory: Callable[[], Session],
+                 min_rows: int = LOCAL_MODEL_MIN_ROWS, retrain_every: int = LOCAL_MODEL_RETRAIN_EVERY):
+        self.session_factory = session_factory
+        self.min_rows = min_rows
+        self.retrain_every = retrain_every
+        self._models: Dict[str, _JobModel] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _training_filter(query, job_hash: str):
+        return query.filter(
+            Candidate.job_hash == job_hash,
+            Candidate.recommendation.notin_(UNSCORED_STATUSES),
+            # Never learn from our own predictions
+            (Candidate.scored_by.is_(None)) | (Candidate.scored_by != LocalModelBackend.name)
+        )
+
+    def _train(self, db: Session, job_hash: str) -> Optional[_JobModel]:
+        rows = self._training_filter(
+            db.query(Candidate.skills_score, Candidate.experience_score, Candidate.education_score,
+                     Candidate.skills, Candidate.experience_years,
+                     func.coalesce(ResumeDocument.text, Candidate.resume_text))
+            .outerjoin(ResumeDocument, ResumeDocument.sha256 == Candidate.content_hash),
+            job_hash
+        ).all()
+        if len(rows) < self.min_rows:
+            return None
+
+        targets = np.array([[r[0] or 0, r[1] or 0, r[2] or 0] for r in rows], dtype=np.float64)
+        skills = []
+        for r in rows:
+            try:
+                skills.extend(s for s in orjson.loads(r[3] or "[]") if isinstance(s, str) and s.strip())
+            except orjson.JSONDecodeError:
+                pass
+        started = time.perf_counter()
+        model = _JobModel([r[5] or "" for r in rows], [r[4] or 0 for r in rows], targets, skills)
+        logger.info(f"Trained local scoring model for job {job_hash[:8]} on {len(rows)} rows "
+                    f"in {time.perf_counter() - started:.2f}s")
+        return model
+
+    def screen(self, resume_text: str, job_description: str, candidate_id: Optional[int] = None) -> Dict[str, Any]:
+        """The job model's prediction, with experience years read from the resume"""
+        from .content_store import text_hash
+        from .field_extractor import extract_fields
+
+        model = self.model_for(text_hash(job_description))
+        if model is None:
+            raise BackendError("Not enough screened candidates for this job to train the local model")
+        result = model.predict(resume_text, extract_fields(resume_text).experience_years)
+        return {**result, "scored_by": self.name}
+
+    def model_for(self, job_hash: Optional[str]) -> Optional[_JobModel]:
+        """Model for a job, (re)training it when enough new history has arrived"""
+        if not job_hash:
+            return None
+        db = self.session_factory()
+        try:
+            available = self._training_filter(db.query(func.count(Candidate.id)), job_hash).scalar()
+            model = self._models.get(job_hash)
+            if model is not None and available - model.rows < self.retrain_every:
+                return model
+            if available < self.min_rows:
+                return None
+            with self._lock:
+                model = self._models.get(job_hash)
+                if model is None or available - model.rows >= self.retrain_every:
+                    model = self._train(db, job_hash)
+                    if model is not None:
+                        self._models[job_hash] = model
+                return model
+        finally:
+            db.close()
+
+
+class TierStats:
+    """Call count, failures and recent latencies for one backend"""
+
+    def __init__(self, window: int = 1000):
+        self.calls = 0
+        self.failures = 0
+        self.latencies = deque(maxlen=window)
+
+    def record(self, seconds: float, ok: bool):
+        self.calls += 1
+        if ok:
+            self.latencies.append(seconds)
+        else:
+            self.failures += 1
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = np.asarray(self.latencies) * 1000
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "latency_ms": {
+                "mean": round(float(latencies.mean()), 1),
+                "p50": round(float(np.percentile(latencies, 50)), 1),
+                "p95": round(float(np.percentile(latencies, 95)), 1),
+            } if latencies.size else None,
+        }
+
+
+class ScreeningRouter:
+    """Sends each resume to the cheapest tier that can score it confidently.
+
+    The local model answers when its prediction is far enough from the
+    SELECT threshold; everything else goes to the LLM backends in order,
+    failing over to the next on error and finally to the local prediction.
+    """
+
+    def __init__(self, local: Optional[LocalModelBackend], llm_backends: List[ScoringBackend],
+                 margin: float = ROUTER_MARGIN, shadow_rate: float = ROUTER_SHADOW_RATE):
+        self.local = local
+        self.llm_backends = llm_backends
+        self.margin = margin
+        self.shadow_rate = shadow_rate
+        self._stats_lock = threading.Lock()
+        self.tiers = {b.name: TierStats() for b in ([local] if local else []) + llm_backends}
+        self.routed = {"local": 0, "llm": 0, "local_fallback": 0, "failed": 0}
+        self.agreement = {"compared": 0, "agreed": 0, "abs_error_sum": 0.0}
+
+    def _timed(self, backend: ScoringBackend, call) -> Optional[Dict[str, Any]]:
+        started = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            if not isinstance(e, BackendError):
+                logger.error(f"Scoring backend {backend.name} failed: {e}")
+            result = None
+        with self._stats_lock:
+            self.tiers[backend.name].record(time.perf_counter() - started, result is not None)
+        return result
+
+    def _compare(self, local_result: Dict[str, Any], llm_result: Dict[str, Any], policy: ScoringPolicy):
+        local_overall = overall_score(*(local_result[s] for s in SUB_SCORES), policy)
+        llm_overall = overall_score(*(llm_result.get(s, 0) for s in SUB_SCORES), policy)
+        with self._stats_lock:
+            self.agreement["compared"] += 1
+            self.agreement["agreed"] += recommendation(local_overall, policy) == recommendation(llm_overall, policy)
+            self.agreement["abs_error_sum"] += abs(local_overall - llm_overall)
+
+    def screen(self, resume_text: str, job_description: str, job_hash: Optional[str] = None,
+               policy: ScoringPolicy = ScoringPolicy(), experience_years: float = 0,
+               candidate_id: Optional[int] = None) -> Dict[str, Any]:
+        """Sub-scores from the chosen tier, with the tier's name under "scored_by" """
+        local_result, confident = None, False
+        model = self.local.model_for(job_hash) if self.local is not None else None
+        if model is not None:
+            local_result = self._timed(self.local, lambda: model.predict(resume_text, experience_years))
+            if local_result is not None:
+                predicted = overall_score(*(local_result[s] for s in SUB_SCORES), policy)
+                margin = max(self.margin, 2 * model.error(policy))
+                confident = abs(predicted - policy.select_threshold) >= margin
+
+        if confident and random.random() >= self.shadow_rate:
+            with self._stats_lock:
+                self.routed["local"] += 1
+            return {**local_result, "scored_by": self.local.name}
+
+        for backend in self.llm_backends:
+            result = self._timed(backend, lambda: backend.screen(resume_text, job_description, candidate_id))
+            if result is not None:
+                if local_result is not None:
+                    self._compare(local_result, result, policy)
+                with self._stats_lock:
+                    self.routed["llm"] += 1
+                return {**result, "scored_by": backend.name}
+
+        if local_result is not None:
+            # Every LLM backend failed: an uncertain local score beats an error
+            with self._stats_lock:
+                self.routed["local_fallback"] += 1
+            return {**local_result, "scored_by": self.local.name}
+
+        with self._stats_lock:
+            self.routed["failed"] += 1
+        return {"error": "All scoring backends failed", "reason": "Processing error: all scoring backends failed"}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            compared = self.agreement["compared"]
+            return {
+                "routed": dict(self.routed),
+                "tiers": {name: tier.summary() for name, tier in self.tiers.items()},
+                "agreement": {
+                    "compared": compared,
+                    "recommendation_agreement": round(self.agreement["agreed"] / compared, 3) if compared else None,
+                    "mean_abs_overall_error": round(self.agreement["abs_error_sum"] / compared, 2) if compared else None,
+                },
+            }
+
+
+def build_router(session_factory: Callable[[], Session]) -> ScreeningRouter:
+    """Router from the environment: SCREENING_MODEL, then SCREENING_FALLBACK_MODELS
+    (comma-separated) as LLM tiers; LOCAL_SCORING=0 disables the local model"""
+    from screener import SCREENING_MODEL
+
+    models = [SCREENING_MODEL] + [m.strip() for m in os.getenv("SCREENING_FALLBACK_MODELS", "").split(",") if m.strip()]
+    local = LocalModelBackend(session_factory) if os.getenv("LOCAL_SCORING", "1") != "0" else None
+    return ScreeningRouter(local, [OllamaBackend(m) for m in dict.fromkeys(models)])
@@ -0,0 +1,146 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Lower value runs first: a single upload someone is waiting on beats bulk
+# imports, which beat re-screening old candidates
+PRIORITIES = {"interactive": 0, "bulk": 1, "rescreen": 2}
+
+SCREENING_WORKERS = int(os.getenv("SCREENING_WORKERS", "2"))
+# By default no single uploader can occupy every worker while others wait, so
+# another user's interactive upload always finds a free slot soon
+SCREENING_PER_USER_LIMIT = int(os.getenv("SCREENING_PER_USER_LIMIT", str(max(1, SCREENING_WORKERS - 1))))
+
+
+class _Job:
+    __slots__ = ("fn", "args", "user", "priority", "tag", "enqueued", "future")
+
+    def __init__(self, fn, args, user, priority, tag):
+        self.fn = fn
+        self.args = args
+        self.user = user
+        self.priority = priority
+        self.tag = tag
+        self.enqueued = time.perf_counter()
+        self.future = Future()
+
+
+class FairScheduler:
+    """Runs screening jobs on a few worker threads in priority and fair-share order.
+
+    Jobs are picked from the highest priority class that has runnable work.
+    Within a class, users share workers by weighted fair queuing: each job
+    gets a virtual finish tag of max(class clock, user's last tag) + 1 /
+    weight, and the smallest tag runs next, so a user with 1,000 queued
+    files and a user with one take turns instead of queuing behind each
+    other. While another user has work waiting, a user never holds more than
+    `per_user_limit` workers; a lone user may use them all.
+    """
+
+    def __init__(self, workers: int = SCREENING_WORKERS, per_user_limit: int = SCREENING_PER_USER_LIMIT,
+                 weights: Optional[Dict[Any, float]] = None, window: int = 1000):
+        self.workers = workers
+        self.per_user_limit = per_user_limit
+        self.weights = weights or {}
+        self._cond = threading.Condition()
+        # priority -> user -> queued jobs
+        self._queues: Dict[int, Dict[Any, Deque[_Job]]] = defaultdict(lambda: defaultdict(deque))
+        self._clock: Dict[int, float] = defaultdict(float)
+        self._last_tag: Dict[Tuple[int, Any], float] = {}
+        self._running: Dict[Any, int] = defaultdict(int)
+        self._waits = {name: deque(maxlen=window) for name in PRIORITIES}
+        self._completed = {name: 0 for name in PRIORITIES}
+        self._failed = 0
+        self._threads = [
+            threading.Thread(target=self._work, name=f"screening-{i}", daemon=True) for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable, *args, user: Any = None, priority: str = "bulk") -> Future:
+        """Queue fn(*args) for `user` in a priority class; returns a Future"""
+        level = PRIORITIES[priority]
+        with self._cond:
+            start = max(self._clock[level], self._last_tag.get((level, user), 0.0))
+            tag = start + 1.0 / self.weights.get(user, 1.0)
+            self._last_tag[(level, user)] = tag
+            job = _Job(fn, args, user, level, tag)
+            self._queues[level][user].append(job)
+            self._cond.notify()
+        return job.future
+
+    def _next_job(self) -> Optional[_Job]:
+        """Runnable job with the best (priority, tag); caller holds the lock"""
+        # The cap only holds users back for someone it would let run
+        under_cap = {user for queues in self._queues.values() for user, queue in queues.items()
+                     if queue and self._running.get(user, 0) < self.per_user_limit}
+        for level in sorted(self._queues):
+            best = None
+            for user, queue in self._queues[level].items():
+                if queue and (user in under_cap or not under_cap):
+                    if best is None or queue[0].tag < best[0].tag:
+                        best = (queue[0], queue)
+            if best:
+                job, queue = best
+                queue.popleft()
+                if not queue:
+                    del self._queues[level][job.user]
+                self._clock[level] = job.tag
+                return job
+        return None
+
+    def _work(self):
+        names = {level: name for name, level in PRIORITIES.items()}
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next_job()
+                self._running[job.user] += 1
+                self._waits[names[job.priority]].append(time.perf_counter() - job.enqueued)
+
+            try:
+                job.future.set_result(job.fn(*job.args))
+            except Exception as e:
+                logger.error(f"Screening job failed: {e}")
+                self._failed += 1
+                job.future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._running[job.user] -= 1
+                    if not self._running[job.user]:
+                        del self._running[job.user]
+                    self._completed[names[job.priority]] += 1
+                    # A freed per-user slot may unblock a queued job
+                    self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            queued = {name: sum(len(q) for q in self._queues[level].values()) for name, level in PRIORITIES.items()}
+            waits = {name: np.asarray(values) * 1000 for name, values in self._waits.items()}
+            return {
+                "workers": self.workers,
+                "per_user_limit": self.per_user_limit,
+                "queued": queued,
+                "running": {str(user): count for user, count in self._running.items()},
+                "completed": dict(self._completed),
+                "failed": self._failed,
+                "queue_wait_ms": {
+                    name: {
+                        "p50": round(float(np.percentile(w, 50)), 1),
+                        "p95": round(float(np.percentile(w, 95)), 1),
+                        "p99": round(float(np.percentile(w, 99)), 1),
+                        "max": round(float(w.max()), 1),
+                    } if w.size else None
+                    for name, w in waits.items()
+                },
+            }
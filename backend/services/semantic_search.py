@@ -1,146 +1,291 @@
 import numpy as np
-from typing import List, Dict, Any
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import List, Dict, Any, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
+import threading
 import ollama
-import json
+import orjson
+
+from .index_store import SharedIndexStore
+from .keyword_index import KeywordIndex
+from .search_cache import LRUCache, normalize_query
+
+EMBEDDING_MODEL = 'mistral:latest'
+SEARCH_TYPES = ('keyword', 'semantic', 'hybrid')
+
+# Smoothing constant from the original reciprocal-rank fusion paper
+RRF_K = 60
+
+# Keyword and vector retrieval for one hybrid query run side by side
+_retrieval_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="search")
+
+
+def reciprocal_rank_fusion(ranked_lists: List[List[Dict[str, Any]]], k: int = RRF_K) -> List[Dict[str, Any]]:
+    """Fuse ranked result lists by summing 1 / (k + rank) per candidate.
+
+    Ranks are comparable across retrievers whose raw scores are not (BM25
+    is unbounded, cosine similarity is not), so no score normalisation or
+    hand-tuned weights are needed.
+    """
+    fused = {}
+    for ranked in ranked_lists:
+        for rank, r in enumerate(ranked, start=1):
+            candidate_id = r['candidate'].get('id')
+            entry = fused.setdefault(candidate_id, {'candidate': r['candidate'], 'score': 0.0})
+            entry['score'] += 1.0 / (k + rank)
+    results = list(fused.values())
+    results.sort(key=lambda x: x['score'], reverse=True)
+    return results
+
+
+def top_k_indices(scores: np.ndarray, limit: int, offset: int = 0,
+                  min_score: Optional[float] = None) -> np.ndarray:
+    """Indices of one page of the highest scores, best first.
+
+    Uses np.argpartition to pick the best offset + limit entries in O(N)
+    and only sorts those, instead of sorting every score.
+    """
+    candidates = np.arange(scores.shape[0])
+    if min_score is not None:
+        candidates = np.flatnonzero(scores >= min_score)
+    subset = scores[candidates]
+
+    wanted = min(offset + limit, subset.shape[0])
+    if wanted <= 0 or limit <= 0:
+        return np.empty(0, dtype=np.int64)
+    if wanted < subset.shape[0]:
+        best = np.argpartition(-subset, wanted - 1)[:wanted]
+    else:
+        best = np.arange(subset.shape[0])
+    ordered = best[np.argsort(-subset[best], kind="stable")]
+    return candidates[ordered[offset:offset + limit]]
+
+
+def _candidate_text(candidate: Dict[str, Any]) -> str:
+    text = f"""
+    {candidate.get('name', '')}
+    {' '.join(candidate.get('skills', []))}
+    {candidate.get('reason', '')}
+    """.lower()
+    return text[:1000]  # Limit text length
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
 
 class SemanticSearch:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
-        self.candidate_vectors = None
+    def __init__(self, index_dir: Optional[str] = None):
+        # Shared by every worker process: the FTS file, the version counter
+        # and the memory-mapped embedding matrices
+        index_dir = index_dir or os.getenv("SEARCH_INDEX_DIR", "search_index")
+        self.store = SharedIndexStore(index_dir)
+        self.keyword_index = KeywordIndex(os.path.join(index_dir, "keywords.db"))
         self.candidates = []
+        self.candidates_by_id = {}
         self.is_fitted = False
-    
-    def prepare_candidates(self, candidates: List[Dict[str, Any]]):
+
+        # Shared index version of the candidates this process holds; part of
+        # every result cache key
+        self.index_version = -1
+        self.query_embeddings = LRUCache(int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024")))
+        self.results = LRUCache(int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "256")))
+
+        # (index_version, candidates, matrix) with one normalised embedding
+        # row per candidate, in self.candidates order
+        self._embedding_state = (-1, [], None)
+        self._embedding_lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        """True when another worker has published a newer candidate set"""
+        return self.store.version() != self.index_version
+
+    def prepare_candidates(self, candidates: List[Dict[str, Any]],
+                           text_loader: Optional[Callable[[List[int]], Dict[int, str]]] = None):
         """Prepare candidate data for search"""
+        # Only new or changed candidates are (re)indexed
+        self.keyword_index.sync(candidates, text_loader)
+
+        fingerprint = hashlib.blake2b(orjson.dumps(candidates), digest_size=16).hexdigest()
+        version = self.store.bump_if_changed(fingerprint)
+        if version != self.index_version:
+            self.results.clear()
+
         self.candidates = candidates
-        
-        # Create searchable text for each candidate
-        search_texts = []
-        for c in candidates:
-            text = f"""
-            Name: {c.get('name', '')}
-            Skills: {' '.join(c.get('skills', []))}
-            Experience: {c.get('experience_years', 0)} years
-            Education: {c.get('education_score', 0)}% match
-            Overall Score: {c.get('overall_score', 0)}%
-            Reason: {c.get('reason', '')}
-            Tags: {' '.join(c.get('tags', []))}
-            """.lower()
-            search_texts.append(text)
-        
-        # Vectorize texts
-        if search_texts:
-            self.candidate_vectors = self.vectorizer.fit_transform(search_texts)
-            self.is_fitted = True
-    
-    def keyword_search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
-        """Traditional keyword-based search"""
+        self.candidates_by_id = {c['id']: c for c in candidates}
+        self.index_version = version
+        self.is_fitted = bool(candidates)
+
+    def search(self, query: str, search_type: str = "hybrid", top_k: int = 10, offset: int = 0,
+               min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Dispatch a search, serving repeats from the result cache.
+
+        `offset`/`top_k` select a page of results and `min_score` drops
+        results scoring below it, in the chosen search type's units (BM25
+        for keyword, cosine percent for semantic, fused RRF for hybrid).
+        Results are keyed by the index version, so any change to the
+        candidates invalidates them. Degraded results (embedding backend
+        down) are not cached; a semantic search then falls back to keyword
+        search, still applying `min_score`, now to BM25 scores.
+        """
+        if search_type not in SEARCH_TYPES:
+            search_type = "hybrid"
+        key = (normalize_query(query), search_type, top_k, offset, min_score, self.index_version)
+        cached = self.results.get(key)
+        if cached is not None:
+            return cached
+
+        degraded = False
+        if search_type == "keyword":
+            results = self.keyword_search(query, top_k, offset, min_score)
+        elif search_type == "semantic":
+            try:
+                results = self._vector_search(query, top_k, offset, min_score)
+            except Exception as e:
+                print(f"Error in semantic search: {e}")
+                results, degraded = self.keyword_search(query, top_k, offset, min_score), True
+        else:
+            results, degraded = self._hybrid(query, top_k, offset, min_score)
+
+        if not degraded and key[-1] == self.index_version:
+            self.results.put(key, results)
+        return results
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {
+            "index_version": self.index_version,
+            "shared_index_version": self.store.version(),
+            "pid": os.getpid(),
+            "query_embeddings": self.query_embeddings.stats(),
+            "results": self.results.stats(),
+        }
+
+    def keyword_search(self, query: str, top_k: int = 10, offset: int = 0,
+                       min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """BM25 keyword search over name, skills, tags, reason and resume text"""
         if not self.is_fitted or not self.candidates:
             return []
-        
-        query_vector = self.vectorizer.transform([query.lower()])
-        similarities = cosine_similarity(query_vector, self.candidate_vectors).flatten()
-        
-        # Get top k results
-        top_indices = similarities.argsort()[-top_k:][::-1]
-        
+
         results = []
-        for idx in top_indices:
-            if similarities[idx] > 0:
+        for candidate_id, score in self.keyword_index.search(query, top_k, offset, min_score):
+            candidate = self.candidates_by_id.get(candidate_id)
+            if candidate is not None:
                 results.append({
-                    'candidate': self.candidates[idx],
-                    'score': float(similarities[idx] * 100)
+                    'candidate': candidate,
+                    'score': float(score)
                 })
-        
+
         return results
-    
-    def semantic_search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
-        """AI-powered semantic search using embeddings"""
+
+    def _embed(self, text: str) -> List[float]:
+        response = ollama.embeddings(
+            model=EMBEDDING_MODEL,
+            prompt=text
+        )
+        return response['embedding']
+
+    def _embed_query(self, query: str) -> List[float]:
+        """Query embedding, cached by (model, normalized query)"""
+        normalized = normalize_query(query)
+        key = (EMBEDDING_MODEL, normalized)
+        embedding = self.query_embeddings.get(key)
+        if embedding is None:
+            embedding = self._embed(normalized)
+            self.query_embeddings.put(key, embedding)
+        return embedding
+
+    def _build_matrix(self, candidates: List[Dict[str, Any]], keys: np.ndarray) -> np.ndarray:
+        """Embedding matrix for `candidates`, reusing rows of the last published matrix"""
+        previous = {}
+        latest = self.store.latest_matrix()
+        if latest is not None:
+            previous = {key: row for row, key in enumerate(latest[0].tolist())}
+
+        vectors = []
+        for candidate, key in zip(candidates, keys.tolist()):
+            row = previous.get(key)
+            if row is not None:
+                vector = np.asarray(latest[1][row], dtype=np.float32)
+            else:
+                vector = np.asarray(self._embed(_candidate_text(candidate)), dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                vector = vector / norm if norm else vector
+            vectors.append(vector)
+        return np.vstack(vectors)
+
+    def _embedding_matrix(self):
+        """(candidates, matrix) for the current index version.
+
+        The first worker to need a version builds and publishes the matrix
+        under the store's matrix lock; every other worker memory-maps that
+        file. Version bumps take a different lock, so listing candidates
+        never waits for embeddings.
+        """
+        state = self._embedding_state
+        if state[0] == self.index_version:
+            return state[1], state[2]
+
+        with self._embedding_lock:
+            version, candidates = self.index_version, self.candidates
+            if self._embedding_state[0] == version:
+                return self._embedding_state[1], self._embedding_state[2]
+            if not candidates:
+                self._embedding_state = (version, candidates, None)
+                return candidates, None
+
+            keys = np.array([_text_key(_candidate_text(c)) for c in candidates], dtype="S16")
+            published = self.store.load_matrix(version)
+            if published is None or not np.array_equal(published[0], keys):
+                with self.store.matrix_lock():
+                    published = self.store.load_matrix(version)
+                    if published is None or not np.array_equal(published[0], keys):
+                        self.store.publish_matrix(version, keys, self._build_matrix(candidates, keys))
+                        published = self.store.load_matrix(version)
+
+            self._embedding_state = (version, candidates, published[1])
+            return candidates, published[1]
+
+    def _vector_search(self, query: str, top_k: int, offset: int = 0,
+                       min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        candidates, matrix = self._embedding_matrix()
+        if matrix is None:
+            return []
+
+        query_embedding = np.asarray(self._embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(query_embedding)
+        if not norm:
+            return []
+
+        # Cosine similarity of every candidate in one matrix-vector product
+        scores = matrix @ (query_embedding / norm) * 100
+        return [{
+            'candidate': candidates[i],
+            'score': float(scores[i])
+        } for i in top_k_indices(scores, top_k, offset, min_score)]
+
+    def _hybrid(self, query: str, top_k: int, offset: int = 0, min_score: Optional[float] = None):
+        depth = max((offset + top_k) * 5, 50)
+        keyword_future = _retrieval_pool.submit(self.keyword_search, query, depth)
+        vector_future = _retrieval_pool.submit(self._vector_search, query, depth)
+
+        keyword_results = keyword_future.result()
+        degraded = False
         try:
-            # Use Ollama to generate query embedding
-            response = ollama.embeddings(
-                model='mistral:latest',
-                prompt=query
-            )
-            query_embedding = response['embedding']
-            
-            # Generate embeddings for candidates (simplified - in production use batch processing)
-            results = []
-            for candidate in self.candidates:
-                candidate_text = f"""
-                {candidate.get('name', '')} 
-                {' '.join(candidate.get('skills', []))} 
-                {candidate.get('reason', '')}
-                """.lower()
-                
-                emb_response = ollama.embeddings(
-                    model='mistral:latest',
-                    prompt=candidate_text[:1000]  # Limit text length
-                )
-                candidate_embedding = emb_response['embedding']
-                
-                # Calculate cosine similarity
-                similarity = np.dot(query_embedding, candidate_embedding) / (
-                    np.linalg.norm(query_embedding) * np.linalg.norm(candidate_embedding)
-                )
-                
-                results.append({
-                    'candidate': candidate,
-                    'score': float(similarity * 100)
-                })
-            
-            # Sort by similarity
-            results.sort(key=lambda x: x['score'], reverse=True)
-            return results[:top_k]
-            
+            semantic_results = vector_future.result()
         except Exception as e:
             print(f"Error in semantic search: {e}")
-            return self.keyword_search(query, top_k)
-    
-    def hybrid_search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
-        """Combine keyword and semantic search"""
-        keyword_results = self.keyword_search(query, top_k * 2)
-        semantic_results = self.semantic_search(query, top_k * 2)
-        
-        # Combine and deduplicate
-        combined = {}
-        
-        for r in keyword_results:
-            candidate_id = r['candidate'].get('id')
-            combined[candidate_id] = {
-                'candidate': r['candidate'],
-                'keyword_score': r['score'],
-                'semantic_score': 0,
-                'final_score': r['score'] * 0.3  # 30% weight for keyword
-            }
-        
-        for r in semantic_results:
-            candidate_id = r['candidate'].get('id')
-            if candidate_id in combined:
-                combined[candidate_id]['semantic_score'] = r['score']
-                combined[candidate_id]['final_score'] += r['score'] * 0.7  # 70% weight for semantic
-            else:
-                combined[candidate_id] = {
-                    'candidate': r['candidate'],
-                    'keyword_score': 0,
-                    'semantic_score': r['score'],
-                    'final_score': r['score'] * 0.7
-                }
-        
-        # Sort by final score
-        results = list(combined.values())
-        results.sort(key=lambda x: x['final_score'], reverse=True)
-        
+            semantic_results, degraded = [], True
+
+        keyword_scores = {r['candidate'].get('id'): r['score'] for r in keyword_results}
+        semantic_scores = {r['candidate'].get('id'): r['score'] for r in semantic_results}
+        fused = reciprocal_rank_fusion([keyword_results, semantic_results])
+        if min_score is not None:
+            fused = [r for r in fused if r['score'] >= min_score]
+
         return [{
             'candidate': r['candidate'],
-            'score': r['final_score'],
-            'keyword_score': r['keyword_score'],
-            'semantic_score': r['semantic_score']
-        } for r in results[:top_k]]
\ No newline at end of file
+            'score': r['score'],
+            'keyword_score': keyword_scores.get(r['candidate'].get('id'), 0),
+            'semantic_score': semantic_scores.get(r['candidate'].get('id'), 0)
+        } for r in fused[offset:offset + top_k]], degraded
@@ -0,0 +1,184 @@
+import hashlib
+import re
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from models import Candidate, CandidateNeighbor, CandidateVector, ResumeDocument
+from .semantic_search import top_k_indices
+
+SIMILARITY_DIM = 512
+SKILL_WEIGHT = 3.0  # a listed skill counts as much as three mentions in the text
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+
+
+def _bucket(token: str) -> Tuple[int, float]:
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % SIMILARITY_DIM, 1.0 if value >> 63 else -1.0
+
+
+def vectorize(skills: List[str], text: str) -> np.ndarray:
+    """Signed feature-hashing vector of skills and resume words, L2-normalised.
+
+    Needs no model or fitted vocabulary, so a candidate's vector never
+    changes when others are added.
+    """
+    vector = np.zeros(SIMILARITY_DIM, dtype=np.float32)
+    counts: Dict[str, float] = {}
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        counts[token] = counts.get(token, 0.0) + 1.0
+    for skill in skills or []:
+        key = skill.strip().lower()
+        if key:
+            counts[key] = counts.get(key, 0.0) + SKILL_WEIGHT
+    for token, count in counts.items():
+        index, sign = _bucket(token)
+        vector[index] += sign * (1.0 + np.log(count))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SimilarityGraph:
+    """k-nearest-neighbour graph between candidates, kept in candidate_neighbors.
+
+    Adding a candidate scores it against every stored vector with one
+    matrix-vector product, stores its k best neighbours, and offers it to
+    each of those as a reverse edge if it beats their current k-th. Lookups
+    are then a primary-key range scan of k rows.
+    """
+
+    def __init__(self, k: int, capacity: int = 1024):
+        self.k = k
+        self.size = 0
+        # Preallocated and doubled when full, so adding a row is O(1) amortised
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._matrix = np.zeros((capacity, SIMILARITY_DIM), dtype=np.float32)
+        self._row_of: Dict[int, int] = {}
+        self._last_row_id = 0
+        self._lock = threading.Lock()
+
+    def _grow(self, needed: int):
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:self.size] = self._ids[:self.size]
+        matrix = np.zeros((capacity, SIMILARITY_DIM), dtype=np.float32)
+        matrix[:self.size] = self._matrix[:self.size]
+        self._ids, self._matrix = ids, matrix
+
+    def _sync(self, db: Session):
+        """Load vectors written since the last sync (by any worker)"""
+        rows = db.execute(
+            select(CandidateVector.id, CandidateVector.candidate_id, CandidateVector.vector)
+            .where(CandidateVector.id > self._last_row_id).order_by(CandidateVector.id)
+        ).all()
+        if not rows:
+            return
+        self._grow(self.size + len(rows))
+        for row_id, candidate_id, blob in rows:
+            row = self._row_of.get(candidate_id)
+            if row is None:
+                row = self._row_of[candidate_id] = self.size
+                self._ids[row] = candidate_id
+                self.size += 1
+            self._matrix[row] = np.frombuffer(blob, dtype=np.float32)
+            self._last_row_id = row_id
+
+    def _store_vector(self, db: Session, candidate_id: int, vector: np.ndarray):
+        db.execute(delete(CandidateVector).where(CandidateVector.candidate_id == candidate_id))
+        db.add(CandidateVector(candidate_id=candidate_id, vector=vector.astype(np.float32).tobytes()))
+        db.flush()
+
+    def _forward_edges(self, candidate_id: int) -> List[Tuple[int, float]]:
+        """A candidate's k best (neighbour id, score) pairs from the loaded vectors"""
+        matrix = self._matrix[:self.size]
+        row = self._row_of[candidate_id]
+        scores = matrix @ matrix[row]
+        scores[row] = -np.inf
+        best = top_k_indices(scores, self.k)
+        return [(int(self._ids[i]), float(scores[i])) for i in best if np.isfinite(scores[i])]
+
+    def _write_edges(self, db: Session, candidate_id: int, edges: List[Tuple[int, float]]):
+        db.execute(delete(CandidateNeighbor).where(CandidateNeighbor.candidate_id == candidate_id))
+        if edges:
+            db.execute(insert(CandidateNeighbor), [
+                {"candidate_id": candidate_id, "neighbor_id": n, "score": s} for n, s in edges
+            ])
+
+    def _link(self, db: Session, candidate_id: int):
+        """Recompute one candidate's neighbours and offer it to theirs"""
+        edges = self._forward_edges(candidate_id)
+        self._write_edges(db, candidate_id, edges)
+
+        # Edges pointing at the candidate carry scores of its previous vector
+        previous_owners = set(db.scalars(
+            select(CandidateNeighbor.candidate_id).where(CandidateNeighbor.neighbor_id == candidate_id)
+        ))
+        db.execute(delete(CandidateNeighbor).where(CandidateNeighbor.neighbor_id == candidate_id))
+
+        # Reverse edges: neighbours keep only their k best
+        scores_by_neighbor = dict(edges)
+        existing: Dict[int, List[Tuple[float, int]]] = {n: [] for n in scores_by_neighbor}
+        if scores_by_neighbor:
+            for owner, neighbor, score in db.execute(
+                select(CandidateNeighbor.candidate_id, CandidateNeighbor.neighbor_id, CandidateNeighbor.score)
+                .where(CandidateNeighbor.candidate_id.in_(list(scores_by_neighbor)))
+            ):
+                existing[owner].append((score, neighbor))
+
+        for owner, current in existing.items():
+            current.sort(reverse=True)
+            if len(current) >= self.k and current[self.k - 1][0] >= scores_by_neighbor[owner]:
+                continue
+            db.execute(insert(CandidateNeighbor), [
+                {"candidate_id": owner, "neighbor_id": candidate_id, "score": scores_by_neighbor[owner]}
+            ])
+            for _, dropped in current[self.k - 1:]:
+                db.execute(delete(CandidateNeighbor).where(
+                    CandidateNeighbor.candidate_id == owner, CandidateNeighbor.neighbor_id == dropped))
+
+        # Candidates that lost it as a neighbour refill their list from scratch
+        for owner in previous_owners - set(scores_by_neighbor):
+            if owner in self._row_of:
+                self._write_edges(db, owner, self._forward_edges(owner))
+
+    def add(self, db: Session, candidate_id: int, skills: List[str], text: str):
+        """Insert or refresh a candidate in the graph (commits)"""
+        with self._lock:
+            self._store_vector(db, candidate_id, vectorize(skills, text))
+            self._sync(db)
+            self._link(db, candidate_id)
+            db.commit()
+
+    def backfill(self, db: Session, batch_size: int = 500) -> int:
+        """Add every candidate that has no vector yet; returns how many"""
+        from schemas import decode_json_lists
+
+        added = 0
+        while True:
+            rows = db.execute(
+                select(Candidate.id, Candidate.skills, func.coalesce(ResumeDocument.text, Candidate.resume_text))
+                .outerjoin(ResumeDocument, ResumeDocument.sha256 == Candidate.content_hash)
+                .outerjoin(CandidateVector, CandidateVector.candidate_id == Candidate.id)
+                .where(CandidateVector.id.is_(None))
+                .order_by(Candidate.id).limit(batch_size)
+            ).all()
+            if not rows:
+                return added
+            skills = decode_json_lists([r[1] for r in rows])
+            with self._lock:
+                for (candidate_id, _, text), row_skills in zip(rows, skills):
+                    self._store_vector(db, candidate_id, vectorize(row_skills, text))
+                self._sync(db)
+                for candidate_id, _, _ in rows:
+                    self._link(db, candidate_id)
+                db.commit()
+            added += len(rows)
@@ -0,0 +1,268 @@
+import gzip
+import logging
+import os
+import shutil
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from models import ResumeDocument
+from .content_store import StoredFile, content_key, spool
+
+logger = logging.getLogger(__name__)
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local")  # local | s3
+S3_BUCKET = os.getenv("S3_BUCKET", "")
+S3_PREFIX = os.getenv("S3_PREFIX", "resumes/")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")  # e.g. http://localhost:9000 for MinIO
+# Gzip local originals not modified for this many days (0 = never)
+STORAGE_COMPRESS_AFTER_DAYS = int(os.getenv("STORAGE_COMPRESS_AFTER_DAYS", "7"))
+# Delete originals whose text is extracted after this many days (0 = keep forever)
+STORAGE_DROP_ORIGINALS_AFTER_DAYS = int(os.getenv("STORAGE_DROP_ORIGINALS_AFTER_DAYS", "0"))
+
+GZIP_SUFFIX = ".gz"
+# Formats that are already compressed; gzip would gain nothing
+INCOMPRESSIBLE = {".docx", ".zip", ".gz", ".png", ".jpg", ".jpeg"}
+
+
+class StorageBackend(ABC):
+    """Content-addressed store for uploaded originals.
+
+    Objects are keyed by content_key (sha256 + extension), so each distinct
+    file is stored once. Extractors need a file on disk; `local_path`
+    provides one for as long as the context is open.
+    """
+
+    @abstractmethod
+    def save_stream(self, stream: BinaryIO, filename: str) -> StoredFile:
+        """Store an upload, hashing while streaming"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """Readable stream of the original bytes"""
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        """Path to a temporary local copy of an object"""
+        extension = os.path.splitext(key)[1]
+        fd, path = tempfile.mkstemp(suffix=extension)
+        try:
+            with os.fdopen(fd, "wb") as out, self.open(key) as source:
+                shutil.copyfileobj(source, out)
+            yield path
+        finally:
+            os.remove(path)
+
+    def compress_cold(self, older_than: timedelta) -> int:
+        """Compress originals untouched for `older_than`; returns how many"""
+        return 0
+
+
+class LocalStorage(StorageBackend):
+    """Originals under <root>/ab/cd/<sha256><ext>, gzipped once cold.
+
+    Reads are transparent: an object is either the plain file or the same
+    path with a .gz suffix.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def save_stream(self, stream: BinaryIO, filename: str) -> StoredFile:
+        """Write to a temporary file in the same tree, then rename into place
+        once the hash is known; content already stored is not written twice"""
+        extension = os.path.splitext(filename or "")[1].lower()
+        sha256, size, tmp_path = spool(stream, os.path.join(self.root, "tmp"))
+        key = content_key(sha256, extension)
+        if self.exists(key):
+            os.remove(tmp_path)
+            return StoredFile(sha256, key, size, extension, already_stored=True)
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+        return StoredFile(sha256, key, size, extension, already_stored=False)
+
+    def exists(self, key: str) -> bool:
+        path = self._path(key)
+        return os.path.exists(path) or os.path.exists(path + GZIP_SUFFIX)
+
+    def open(self, key: str) -> BinaryIO:
+        path = self._path(key)
+        try:
+            return open(path, "rb")
+        except FileNotFoundError:
+            return gzip.open(path + GZIP_SUFFIX, "rb")
+
+    def delete(self, key: str):
+        path = self._path(key)
+        for candidate in (path, path + GZIP_SUFFIX):
+            if os.path.exists(candidate):
+                os.remove(candidate)
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        path = self._path(key)
+        if os.path.exists(path):
+            yield path
+            return
+        with super().local_path(key) as tmp_path:
+            yield tmp_path
+
+    def _objects(self) -> Iterator[str]:
+        """Paths of stored objects; skips tmp/, partial uploads and legacy flat files"""
+        for first in os.scandir(self.root):
+            if not (first.is_dir() and len(first.name) == 2):
+                continue
+            for second in os.scandir(first.path):
+                if second.is_dir():
+                    for entry in os.scandir(second.path):
+                        if entry.is_file():
+                            yield entry.path
+
+    def compress_cold(self, older_than: timedelta) -> int:
+        if not os.path.isdir(self.root):
+            return 0
+        cutoff = time.time() - older_than.total_seconds()
+        compressed = 0
+        for path in self._objects():
+            extension = os.path.splitext(path)[1].lower()
+            try:
+                if extension in INCOMPRESSIBLE or path.endswith(".tmp") or os.path.getmtime(path) > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            if self._compress(path):
+                compressed += 1
+        return compressed
+
+    @staticmethod
+    def _compress(path: str) -> bool:
+        """Replace a file with its .gz; False if it vanished meanwhile
+        (deleted, or compressed by another process)"""
+        # A unique name in the same directory, so the rename is atomic and
+        # two processes compressing at once never share a temporary file
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with open(path, "rb") as source, gzip.GzipFile(fileobj=raw, mode="wb") as out:
+                    shutil.copyfileobj(source, out)
+            os.replace(tmp_path, path + GZIP_SUFFIX)
+        except FileNotFoundError:
+            os.remove(tmp_path)
+            return False
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return True
+
+
+class S3Storage(StorageBackend):
+    """Originals in an S3-compatible bucket (AWS, MinIO, ...).
+
+    Needs the optional boto3 package. Credentials come from the usual
+    AWS environment variables or config files. Tiering to colder storage
+    classes is left to the bucket's lifecycle rules.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None,
+                 tmp_dir: Optional[str] = None):
+        import boto3
+
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.bucket = bucket
+        self.prefix = prefix
+        self.tmp_dir = tmp_dir or tempfile.gettempdir()
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def save_stream(self, stream: BinaryIO, filename: str) -> StoredFile:
+        """Spool to a local temporary file to learn the hash, then upload
+        unless the bucket already has the object"""
+        extension = os.path.splitext(filename or "")[1].lower()
+        sha256, size, tmp_path = spool(stream, self.tmp_dir)
+        try:
+            key = content_key(sha256, extension)
+            if self.exists(key):
+                return StoredFile(sha256, key, size, extension, already_stored=True)
+            self.client.upload_file(tmp_path, self.bucket, self._key(key))
+            return StoredFile(sha256, key, size, extension, already_stored=False)
+        finally:
+            os.remove(tmp_path)
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"]
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+
+def create_storage(root: str) -> StorageBackend:
+    """The backend selected by STORAGE_BACKEND; `root` is the local directory"""
+    if STORAGE_BACKEND == "s3":
+        if not S3_BUCKET:
+            raise ValueError("STORAGE_BACKEND=s3 needs S3_BUCKET")
+        return S3Storage(S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL, tmp_dir=os.path.join(root, "tmp"))
+    if STORAGE_BACKEND != "local":
+        raise ValueError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND}")
+    return LocalStorage(root)
+
+
+def apply_retention(db: Session, storage: StorageBackend,
+                    compress_after_days: int = STORAGE_COMPRESS_AFTER_DAYS,
+                    drop_after_days: int = STORAGE_DROP_ORIGINALS_AFTER_DAYS) -> Dict[str, int]:
+    """Compress cold originals and drop those past retention.
+
+    Only originals whose extracted text is in the database are dropped;
+    their document keeps the text and loses its storage_path. A later
+    upload of the same file stores it again.
+    """
+    compressed = storage.compress_cold(timedelta(days=compress_after_days)) if compress_after_days > 0 else 0
+    dropped = 0
+    if drop_after_days > 0:
+        cutoff = datetime.utcnow() - timedelta(days=drop_after_days)
+        documents = db.query(ResumeDocument).filter(
+            ResumeDocument.storage_path.isnot(None),
+            ResumeDocument.text.isnot(None), ResumeDocument.text != "",
+            ResumeDocument.created_at < cutoff
+        ).all()
+        for document in documents:
+            storage.delete(content_key(document.sha256, document.extension or ""))
+            document.storage_path = None
+            dropped += 1
+        db.commit()
+    if compressed or dropped:
+        logger.info(f"Storage retention: compressed {compressed}, dropped {dropped} originals")
+    return {"compressed": compressed, "dropped": dropped}
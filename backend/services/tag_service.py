@@ -0,0 +1,120 @@
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select, delete, insert, update, exists, literal, func
+from sqlalchemy.orm import Session
+
+from models import Tag, Candidate, candidate_tags, next_change_seq
+
+# Stay well below SQLite's bound-parameter limit for IN (...) lists
+CHUNK_SIZE = 500
+
+
+def _chunks(ids: List[int]):
+    for start in range(0, len(ids), CHUNK_SIZE):
+        yield ids[start:start + CHUNK_SIZE]
+
+
+def _stamp_changed(db: Session, ids: List[int]):
+    """Mark candidates as changed for snapshot and cache readers"""
+    seq = next_change_seq(db.connection())
+    for chunk in _chunks(ids):
+        db.execute(update(Candidate).where(Candidate.id.in_(chunk)).values(change_seq=seq))
+
+
+def normalize_tag(name: str) -> str:
+    """Collapse whitespace so ' Python  dev' and 'Python dev' are the same tag"""
+    return " ".join(name.split())
+
+
+def get_or_create_tag(db: Session, name: str, user_id: Optional[int] = None) -> Tag:
+    """Return the tag with this name, creating it if needed"""
+    tag = db.query(Tag).filter(Tag.name == name).first()
+    if not tag:
+        tag = Tag(name=name, created_by=user_id)
+        db.add(tag)
+        db.flush()
+    return tag
+
+
+def bulk_tag(db: Session, candidate_ids: Iterable[int], tag_name: str,
+             user_id: Optional[int] = None) -> int:
+    """Apply a tag to many candidates with one INSERT ... SELECT per chunk.
+
+    Unknown candidate IDs and existing associations are skipped by the
+    SELECT itself. Returns the number of new associations.
+    """
+    ids = sorted(set(candidate_ids))
+    tag = get_or_create_tag(db, tag_name, user_id)
+
+    added = 0
+    for chunk in _chunks(ids):
+        already_tagged = exists().where(
+            (candidate_tags.c.candidate_id == Candidate.id) &
+            (candidate_tags.c.tag_id == tag.id)
+        )
+        stmt = insert(candidate_tags).from_select(
+            ["candidate_id", "tag_id"],
+            select(Candidate.id, literal(tag.id)).where(
+                Candidate.id.in_(chunk), ~already_tagged
+            )
+        )
+        added += db.execute(stmt).rowcount
+    if added:
+        _stamp_changed(db, ids)
+    db.commit()
+    return added
+
+
+def bulk_untag(db: Session, candidate_ids: Iterable[int], tag_name: str) -> int:
+    """Remove a tag from many candidates. Returns the number of removed associations"""
+    ids = sorted(set(candidate_ids))
+    tag = db.query(Tag).filter(Tag.name == tag_name).first()
+    if not tag:
+        return 0
+
+    removed = 0
+    for chunk in _chunks(ids):
+        stmt = delete(candidate_tags).where(
+            candidate_tags.c.tag_id == tag.id,
+            candidate_tags.c.candidate_id.in_(chunk)
+        )
+        removed += db.execute(stmt).rowcount
+    if removed:
+        _stamp_changed(db, ids)
+    db.commit()
+    return removed
+
+
+def load_tags(db: Session, candidate_ids: Optional[List[int]] = None) -> Dict[int, List[str]]:
+    """Load tag names for many candidates in one batched query.
+
+    With no IDs the whole association table is read at once, which is what
+    list views want instead of one lazy load per row.
+    """
+    stmt = (
+        select(candidate_tags.c.candidate_id, Tag.name)
+        .join(Tag, Tag.id == candidate_tags.c.tag_id)
+        .order_by(candidate_tags.c.candidate_id, Tag.name)
+    )
+
+    tags_by_candidate: Dict[int, List[str]] = {}
+    if candidate_ids is None:
+        batches = [db.execute(stmt)]
+    else:
+        batches = [db.execute(stmt.where(candidate_tags.c.candidate_id.in_(chunk)))
+                   for chunk in _chunks(sorted(set(candidate_ids)))]
+    for rows in batches:
+        for candidate_id, name in rows:
+            tags_by_candidate.setdefault(candidate_id, []).append(name)
+    return tags_by_candidate
+
+
+def list_tags(db: Session) -> List[Dict]:
+    """All tags with their usage counts"""
+    rows = db.execute(
+        select(Tag.id, Tag.name, Tag.color, func.count(candidate_tags.c.candidate_id))
+        .outerjoin(candidate_tags, candidate_tags.c.tag_id == Tag.id)
+        .group_by(Tag.id)
+        .order_by(Tag.name)
+    )
+    return [{"id": tid, "name": name, "color": color, "count": count}
+            for tid, name, color, count in rows]
@@ -0,0 +1,81 @@
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """Runs slow start-up work on a background thread and tracks its progress.
+
+    The server accepts connections immediately; endpoints that need a
+    component load it on first use anyway, and /ready reports when
+    everything has been preloaded.
+    """
+
+    def __init__(self):
+        self.components: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, tasks: List[Tuple[str, Callable[[], None]]]):
+        with self._lock:
+            for name, _ in tasks:
+                self.components[name] = {"status": "pending"}
+        self._thread = threading.Thread(target=self._run, args=(tasks,), name="warmup", daemon=True)
+        self._thread.start()
+
+    def _run(self, tasks):
+        for name, task in tasks:
+            started = time.perf_counter()
+            try:
+                task()
+                status = {"status": "ready"}
+            except Exception as e:
+                logger.error(f"Warm-up of {name} failed: {e}")
+                status = {"status": "failed", "error": str(e)}
+            status["seconds"] = round(time.perf_counter() - started, 3)
+            with self._lock:
+                self.components[name] = status
+
+    def _all_ready(self) -> bool:
+        return bool(self.components) and all(c["status"] == "ready" for c in self.components.values())
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return self._all_ready()
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {"ready": self._all_ready(), "components": dict(self.components)}
+
+
+def one_process_at_a_time(lock_path: str, task: Callable[[], None]) -> Callable[[], None]:
+    """Wrap a warm-up task so only one process on the host runs it at once.
+
+    Every worker of a multi-worker server runs the same warm-up, but
+    backfills and clean-ups write shared rows and files and must not race.
+    The first worker to take the lock file runs the task; workers that
+    find it held skip it, since the holder does the work for everyone.
+    """
+    def run():
+        with open(lock_path, "a+") as handle:
+            if fcntl:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    logger.info(f"Skipping warm-up task, another process holds {lock_path}")
+                    return
+            try:
+                task()
+            finally:
+                if fcntl:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+    return run
@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+# The database, uploads and indexes live at paths relative to the working
+# directory; run against a throwaway directory, never the developer's data
+os.chdir(tempfile.mkdtemp(prefix="resume-screener-tests-"))
+
+from database import Base, SessionLocal, engine  # noqa: E402
+from migrations import init_db  # noqa: E402
+from models import Candidate  # noqa: E402
+
+init_db(engine)
+
+
+@pytest.fixture(autouse=True)
+def _empty_database():
+    """Each test starts from empty tables (the change counters keep counting)"""
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name != "change_counters":
+                connection.execute(table.delete())
+    import main
+    main._candidate_snapshot = None
+    main._similarity_graph = None
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_candidate(db):
+    """Factory for scored candidates; keyword arguments override the defaults"""
+    def make(**fields):
+        values = {"name": "Jane Doe", "email": None, "phone": None, "skills": '["Python"]',
+                  "skills_score": 80, "experience_score": 60, "education_score": 70,
+                  "overall_score": 71.0, "recommendation": "SELECT", "experience_years": 4}
+        values.update(fields)
+        candidate = Candidate(**values)
+        db.add(candidate)
+        db.commit()
+        return candidate
+    return make
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register a user and return headers carrying their bearer token"""
+    form = {"username": "recruiter", "email": "recruiter@example.com", "password": "secret"}
+    client.post("/register", data=form).raise_for_status()
+    response = client.post("/login", data={"username": form["username"], "password": form["password"]})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,41 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from database import engine
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def assert_at_most(self, expected: int):
+        """Fail with the offending statements if more than `expected` ran"""
+        if self.count > expected:
+            listing = "\n".join(self.statements)
+            raise AssertionError(f"Expected at most {expected} queries, got {self.count}:\n{listing}")
+
+
+@contextmanager
+def count_queries(bind=engine):
+    """Count queries run inside the block, e.g. to catch N+1 regressions:
+
+        with count_queries() as counter:
+            client.get("/candidates", headers=headers)
+        counter.assert_at_most(2)
+    """
+    counter = QueryCounter()
+    event.listen(bind, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", counter)
@@ -0,0 +1,79 @@
+from services.tag_service import bulk_tag
+from .query_counter import count_queries
+
+
+def test_candidates_require_a_token(client):
+    assert client.get("/candidates").status_code in (401, 403)
+
+
+def test_candidates_etag_flips_on_change(client, auth_headers, db, make_candidate):
+    candidate = make_candidate(name="Jane Doe")
+    first = client.get("/candidates", headers=auth_headers)
+    assert first.status_code == 200
+    assert [c["name"] for c in first.json()] == ["Jane Doe"]
+    etag = first.headers["etag"]
+    # Identity and compressed bodies share the tag, so it must be weak
+    assert etag.startswith('W/"')
+
+    cached = client.get("/candidates", headers={**auth_headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    # If-None-Match uses weak comparison: the opaque part alone matches too
+    stripped = client.get("/candidates", headers={**auth_headers, "If-None-Match": etag.removeprefix("W/")})
+    assert stripped.status_code == 304
+
+    # Other query parameters are a different representation
+    paged = client.get("/candidates?limit=1", headers={**auth_headers, "If-None-Match": etag})
+    assert paged.status_code == 200
+
+    bulk_tag(db, [candidate.id], "shortlist")
+    changed = client.get("/candidates", headers={**auth_headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()[0]["tags"] == ["shortlist"]
+
+
+def _add_tagged_candidates(db, make_candidate, n):
+    ids = [make_candidate(name=f"Candidate {i}", skills='["Python", "SQL"]').id for i in range(n)]
+    bulk_tag(db, ids, "shortlist")
+    bulk_tag(db, ids[::2], "phone screen")
+
+
+def _count_candidates_queries(client, auth_headers, expected_rows):
+    with count_queries() as counter:
+        response = client.get("/candidates", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == expected_rows
+    assert all("shortlist" in c["tags"] for c in response.json())
+    return counter.count
+
+
+def test_candidates_query_count_does_not_grow_with_rows(client, auth_headers, db, make_candidate):
+    _add_tagged_candidates(db, make_candidate, 3)
+    few = _count_candidates_queries(client, auth_headers, 3)
+    _add_tagged_candidates(db, make_candidate, 60)
+    many = _count_candidates_queries(client, auth_headers, 63)
+    assert many == few
+
+
+def _profile(name, job_description=None, threshold=70):
+    return {"name": name, "job_description": job_description, "skills_weight": 0.4,
+            "experience_weight": 0.3, "education_weight": 0.3, "select_threshold": threshold}
+
+
+def test_job_profiles_match_by_job_not_name(client, auth_headers):
+    default = client.post("/job-profiles", json=_profile("Default"), headers=auth_headers).json()
+    backend = client.post("/job-profiles", json=_profile("Backend", "Python developer"), headers=auth_headers).json()
+    assert default["id"] != backend["id"]
+
+    # Renaming keeps the profile of the same job
+    renamed = client.post("/job-profiles", json=_profile("Backend API", "Python developer", 60), headers=auth_headers)
+    assert renamed.json()["id"] == backend["id"]
+    assert renamed.json()["select_threshold"] == 60
+
+    # A different job may not take over another profile's name
+    clash = client.post("/job-profiles", json=_profile("Backend API", "Go developer"), headers=auth_headers)
+    assert clash.status_code == 409
+    names = sorted(p["name"] for p in client.get("/job-profiles", headers=auth_headers).json())
+    assert names == ["Backend API", "Default"]
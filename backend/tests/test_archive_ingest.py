@@ -0,0 +1,66 @@
+import asyncio
+import io
+import threading
+import zipfile
+
+from services import archive_ingest
+from services.archive_ingest import ArchiveMember, extract_archive, iter_archive_members
+
+RESUMES = {
+    "a.txt": b"Jane Doe\njane@example.com\nPython developer\n",
+    "b.txt": b"John Roe\njohn@example.com\nJava developer\n",
+    "c.txt": b"Ann Poe\nann@example.com\nGo developer\n",
+}
+
+
+def _zip(corrupt: str = None) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for name, data in RESUMES.items():
+            archive.writestr(name, data)
+    raw = buffer.getvalue()
+    if corrupt:
+        # Stored members appear verbatim; flipping a byte breaks the CRC
+        start = raw.index(RESUMES[corrupt])
+        raw = raw[:start] + bytes([raw[start] ^ 0xFF]) + raw[start + 1:]
+    return raw
+
+
+def test_corrupt_member_does_not_abort_the_archive():
+    members = {m.name: m for m in iter_archive_members(io.BytesIO(_zip(corrupt="b.txt")), "export.zip")}
+    assert set(members) == set(RESUMES)
+    assert members["b.txt"].data is None and "Could not read file" in members["b.txt"].error
+    assert members["a.txt"].data == RESUMES["a.txt"] and members["c.txt"].data == RESUMES["c.txt"]
+
+
+def test_archive_endpoint_reports_every_member(client, auth_headers, monkeypatch):
+    import main
+    monkeypatch.setattr(main, "schedule_screening", lambda *args: None)
+    response = client.post("/bulk-upload-archive", headers=auth_headers,
+                           files={"file": ("export.zip", _zip(corrupt="b.txt"), "application/zip")})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total"], body["queued"], body["failed"]) == (3, 2, 1)
+
+
+def test_unreadable_archive_is_refused(client, auth_headers):
+    response = client.post("/bulk-upload-archive", headers=auth_headers,
+                           files={"file": ("export.zip", b"not a zip", "application/zip")})
+    assert response.status_code == 400
+
+
+def test_members_are_decompressed_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def members(fileobj, filename):
+        for name in RESUMES:
+            threads.append(threading.current_thread())
+            yield ArchiveMember(name, error="skipped")
+
+    monkeypatch.setattr(archive_ingest, "iter_archive_members", members)
+
+    async def run():
+        return [m.name async for m in extract_archive(io.BytesIO(), "export.zip")]
+
+    assert asyncio.run(run()) == list(RESUMES)
+    assert threading.main_thread() not in threads
@@ -0,0 +1,81 @@
+from models import IngestionRun, UploadSession
+
+RESUME = b"Jane Doe\njane@example.com\nExperience\nAcme, Jan 2019 - Dec 2021\n"
+
+
+def _start(client, auth_headers, data=RESUME):
+    response = client.post("/uploads", data={"filename": "jane.txt", "length": len(data),
+                                             "job_description": "Python developer"}, headers=auth_headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def _patch(client, auth_headers, upload_id, offset, body):
+    return client.patch(f"/uploads/{upload_id}", content=body,
+                        headers={**auth_headers, "Upload-Offset": str(offset),
+                                 "Content-Type": "application/offset+octet-stream"})
+
+
+def test_upload_in_chunks_is_queued_once(client, auth_headers, monkeypatch):
+    import main
+    scheduled = []
+    monkeypatch.setattr(main, "schedule_screening", lambda *args: scheduled.append(args))
+
+    upload = _start(client, auth_headers)
+    first = _patch(client, auth_headers, upload["upload_id"], 0, RESUME[:10])
+    assert first.json()["status"] == "uploading" and first.json()["offset"] == 10
+
+    # Out of step: the server says where to resume
+    stale = _patch(client, auth_headers, upload["upload_id"], 0, RESUME[:10])
+    assert stale.status_code == 409
+    assert stale.headers["upload-offset"] == "10"
+
+    last = _patch(client, auth_headers, upload["upload_id"], 10, RESUME[10:])
+    assert last.json()["status"] == "queued"
+    assert last.json()["offset"] == len(RESUME)
+
+    # A retried last chunk is refused rather than finalized again
+    retry = _patch(client, auth_headers, upload["upload_id"], 10, RESUME[10:])
+    assert retry.status_code == 409
+    assert len(scheduled) == 1
+
+
+def test_upload_being_finalized_elsewhere_is_not_finalized_again(client, auth_headers, db, monkeypatch):
+    import main
+    finalized = []
+    monkeypatch.setattr(main, "finalize_upload", lambda *args: finalized.append(args))
+
+    upload = _start(client, auth_headers)
+    _patch(client, auth_headers, upload["upload_id"], 0, RESUME[:10])
+
+    # Another request claims the upload between this one's status check and its claim
+    real_append = main.append_chunk
+
+    async def append_then_lose_race(*args):
+        offset = await real_append(*args)
+        db.query(UploadSession).filter(UploadSession.id == upload["upload_id"]).update({"status": "finalizing"})
+        db.commit()
+        return offset
+
+    monkeypatch.setattr(main, "append_chunk", append_then_lose_race)
+    response = _patch(client, auth_headers, upload["upload_id"], 10, RESUME[10:])
+    assert response.json()["status"] == "finalizing"
+    assert response.json()["offset"] == len(RESUME)
+    assert finalized == []
+
+
+def test_chunk_past_declared_length_is_refused(client, auth_headers):
+    upload = _start(client, auth_headers)
+    response = _patch(client, auth_headers, upload["upload_id"], 0, RESUME + b"extra")
+    assert response.status_code == 413
+    status = client.get(f"/uploads/{upload['upload_id']}", headers=auth_headers).json()
+    assert status["status"] == "uploading" and status["offset"] == 0
+
+
+def test_batch_of_another_users_bulk_run_is_not_found(client, auth_headers, db):
+    db.add(IngestionRun(id="someone-elses-run", source="bulk", user_id=-1))
+    db.commit()
+    response = client.post("/uploads", data={"filename": "jane.txt", "length": len(RESUME),
+                                             "batch_id": "someone-elses-run"}, headers=auth_headers)
+    assert response.status_code == 404
+    assert db.query(UploadSession).count() == 0
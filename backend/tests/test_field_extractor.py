@@ -0,0 +1,71 @@
+from datetime import date
+
+import pytest
+
+from services.field_extractor import extract_fields, merge_ranges
+
+TODAY = date(2024, 6, 1)
+
+
+def test_contact_details():
+    text = ("Jane Doe\njane.doe@example.com | +44 20 7946 0958\n"
+            "linkedin.com/in/janedoe  github.com/janedoe\n")
+    fields = extract_fields(text, TODAY)
+    assert fields.name == "Jane Doe"
+    assert fields.email == "jane.doe@example.com"
+    assert fields.phone == "+44 20 7946 0958"
+    assert fields.linkedin_url == "https://linkedin.com/in/janedoe"
+    assert fields.github_url == "https://github.com/janedoe"
+
+
+def test_upper_case_name_is_title_cased():
+    assert extract_fields("JANE DOE\nPython developer", TODAY).name == "Jane Doe"
+
+
+def test_overlapping_jobs_are_counted_once():
+    text = ("Experience\nAcme, Jan 2018 - Dec 2019\nGlobex, Jan 2019 - Dec 2020\n"
+            "Education\nBSc, 2010 - 2014\n")
+    fields = extract_fields(text, TODAY)
+    assert fields.experience_years == 3.0
+
+
+def test_ongoing_job_runs_until_today():
+    fields = extract_fields("Experience\nAcme, Jul 2022 - Present\n", TODAY)
+    assert fields.experience_years == 2.0
+
+
+def test_date_range_is_not_a_phone_number():
+    assert extract_fields("Experience\n2015 - 2019\n", TODAY).phone is None
+
+
+def test_merge_ranges():
+    assert merge_ranges([(5, 10), (0, 3), (3, 6), (20, 30)]) == [(0, 10), (20, 30)]
+
+
+def test_heading_lines_are_not_names():
+    text = "PROFESSIONAL EXPERIENCE\nWork Experience\nSkills Summary\nJane Doe\njane@example.com"
+    assert extract_fields(text, TODAY).name == "Jane Doe"
+    assert extract_fields("Work Experience\nAcme 2019 - 2021", TODAY).name is None
+
+
+def test_same_year_range_counts_part_of_a_year():
+    assert extract_fields("Experience\nAcme, 2019 - 2019\n", TODAY).experience_years == 0.5
+    assert extract_fields("Experience\nAcme, Sep 2019 - 2019\n", TODAY).experience_years == 0.3
+    assert extract_fields("Experience\nAcme, 2016 - 2019\n", TODAY).experience_years == 3.0
+
+
+@pytest.mark.parametrize("phone", [
+    "(415) 555-0100",
+    "415-555-0100",
+    "415.555.0100",
+    "+1 415 555 0100",
+    "+1 (415) 555-0100",
+    "+44 20 7946 0958",
+    "+44 (0)20 7946 0958",
+    "+91 98765 43210",
+    "0049 30 1234567",
+    "+33 1 23 45 67 89",
+])
+def test_phone_formats(phone):
+    text = f"Jane Doe\nPhone: {phone} | jane@example.com\n"
+    assert extract_fields(text, TODAY).phone == phone
@@ -0,0 +1,93 @@
+from models import Candidate, IdentityKey, Person
+from services.identity import identity_keys, normalize_email, normalize_name, resolve_candidate
+
+
+def test_normalisation():
+    assert normalize_email("Jane.Doe+jobs@GMail.com") == "janedoe@gmail.com"
+    assert normalize_email("jane.doe@example.com") == "jane.doe@example.com"
+    assert normalize_name("Doe, JANE") == "doe jane"
+    assert normalize_name("Jane") is None
+
+
+def test_phone_formats_share_a_key():
+    assert identity_keys(None, "+1 (415) 555-0100", None) == identity_keys(None, "415.555.0100", None)
+
+
+def test_same_email_resolves_to_same_person(db, make_candidate):
+    first = make_candidate(email="jane.doe@gmail.com")
+    second = make_candidate(email="JaneDoe+cv@gmail.com")
+    assert resolve_candidate(db, first).id == resolve_candidate(db, second).id
+    db.commit()
+    assert db.query(Person).count() == 1
+
+
+def test_shared_key_merges_persons_into_oldest(db, make_candidate):
+    by_email = make_candidate(email="jane@example.com")
+    by_phone = make_candidate(phone="415 555 0100")
+    oldest = resolve_candidate(db, by_email)
+    newer = resolve_candidate(db, by_phone)
+    db.commit()
+    assert oldest.id != newer.id
+
+    both = make_candidate(email="jane@example.com", phone="(415) 555-0100")
+    person = resolve_candidate(db, both)
+    db.commit()
+    db.expire_all()
+
+    assert person.id == oldest.id
+    assert db.query(Person).count() == 1
+    assert {c.person_id for c in db.query(Candidate)} == {oldest.id}
+    assert {k.person_id for k in db.query(IdentityKey)} == {oldest.id}
+
+
+def test_unrelated_candidates_stay_apart(db, make_candidate):
+    first = make_candidate(name="Jane Doe", email="jane@example.com")
+    second = make_candidate(name="Jane Doe", email="other@example.com")
+    assert resolve_candidate(db, first).id != resolve_candidate(db, second).id
+
+
+def test_short_phone_numbers_are_not_keys():
+    assert identity_keys(None, "555-0100", None) == set()
+    assert identity_keys(None, "+44 20 7946 0958", None) == {"phone:2079460958"}
+
+
+def test_name_key_needs_a_plausible_name():
+    skills = ["Python", "SQL", "Docker"]
+    assert any(k.startswith("name_skills:") for k in identity_keys(None, None, "Jane Doe", skills))
+    for name in ("Work Experience", "PROFESSIONAL EXPERIENCE", "Jane Doe CV", "jane_doe_resume", "Unknown"):
+        assert identity_keys(None, None, name, skills) == set(), name
+
+
+def test_heading_names_do_not_merge_applicants(db, make_candidate):
+    skills = ["Python", "SQL", "Docker"]
+    first = make_candidate(name="Professional Experience")
+    second = make_candidate(name="Professional Experience")
+    assert resolve_candidate(db, first, skills).id != resolve_candidate(db, second, skills).id
+
+
+def test_keys_claimed_by_a_concurrent_upload_merge_persons(db, make_candidate):
+    from sqlalchemy import event
+
+    from database import SessionLocal
+
+    first = make_candidate(email="jane@example.com")
+    second = make_candidate(email="jane@example.com", phone="415 555 0100")
+
+    def other_upload_resolves_after_lookup(state):
+        if not (state.is_select and IdentityKey.__table__ in state.statement.get_final_froms()):
+            return None
+        event.remove(db, "do_orm_execute", other_upload_resolves_after_lookup)
+        lookup = state.invoke_statement().freeze()
+        with SessionLocal() as other:
+            resolve_candidate(other, other.get(Candidate, first.id))
+            other.commit()
+        return lookup()
+
+    event.listen(db, "do_orm_execute", other_upload_resolves_after_lookup)
+    person = resolve_candidate(db, second)
+    db.commit()
+    db.expire_all()
+
+    assert db.query(Person).count() == 1
+    assert {c.person_id for c in db.query(Candidate)} == {person.id}
+    assert {k.person_id for k in db.query(IdentityKey)} == {person.id}
@@ -0,0 +1,55 @@
+"""Import-time budget for the API module.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter: the
+import must stay under the budget (best of a few runs, IMPORT_TIME_BUDGET_MS)
+and must not pull in any of the heavy modules that load lazily.
+"""
+import os
+import re
+import subprocess
+import sys
+
+from .conftest import BACKEND_DIR
+
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
+RUNS = 3
+
+# Loaded on first use or by the background warm-up, never at import
+LAZY_MODULES = ("numpy", "sklearn", "pandas", "pdfplumber", "docx", "ollama", "pytesseract")
+
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def measure(module: str = "main"):
+    """(cumulative milliseconds for `module`, set of top-level modules imported)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    assert proc.returncode == 0, f"import {module} failed:\n{proc.stderr}"
+
+    total_ms, imported = None, set()
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        name = match.group(3)
+        imported.add(name.split(".")[0])
+        if name == module:
+            total_ms = int(match.group(2)) / 1000
+    return total_ms, imported
+
+
+def test_main_imports_no_heavy_modules():
+    _, imported = measure()
+    assert sorted(set(LAZY_MODULES) & imported) == []
+
+
+def test_main_imports_within_budget():
+    timings = []
+    for _ in range(RUNS):
+        total_ms, _ = measure()
+        timings.append(total_ms)
+        if total_ms <= IMPORT_TIME_BUDGET_MS:
+            break
+    assert min(timings) <= IMPORT_TIME_BUDGET_MS, f"import main took {min(timings):.0f} ms"
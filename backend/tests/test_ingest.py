@@ -0,0 +1,62 @@
+import asyncio
+import io
+
+import main
+from database import AsyncSessionLocal, SessionLocal
+from models import Candidate, CandidateNeighbor, CandidateVector, ResumeDocument
+from services.content_store import text_hash
+
+RESUME = b"Jane Doe\njane@example.com\nExperience\nAcme, Jan 2019 - Dec 2021\n"
+
+
+def _ingest(data: bytes, filename: str = "jane.txt"):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            return await main.ingest_resume(db, io.BytesIO(data), filename, "Python developer", None)
+    return asyncio.run(run())
+
+
+def test_new_file_is_stored_and_queued(db):
+    candidate, resume_text, is_duplicate = _ingest(RESUME)
+    assert not is_duplicate
+    assert resume_text == RESUME.decode()
+    assert candidate.name == "Jane Doe"
+    assert candidate.recommendation == "PROCESSING"
+    assert db.query(ResumeDocument).count() == 1
+
+
+def test_overlapping_upload_of_same_new_file(db, monkeypatch):
+    """The other upload stores the document while this one is extracting"""
+    real_extract = main.extract_stored
+
+    def extract_while_other_upload_commits(key, ocr_report):
+        text = real_extract(key, ocr_report)
+        with SessionLocal() as other:
+            other.add(ResumeDocument(sha256=key.rsplit("/", 1)[-1].split(".")[0], extension=".txt",
+                                     storage_path=key, text=text, text_sha256=text_hash(text)))
+            other.commit()
+        return text
+
+    monkeypatch.setattr(main, "extract_stored", extract_while_other_upload_commits)
+    candidate, resume_text, is_duplicate = _ingest(RESUME)
+
+    assert not is_duplicate
+    assert resume_text == RESUME.decode()
+    assert db.query(ResumeDocument).count() == 1
+    assert db.query(Candidate).count() == 1
+
+
+def test_reused_screening_joins_similarity_graph(db):
+    first, _, _ = _ingest(RESUME)
+    screened = db.get(Candidate, first.id)
+    screened.recommendation, screened.skills, screened.overall_score = "SELECT", '["Python"]', 80
+    db.commit()
+    main.add_to_similarity_graph(first.id, ["Python"], RESUME.decode())
+
+    # Same text in a differently encoded file, so no new screening is needed
+    second, resume_text, is_duplicate = _ingest(RESUME + b"\n\n", "jane-v2.txt")
+    assert is_duplicate and resume_text is None
+    assert second.id != first.id
+    assert second.recommendation == "SELECT"
+    assert db.query(CandidateVector).filter(CandidateVector.candidate_id == second.id).count() == 1
+    assert db.query(CandidateNeighbor).filter(CandidateNeighbor.candidate_id == second.id).count() == 1
@@ -0,0 +1,43 @@
+from services.resume_preprocess import build_resume_excerpt, clean_text, estimate_tokens, split_sections
+
+
+def test_clean_text_collapses_whitespace_and_blank_lines():
+    text = "Jane   Doe\t\n\n\n\nPython developer  \n"
+    assert clean_text(text) == "Jane Doe\n\nPython developer"
+
+
+def test_clean_text_drops_boilerplate_lines():
+    text = "Curriculum Vitae\nJane Doe\nPage 1 of 2\nPython\n- 2 -\nReferences available upon request."
+    assert clean_text(text) == "Jane Doe\nPython"
+
+
+def test_clean_text_keeps_repeated_content_lines():
+    text = "Acme\n- Built REST APIs in Python\nGlobex\n- Built REST APIs in Python"
+    assert clean_text(text) == text
+
+
+def test_clean_text_drops_running_headers_and_footers():
+    pages = [
+        "Jane Doe - jane@example.com\nExperience\nAcme\nConfidential draft v2",
+        "Jane Doe - jane@example.com\nGlobex\nInitech\nConfidential draft v2",
+        "Jane Doe - jane@example.com\nEducation\nBSc\nConfidential draft v2",
+    ]
+    assert clean_text("\f".join(pages)).splitlines() == [
+        "Jane Doe - jane@example.com", "Experience", "Acme", "Confidential draft v2",
+        "Globex", "Initech", "Education", "BSc",
+    ]
+
+
+def test_split_sections_by_heading():
+    text = "Jane Doe\nSkills:\nPython, SQL\nWork Experience\nAcme 2019 - 2021\nEducation\nBSc"
+    sections = split_sections(text)
+    assert "Python, SQL" in sections["skills"]
+    assert "Acme 2019 - 2021" in sections["experience"]
+    assert "BSc" in sections["education"]
+
+
+def test_excerpt_stays_within_budget():
+    text = "Skills\n" + "Python " * 2000 + "\nEducation\nBSc Computer Science"
+    excerpt = build_resume_excerpt(text, token_budget=200)
+    assert estimate_tokens(excerpt) <= 200
+    assert "BSc Computer Science" in excerpt
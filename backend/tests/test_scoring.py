@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from models import Candidate, JobProfile, current_change_seq
+from services.scoring import ScoringPolicy, overall_score, recommendation, rescore
+
+
+def test_overall_score_normalises_weights():
+    policy = ScoringPolicy(skills_weight=2, experience_weight=1, education_weight=1, select_threshold=60)
+    assert overall_score(80, 40, None, policy) == 50.0
+    assert recommendation(50.0, policy) == "REJECT"
+    assert recommendation(60.0, policy) == "SELECT"
+
+
+def test_rescore_matches_overall_score(db, make_candidate):
+    profile = JobProfile(name="backend", job_hash="a" * 64, skills_weight=0.6, experience_weight=0.3,
+                         education_weight=0.1, select_threshold=55)
+    default = JobProfile(name="default", job_hash=None, skills_weight=0.2, experience_weight=0.2,
+                         education_weight=0.6, select_threshold=65)
+    db.add_all([profile, default])
+    db.commit()
+
+    rng = random.Random(7)
+    for i in range(40):
+        make_candidate(job_hash=profile.job_hash if i % 2 else None,
+                       skills_score=rng.uniform(0, 100), experience_score=rng.uniform(0, 100),
+                       education_score=None if i % 7 == 0 else rng.uniform(0, 100),
+                       overall_score=None, recommendation="REJECT")
+    make_candidate(recommendation="ERROR", overall_score=None)
+
+    rescore(db)
+    db.expire_all()
+    for candidate in db.query(Candidate):
+        if candidate.recommendation == "ERROR":
+            assert candidate.overall_score is None
+            continue
+        policy = ScoringPolicy.from_profile(profile if candidate.job_hash else default)
+        expected = overall_score(candidate.skills_score, candidate.experience_score,
+                                 candidate.education_score, policy)
+        assert candidate.overall_score == expected
+        assert candidate.recommendation == recommendation(expected, policy)
+
+
+def test_rescore_of_one_profile_leaves_others_alone(db, make_candidate):
+    profile = JobProfile(name="backend", job_hash="a" * 64, skills_weight=1, experience_weight=0,
+                         education_weight=0, select_threshold=50)
+    db.add(profile)
+    db.commit()
+    matching = make_candidate(job_hash=profile.job_hash, skills_score=90)
+    other = make_candidate(skills_score=90, overall_score=12.0, recommendation="REJECT")
+
+    assert rescore(db, profile)["rescored"] == 1
+    db.expire_all()
+    assert db.get(Candidate, matching.id).overall_score == 90.0
+    assert db.get(Candidate, other.id).overall_score == 12.0
+
+
+def test_rescore_without_changes_keeps_change_seq(db, make_candidate):
+    make_candidate(skills_score=80, experience_score=60, education_score=70, overall_score=None)
+    assert rescore(db)["rescored"] == 1
+    seq = current_change_seq(db.connection())
+    assert rescore(db) == {"rescored": 0, "selected": 1}
+    assert current_change_seq(db.connection()) == seq
+
+
+def test_local_backend_screens_through_the_backend_interface(make_candidate):
+    from database import SessionLocal
+    from services.content_store import text_hash
+    from services.scoring_backends import BackendError, LocalModelBackend
+
+    job = "Python developer"
+    backend = LocalModelBackend(SessionLocal, min_rows=3)
+    with pytest.raises(BackendError):
+        backend.screen("Jane Doe\nPython, Django", job)
+
+    for text, score in [("Python Django APIs", 90), ("Python scripting", 70), ("Java Spring", 20), ("Cobol", 10)]:
+        make_candidate(job_hash=text_hash(job), resume_text=text, skills_score=score, skills='["Python"]')
+    result = backend.screen("Jane Doe\nPython, Django", job)
+    assert result["scored_by"] == "local"
+    assert all(0 <= result[s] <= 100 for s in ("skills_score", "experience_score", "education_score"))
+    assert result["skills"] == ["Python"]
@@ -0,0 +1,23 @@
+import pytest
+
+from screener import parse_response
+
+REPLY = '{"skills": ["Python"], "skills_score": %s, "experience_score": 70, "education_score": 60, "reason": "ok"}'
+
+
+@pytest.mark.parametrize("value, expected", [("85", 85.0), ('"85"', 85.0), ('"72.5"', 72.5), ("140", 100.0), ("-3", 0.0)])
+def test_scores_are_numbers_within_range(value, expected):
+    result = parse_response(REPLY % value)
+    assert "error" not in result
+    assert result["skills_score"] == expected
+    assert result["experience_score"] == 70.0
+
+
+@pytest.mark.parametrize("value", ['"high"', "null", "[85]", '"NaN"'])
+def test_unusable_score_is_a_parse_error(value):
+    result = parse_response(REPLY % value)
+    assert result["error"] == "Invalid skills_score in model response"
+
+
+def test_reply_that_is_not_an_object_is_a_parse_error():
+    assert parse_response("[1, 2, 3]")["error"] == "Failed to parse model response"
@@ -0,0 +1,80 @@
+import threading
+
+from services.screening_scheduler import FairScheduler
+
+
+def _drain(scheduler):
+    """Names of queued jobs in the order workers would pick them, one at a time"""
+    order = []
+    job = scheduler._next_job()
+    while job is not None:
+        order.append(job.args[0])
+        job = scheduler._next_job()
+    return order
+
+
+def test_priority_then_fair_share_order():
+    scheduler = FairScheduler(workers=0)
+    for name in ("a1", "a2", "a3"):
+        scheduler.submit(print, name, user="a", priority="bulk")
+    scheduler.submit(print, "b1", user="b", priority="bulk")
+    scheduler.submit(print, "r1", user="b", priority="rescreen")
+    scheduler.submit(print, "c1", user="c", priority="interactive")
+    assert _drain(scheduler) == ["c1", "a1", "b1", "a2", "a3", "r1"]
+
+
+def test_weights_share_workers_unevenly():
+    scheduler = FairScheduler(workers=0, weights={"a": 2.0})
+    for i in range(4):
+        scheduler.submit(print, f"a{i}", user="a")
+        scheduler.submit(print, f"b{i}", user="b")
+    assert _drain(scheduler)[:6] == ["a0", "a1", "b0", "a2", "a3", "b1"]
+
+
+def test_user_at_cap_waits_while_others_have_work():
+    scheduler = FairScheduler(workers=0, per_user_limit=1)
+    scheduler.submit(print, "a1", user="a")
+    scheduler.submit(print, "b1", user="b")
+    scheduler._running["a"] = 1
+    assert scheduler._next_job().args[0] == "b1"
+
+
+def test_cap_is_work_conserving():
+    scheduler = FairScheduler(workers=0, per_user_limit=1)
+    scheduler.submit(print, "a1", user="a")
+    scheduler.submit(print, "a2", user="a")
+    scheduler._running["a"] = 1
+    # Nobody else is waiting, so the lone user gets the idle worker
+    assert scheduler._next_job().args[0] == "a1"
+
+    # Everyone waiting is at the cap: still no idle worker
+    scheduler.submit(print, "b1", user="b")
+    scheduler._running["b"] = 1
+    assert scheduler._next_job().args[0] == "a2"
+
+
+def test_picking_a_job_does_not_mark_users_running():
+    scheduler = FairScheduler(workers=0)
+    scheduler.submit(print, "a1", user="a")
+    scheduler._next_job()
+    assert scheduler.stats()["running"] == {}
+
+
+def test_lone_user_uses_every_worker():
+    scheduler = FairScheduler(workers=2, per_user_limit=1)
+    both_running = threading.Barrier(2, timeout=5)
+    futures = [scheduler.submit(both_running.wait, user="a") for _ in range(2)]
+    assert sorted(f.result(timeout=5) for f in futures) == [0, 1]
+
+
+def test_jobs_run_and_report_results():
+    scheduler = FairScheduler(workers=2, per_user_limit=1)
+    release = threading.Event()
+    blocked = scheduler.submit(release.wait, 5, user="a")
+    other = scheduler.submit(lambda x: x * 2, 21, user="b")
+    assert other.result(timeout=5) == 42
+    release.set()
+    assert blocked.result(timeout=5) is True
+    failing = scheduler.submit(lambda: 1 / 0, user="b")
+    assert isinstance(failing.exception(timeout=5), ZeroDivisionError)
+    assert scheduler.stats()["failed"] == 1
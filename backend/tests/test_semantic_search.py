@@ -0,0 +1,46 @@
+import threading
+
+from services.semantic_search import SemanticSearch
+
+CANDIDATES = [
+    {"id": 1, "name": "Jane Doe", "skills": ["Python", "Django"], "tags": [], "reason": "Strong backend developer"},
+    {"id": 2, "name": "John Roe", "skills": ["Java", "Spring"], "tags": [], "reason": "Enterprise services"},
+]
+
+
+def test_building_embeddings_does_not_block_version_bumps(tmp_path, monkeypatch):
+    search = SemanticSearch(str(tmp_path))
+    search.prepare_candidates(CANDIDATES)
+    embedding_started, release = threading.Event(), threading.Event()
+
+    def slow_embed(text):
+        embedding_started.set()
+        release.wait(5)
+        return [1.0, 0.0]
+
+    monkeypatch.setattr(search, "_embed", slow_embed)
+    builder = threading.Thread(target=search._embedding_matrix)
+    builder.start()
+    try:
+        assert embedding_started.wait(5)
+        bumper = threading.Thread(target=search.store.bump_if_changed, args=("another candidate set",))
+        bumper.start()
+        bumper.join(2)
+        assert not bumper.is_alive()
+    finally:
+        release.set()
+        builder.join()
+    assert search.store.load_matrix(search.index_version) is not None
+
+
+def test_keyword_fallback_applies_min_score(tmp_path, monkeypatch):
+    search = SemanticSearch(str(tmp_path))
+    search.prepare_candidates(CANDIDATES)
+
+    def embeddings_down(text):
+        raise ConnectionError("ollama is not running")
+
+    monkeypatch.setattr(search, "_embed", embeddings_down)
+    everything = search.search("python developer", "semantic")
+    assert [r["candidate"]["id"] for r in everything] == [1]
+    assert search.search("python developer", "semantic", min_score=everything[0]["score"] + 1) == []
@@ -0,0 +1,75 @@
+import numpy as np
+
+from models import CandidateNeighbor, CandidateVector
+from services.similarity_graph import SimilarityGraph
+
+PYTHON = (["Python", "Django"], "Backend developer building Django REST APIs in Python")
+JAVA = (["Java", "Spring"], "Backend developer building Spring Boot services in Java")
+
+
+def _edges(db):
+    return {(e.candidate_id, e.neighbor_id): e.score for e in db.query(CandidateNeighbor)}
+
+
+def _assert_edges_match_vectors(db, k):
+    """Every stored edge carries the cosine of the current vectors, at most k per candidate"""
+    vectors = {v.candidate_id: np.frombuffer(v.vector, dtype=np.float32) for v in db.query(CandidateVector)}
+    edges = _edges(db)
+    for (owner, neighbor), score in edges.items():
+        assert abs(score - float(vectors[owner] @ vectors[neighbor])) < 1e-5, (owner, neighbor)
+    owners = [owner for owner, _ in edges]
+    assert all(owners.count(owner) <= k for owner in owners)
+
+
+def test_neighbours_are_most_similar(db, make_candidate):
+    graph = SimilarityGraph(k=1, capacity=1)
+    ids = [make_candidate().id for _ in range(4)]
+    for candidate_id, (skills, text) in zip(ids, [PYTHON, PYTHON, JAVA, JAVA]):
+        graph.add(db, candidate_id, skills, text)
+
+    edges = _edges(db)
+    assert set(edges) == {(ids[0], ids[1]), (ids[1], ids[0]), (ids[2], ids[3]), (ids[3], ids[2])}
+    assert graph.size == 4 and len(graph._ids) >= 4
+    _assert_edges_match_vectors(db, k=1)
+
+
+def test_changed_vector_drops_stale_reverse_edges(db, make_candidate):
+    graph = SimilarityGraph(k=1)
+    ids = [make_candidate().id for _ in range(4)]
+    for candidate_id, (skills, text) in zip(ids, [PYTHON, PYTHON, JAVA, JAVA]):
+        graph.add(db, candidate_id, skills, text)
+
+    # The second candidate is re-screened with a Java resume
+    graph.add(db, ids[1], *JAVA)
+
+    _assert_edges_match_vectors(db, k=1)
+    # The first candidate lost its only close match
+    scores = [score for (owner, _), score in _edges(db).items() if owner == ids[0]]
+    assert len(scores) == 1 and scores[0] < 0.9
+
+
+def test_changed_vector_of_newest_candidate_reaches_every_worker(db, make_candidate):
+    writer, other = SimilarityGraph(k=1), SimilarityGraph(k=1)
+    ids = [make_candidate().id for _ in range(4)]
+    for candidate_id, (skills, text) in zip(ids, [PYTHON, PYTHON, JAVA, JAVA]):
+        writer.add(db, candidate_id, skills, text)
+    other._sync(db)
+
+    # The newest vector row is replaced; its id must not be handed back
+    writer.add(db, ids[3], *PYTHON)
+    other.add(db, ids[2], *JAVA)
+
+    _assert_edges_match_vectors(db, k=1)
+    stored = np.frombuffer(db.query(CandidateVector).filter_by(candidate_id=ids[3]).one().vector, dtype=np.float32)
+    for graph in (writer, other):
+        assert np.allclose(graph._matrix[graph._row_of[ids[3]]], stored)
+
+
+def test_backfill_adds_candidates_without_vectors(db, make_candidate):
+    for _ in range(3):
+        make_candidate(resume_text=PYTHON[1])
+    graph = SimilarityGraph(k=2)
+    assert graph.backfill(db) == 3
+    assert graph.backfill(db) == 0
+    assert len(_edges(db)) == 6
+    _assert_edges_match_vectors(db, k=2)
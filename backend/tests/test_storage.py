@@ -0,0 +1,47 @@
+import io
+import os
+from datetime import timedelta
+
+from services.storage import GZIP_SUFFIX, LocalStorage
+
+TEXT = b"Jane Doe\nPython developer\n" * 50
+
+
+def _files(root):
+    return sorted(os.path.relpath(os.path.join(d, f), root) for d, _, files in os.walk(root) for f in files)
+
+
+def test_same_content_is_stored_once(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    first = storage.save_stream(io.BytesIO(TEXT), "jane.txt")
+    second = storage.save_stream(io.BytesIO(TEXT), "copy.TXT")
+    assert first.key == second.key
+    assert not first.already_stored and second.already_stored
+    with storage.open(first.key) as f:
+        assert f.read() == TEXT
+
+
+def test_cold_originals_are_compressed_and_still_readable(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    stored = storage.save_stream(io.BytesIO(TEXT), "jane.txt")
+    docx = storage.save_stream(io.BytesIO(b"PK zipped"), "jane.docx")
+
+    assert storage.compress_cold(timedelta(0)) == 1
+    assert storage.compress_cold(timedelta(0)) == 0
+    assert not any(name.endswith(".tmp") for name in _files(str(tmp_path)))
+    assert storage.exists(stored.key) and storage.exists(docx.key)
+    with storage.open(stored.key) as f:
+        assert f.read() == TEXT
+    with storage.local_path(stored.key) as path:
+        with open(path, "rb") as f:
+            assert f.read() == TEXT
+
+
+def test_compressing_a_vanished_file_is_skipped(tmp_path):
+    storage = LocalStorage(str(tmp_path))
+    stored = storage.save_stream(io.BytesIO(TEXT), "jane.txt")
+    path = storage._path(stored.key)
+    os.remove(path)
+    assert storage._compress(path) is False
+    assert not os.path.exists(path + GZIP_SUFFIX)
+    assert os.listdir(os.path.dirname(path)) == []
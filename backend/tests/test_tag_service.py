@@ -0,0 +1,35 @@
+from models import Candidate, current_change_seq
+from services.tag_service import bulk_tag, bulk_untag, list_tags, load_tags, normalize_tag
+
+
+def test_normalize_tag():
+    assert normalize_tag("  Python \t dev ") == "Python dev"
+
+
+def test_bulk_tag_skips_unknown_and_existing(db, make_candidate):
+    first, second = make_candidate(), make_candidate()
+    assert bulk_tag(db, [first.id, 9999], "shortlist") == 1
+    assert bulk_tag(db, [first.id, second.id], "shortlist") == 1
+    assert load_tags(db) == {first.id: ["shortlist"], second.id: ["shortlist"]}
+
+
+def test_bulk_untag(db, make_candidate):
+    first, second = make_candidate(), make_candidate()
+    bulk_tag(db, [first.id, second.id], "shortlist")
+    assert bulk_untag(db, [first.id], "shortlist") == 1
+    assert bulk_untag(db, [first.id], "unknown") == 0
+    assert load_tags(db, [first.id, second.id]) == {second.id: ["shortlist"]}
+    assert list_tags(db)[0]["count"] == 1
+
+
+def test_tagging_stamps_change_seq(db, make_candidate):
+    candidate = make_candidate()
+    before = current_change_seq(db.connection())
+    bulk_tag(db, [candidate.id], "shortlist")
+    seq = current_change_seq(db.connection())
+    assert seq > before
+    assert db.get(Candidate, candidate.id).change_seq == seq
+
+    # Nothing changes, nothing is stamped
+    bulk_tag(db, [candidate.id], "shortlist")
+    assert current_change_seq(db.connection()) == seq
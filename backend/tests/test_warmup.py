@@ -0,0 +1,32 @@
+import fcntl
+import os
+
+from services.warmup import Warmup, one_process_at_a_time
+
+
+def test_warmup_reports_each_task():
+    warmup = Warmup()
+    warmup.start([("ok", lambda: None), ("broken", lambda: 1 / 0)])
+    warmup._thread.join(5)
+    status = warmup.status()
+    assert not status["ready"]
+    assert status["components"]["ok"]["status"] == "ready"
+    assert status["components"]["broken"]["status"] == "failed"
+
+
+def test_task_is_skipped_while_another_process_holds_the_lock(tmp_path):
+    lock_path = str(tmp_path / "task.lock")
+    calls = []
+    task = one_process_at_a_time(lock_path, lambda: calls.append(1))
+
+    # flock locks belong to the open file, so a second handle stands in
+    # for another worker
+    with open(lock_path, "a+") as other_worker:
+        fcntl.flock(other_worker, fcntl.LOCK_EX)
+        task()
+        assert calls == []
+        fcntl.flock(other_worker, fcntl.LOCK_UN)
+
+    task()
+    assert calls == [1]
+    assert os.path.exists(lock_path)
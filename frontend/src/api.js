@@ -50,6 +50,37 @@ API.interceptors.response.use(
   }
 );
 
+// Conditional GETs: remember each response's ETag and body, send
+// If-None-Match next time, and reuse the body when the server answers 304
+const etagCache = new Map();
+
+API.interceptors.request.use((config) => {
+  if ((config.method || 'get').toLowerCase() === 'get') {
+    const cached = etagCache.get(API.getUri(config));
+    if (cached) {
+      config.headers['If-None-Match'] = cached.etag;
+    }
+    config.validateStatus = (status) => (status >= 200 && status < 300) || status === 304;
+  }
+  return config;
+});
+
+API.interceptors.response.use((response) => {
+  const { config } = response;
+  if ((config.method || 'get').toLowerCase() !== 'get') {
+    return response;
+  }
+  const key = API.getUri(config);
+  if (response.status === 304 && etagCache.has(key)) {
+    return { ...response, status: 200, data: etagCache.get(key).data };
+  }
+  const etag = response.headers.etag;
+  if (etag) {
+    etagCache.set(key, { etag, data: response.data });
+  }
+  return response;
+});
+
 // Auth endpoints
 export const login = (username, password) => {
   const formData = new FormData();
@@ -104,15 +135,96 @@ export const bulkUploadResumes = (files, jobDescription) => {
   });
 };
 
+// Resumable chunked upload: each file is sent in CHUNK_SIZE pieces and
+// screened as soon as its last piece arrives. A failed chunk is retried from
+// the offset the server reports, so a dropped connection loses one chunk.
+const CHUNK_SIZE = 1024 * 1024;
+const CHUNK_RETRIES = 5;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Seconds to wait for another request that is still extracting the file
+const FINALIZE_POLLS = 60;
+
+const settledUpload = async (uploadId) => {
+  for (let poll = 0; ; poll++) {
+    const { data } = await API.get(`/uploads/${uploadId}`);
+    if (data.status !== 'finalizing' || poll >= FINALIZE_POLLS) return data;
+    await sleep(1000);
+  }
+};
+
+export const uploadFileChunked = async (file, jobDescription, { batchId, onProgress } = {}) => {
+  const form = new FormData();
+  form.append('filename', file.name);
+  form.append('length', file.size);
+  form.append('job_description', jobDescription);
+  if (batchId) form.append('batch_id', batchId);
+  let { data: upload } = await API.post('/uploads', form);
+
+  let offset = upload.offset;
+  let failures = 0;
+  while (upload.status === 'uploading') {
+    try {
+      const { data } = await API.patch(`/uploads/${upload.upload_id}`, file.slice(offset, offset + CHUNK_SIZE), {
+        headers: { 'Content-Type': 'application/offset+octet-stream', 'Upload-Offset': offset },
+      });
+      upload = data;
+      offset = data.offset;
+      failures = 0;
+      if (onProgress) onProgress(offset, file.size);
+    } catch (error) {
+      const status = error.response?.status;
+      if (error.response && ![409, 502, 503, 504].includes(status)) throw error;
+      if (++failures > CHUNK_RETRIES) throw error;
+      await sleep(500 * 2 ** failures);
+      const head = await API.head(`/uploads/${upload.upload_id}`);
+      offset = Number(head.headers['upload-offset']);
+      if (status === 409 || offset === file.size) {
+        // The server may already have the whole file (say the last chunk
+        // arrived but its response was lost): report what became of it
+        // instead of sending the chunk again
+        upload = await settledUpload(upload.upload_id);
+      }
+    }
+  }
+  return upload.status === 'finalizing' ? settledUpload(upload.upload_id) : upload;
+};
+
+export const bulkUploadResumesChunked = async (files, jobDescription, onProgress) => {
+  const total = files.reduce((sum, file) => sum + file.size, 0);
+  let done = 0;
+  let batchId;
+  const results = [];
+  for (const file of files) {
+    try {
+      const upload = await uploadFileChunked(file, jobDescription, {
+        batchId,
+        onProgress: (sent) => onProgress && onProgress(done + sent, total),
+      });
+      batchId = upload.batch_id;
+      results.push(upload);
+    } catch (error) {
+      results.push({ filename: file.name, status: 'failed', error: error.response?.data?.detail || error.message });
+    }
+    done += file.size;
+  }
+  return { batch_id: batchId, results };
+};
+
 // Candidate endpoints
-export const getCandidates = () => {
-  return API.get('/candidates');
+export const getCandidates = (tag) => {
+  return API.get('/candidates', { params: tag ? { tag } : {} });
 };
 
 export const getCandidate = (id) => {
   return API.get(`/candidates/${id}`);
 };
 
+export const getSimilarCandidates = (id, limit = 10) => {
+  return API.get(`/candidates/${id}/similar`, { params: { limit } });
+};
+
 // Export function
 export const exportCandidates = (candidates) => {
   const headers = [
@@ -152,6 +264,10 @@ export const semanticSearch = (query, searchType = 'hybrid') => {
 };
 
 // Tag endpoints
+export const getTags = () => {
+  return API.get('/tags');
+};
+
 export const addTags = (candidateIds, tag) => {
   return API.post('/add-tags', {
     candidate_ids: candidateIds,
@@ -159,6 +275,13 @@ export const addTags = (candidateIds, tag) => {
   });
 };
 
+export const removeTags = (candidateIds, tag) => {
+  return API.post('/remove-tags', {
+    candidate_ids: candidateIds,
+    tag: tag
+  });
+};
+
 // Interview endpoints
 export const scheduleInterview = (candidateIds, date, time, type) => {
   return API.post('/schedule-interview', {
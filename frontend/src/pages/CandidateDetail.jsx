@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { getCandidate } from '../api';
+import { getCandidate, getSimilarCandidates } from '../api';
 import { 
   ArrowLeftIcon, 
   EnvelopeIcon, 
@@ -17,6 +17,7 @@ export default function CandidateDetail() {
   const { id } = useParams();
   const navigate = useNavigate();
   const [candidate, setCandidate] = useState(null);
+  const [similar, setSimilar] = useState([]);
   const [loading, setLoading] = useState(true);
   const [activeTab, setActiveTab] = useState('overview');
 
@@ -28,6 +29,8 @@ export default function CandidateDetail() {
     try {
       const response = await getCandidate(id);
       setCandidate(response.data);
+      const similarResponse = await getSimilarCandidates(id, 5);
+      setSimilar(similarResponse.data);
     } catch (error) {
       console.error('Error:', error);
     } finally {
@@ -123,6 +126,16 @@ export default function CandidateDetail() {
                       {candidate.phone}
                     </span>
                   )}
+                  {candidate.linkedin_url && (
+                    <a href={candidate.linkedin_url} target="_blank" rel="noopener noreferrer" className="text-sm text-blue-600 hover:underline">
+                      LinkedIn
+                    </a>
+                  )}
+                  {candidate.github_url && (
+                    <a href={candidate.github_url} target="_blank" rel="noopener noreferrer" className="text-sm text-blue-600 hover:underline">
+                      GitHub
+                    </a>
+                  )}
                 </div>
               </div>
               <div className="text-right">
@@ -225,6 +238,28 @@ export default function CandidateDetail() {
                   </span>
                 </div>
               </div>
+
+              {/* Similar Candidates */}
+              {similar.length > 0 && (
+                <div>
+                  <h3 className="text-lg font-medium text-gray-900 mb-3">Similar Candidates</h3>
+                  <ul className="divide-y divide-gray-200">
+                    {similar.map((other) => (
+                      <li key={other.id} className="py-2 flex items-center justify-between">
+                        <button
+                          onClick={() => navigate(`/candidate/${other.id}`)}
+                          className="text-sm font-medium text-blue-600 hover:underline"
+                        >
+                          {other.name}
+                        </button>
+                        <span className="text-sm text-gray-500">
+                          {Math.round(other.similarity * 100)}% similar · score {other.overall_score}
+                        </span>
+                      </li>
+                    ))}
+                  </ul>
+                </div>
+              )}
             </div>
           )}
 
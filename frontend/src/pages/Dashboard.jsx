@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { getCandidates, uploadResume, bulkUploadResumes, exportCandidates } from '../api';
+import { getCandidates, uploadResume, bulkUploadResumesChunked, exportCandidates } from '../api';
 import { 
   DocumentArrowUpIcon, 
   MagnifyingGlassIcon,
@@ -201,10 +201,15 @@ export default function Dashboard() {
     setUploadStatus(`Uploading ${selectedFiles.length} files...`);
 
     try {
-      const response = await bulkUploadResumes(selectedFiles, jobDescription);
+      const { results } = await bulkUploadResumesChunked(selectedFiles, jobDescription, (sent, total) => {
+        setUploadProgress(Math.max(10, Math.round((sent / total) * 100)));
+      });
+      const failed = results.filter((r) => r.status === 'failed').length;
       
       setUploadProgress(100);
-      setUploadStatus(`Successfully uploaded ${selectedFiles.length} resumes!`);
+      setUploadStatus(failed
+        ? `Uploaded ${selectedFiles.length - failed} resumes, ${failed} failed.`
+        : `Successfully uploaded ${selectedFiles.length} resumes!`);
       
       setTimeout(() => {
         setShowBulkUpload(false);
@@ -301,7 +306,7 @@ export default function Dashboard() {
           'Authorization': `Bearer ${localStorage.getItem('token')}`
         },
         body: JSON.stringify({
-          candidateIds: selectedCandidates,
+          candidate_ids: selectedCandidates,
           tag: newTag
         })
       });